@@ -1,22 +1,54 @@
-"""AI integration module for Task Butler."""
-
-from .analyzer import TaskAnalyzer
-from .base import (
-    AIProvider,
-    AnalysisResult,
-    HolisticResult,
-    PlanResult,
-    PortfolioInsight,
-    SuggestionResult,
-    TaskWithReason,
-)
-from .model_manager import ModelManager
-from .planner import DailyPlanner
-from .prompts import PromptManager, get_prompt_manager
-from .suggester import TaskSuggester
+"""AI integration module for Task Butler.
+
+Public classes are imported lazily on first access (PEP 562), so importing
+this package, e.g. for get_provider, does not load every submodule.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analyzer import TaskAnalyzer
+    from .base import (
+        AIProvider,
+        AnalysisResult,
+        HolisticResult,
+        PlanResult,
+        PortfolioInsight,
+        SuggestionResult,
+        TaskWithReason,
+    )
+    from .cache import AnalysisCache, GenerationCache
+    from .model_manager import ModelManager
+    from .planner import DailyPlanner
+    from .prompts import PromptManager, get_prompt_manager
+    from .suggester import TaskSuggester
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    "TaskAnalyzer": ".analyzer",
+    "AIProvider": ".base",
+    "AnalysisResult": ".base",
+    "HolisticResult": ".base",
+    "PlanResult": ".base",
+    "PortfolioInsight": ".base",
+    "SuggestionResult": ".base",
+    "TaskWithReason": ".base",
+    "AnalysisCache": ".cache",
+    "GenerationCache": ".cache",
+    "ModelManager": ".model_manager",
+    "DailyPlanner": ".planner",
+    "PromptManager": ".prompts",
+    "get_prompt_manager": ".prompts",
+    "TaskSuggester": ".suggester",
+}
 
 __all__ = [
     "AIProvider",
+    "AnalysisCache",
+    "GenerationCache",
     "AnalysisResult",
     "HolisticResult",
     "PortfolioInsight",
@@ -32,6 +64,21 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Any:
+    """Import public classes on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 def get_provider(provider_name: str | None = None) -> AIProvider:
     """Get an AI provider instance based on configuration.
 
@@ -52,12 +99,16 @@ def get_provider(provider_name: str | None = None) -> AIProvider:
     if name == "llama":
         from .providers.llama import LlamaProvider, is_llama_available
 
-        if is_llama_available():
-            llama_config = ai_config.get("llama", {})
+        llama_config = ai_config.get("llama", {})
+        server_url = llama_config.get("server_url") or None
+        # A llama.cpp server does not need llama-cpp-python installed locally
+        if is_llama_available() or server_url:
             language = ai_config.get("language", "ja")
             # Convert string values to int (config stores as strings)
             n_ctx = llama_config.get("n_ctx", 2048)
-            n_gpu_layers = llama_config.get("n_gpu_layers", 0)
+            n_gpu_layers = llama_config.get("n_gpu_layers", -1)
+            prompt_cache_mb = llama_config.get("prompt_cache_mb", 512)
+            n_threads = llama_config.get("n_threads", 0)
             try:
                 n_ctx = int(n_ctx)
             except (ValueError, TypeError):
@@ -65,13 +116,35 @@ def get_provider(provider_name: str | None = None) -> AIProvider:
             try:
                 n_gpu_layers = int(n_gpu_layers)
             except (ValueError, TypeError):
-                n_gpu_layers = 0
+                n_gpu_layers = -1
+            try:
+                prompt_cache_mb = int(prompt_cache_mb)
+            except (ValueError, TypeError):
+                prompt_cache_mb = 512
+            try:
+                n_threads = int(n_threads)
+            except (ValueError, TypeError):
+                n_threads = 0
+            use_mlock = llama_config.get("use_mlock", False)
+            if isinstance(use_mlock, str):
+                use_mlock = use_mlock.lower() in ("true", "1", "yes")
+            speculative = llama_config.get("speculative", False)
+            if isinstance(speculative, str):
+                speculative = speculative.lower() in ("true", "1", "yes")
             return LlamaProvider(
                 model_path=llama_config.get("model_path") or None,
                 model_name=llama_config.get("model_name", "tinyllama-1.1b"),
                 n_ctx=n_ctx,
                 n_gpu_layers=n_gpu_layers,
                 language=language,
+                prompt_cache_mb=prompt_cache_mb,
+                tensor_split=_parse_tensor_split(llama_config.get("tensor_split")),
+                kv_cache_type=str(llama_config.get("kv_cache_type", "f16")).lower(),
+                server_url=server_url,
+                n_threads=n_threads,
+                use_mlock=bool(use_mlock),
+                speculative=bool(speculative),
+                quantization=llama_config.get("quantization") or None,
             )
         # Fall back to rule-based if llama not available
         return RuleBasedProvider()
@@ -90,3 +163,15 @@ def get_provider(provider_name: str | None = None) -> AIProvider:
             weight_staleness=analysis_config.get("weight_staleness", 0.15),
             weight_priority=analysis_config.get("weight_priority", 0.10),
         )
+
+
+def _parse_tensor_split(value: object) -> list[float] | None:
+    """Parse ai.llama.tensor_split from a TOML list or a comma-separated string."""
+    if not value:
+        return None
+    parts = value.split(",") if isinstance(value, str) else value
+    try:
+        split = [float(part) for part in parts if str(part).strip()]
+    except (ValueError, TypeError):
+        return None
+    return split or None
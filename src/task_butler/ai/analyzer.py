@@ -2,22 +2,59 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+from datetime import datetime
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
-from .base import AIProvider, AnalysisResult, HolisticResult
+from .base import (
+    AIProvider,
+    AnalysisResult,
+    HolisticResult,
+    PortfolioInsight,
+    index_dependencies,
+)
+from .cache import AnalysisCache
 
 if TYPE_CHECKING:
     from ..models.task import Task
 
+# Default cap on in-flight requests for providers with native async support
+DEFAULT_CONCURRENCY = 8
+
+# Batch bins by expected response length: (name, max input tokens, output tokens per task).
+# Tasks whose title + description fit under the input limit go in that bin; tasks
+# with dependencies move up one bin since their reasoning tends to run longer.
+RESPONSE_BINS: tuple[tuple[str, int | None, int], ...] = (
+    ("short", 64, 80),
+    ("medium", 256, 120),
+    ("long", None, 200),
+)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (~4 UTF-8 bytes per token)."""
+    return len(text.encode("utf-8")) // 4
+
 
 class TaskAnalyzer:
     """Analyzes tasks and provides priority scores with reasoning."""
 
-    def __init__(self, provider: AIProvider | None = None):
+    def __init__(
+        self,
+        provider: AIProvider | None = None,
+        concurrency: int | None = None,
+        cache: AnalysisCache | None = None,
+    ):
         """Initialize the analyzer.
 
         Args:
             provider: AI provider to use. If None, uses config setting.
+            concurrency: Max concurrent requests in async analysis.
+                         If None, uses ai.analysis.concurrency from config.
+            cache: Result cache. If None, a disk cache is used for providers
+                   that support caching (see AIProvider.cache_identity).
         """
         if provider is None:
             from . import get_provider
@@ -25,7 +62,128 @@ class TaskAnalyzer:
             provider = get_provider()
         self.provider = provider
 
-    def analyze(self, task: "Task", all_tasks: list["Task"]) -> AnalysisResult:
+        if concurrency is None:
+            concurrency = self._get_configured_concurrency()
+        self.concurrency = max(1, concurrency)
+
+        self._cache_identity = provider.cache_identity()
+        if cache is None and self._cache_identity is not None:
+            cache = AnalysisCache()
+        self.cache = cache if self._cache_identity is not None else None
+
+    @staticmethod
+    def _get_configured_concurrency() -> int:
+        """Read the async concurrency limit from config."""
+        from ..config import get_config
+
+        ai_config = get_config().get_ai_config()
+        value = ai_config.get("analysis", {}).get("concurrency", DEFAULT_CONCURRENCY)
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return DEFAULT_CONCURRENCY
+
+    def _has_native_async(self, method: str = "analyze_task_async") -> bool:
+        """Check if the provider overrides an async method of AIProvider."""
+        return getattr(type(self.provider), method) is not getattr(AIProvider, method)
+
+    @staticmethod
+    def _filter_targets(tasks: list[Task], include_closed: bool) -> list[Task]:
+        """Return the tasks to analyze."""
+        if include_closed:
+            return tasks
+        return [t for t in tasks if t.is_open]
+
+    @staticmethod
+    def _context_tasks(tasks: list[Task]) -> list[Task]:
+        """Return the context list handed to the provider alongside each task.
+
+        Providers only look at open tasks for dependency context (see
+        AIProvider.analyze_task), so closed tasks are dropped once here rather
+        than being rescanned for every analyzed task.
+        """
+        return [t for t in tasks if t.is_open]
+
+    def _cache_keys(self, target_tasks: list[Task], tasks: list[Task]) -> dict[str, str]:
+        """Build cache keys for the target tasks (empty if caching is off)."""
+        if self.cache is None or self._cache_identity is None:
+            return {}
+        identity = self._cache_identity
+        return {t.id: AnalysisCache.make_key(t, tasks, identity) for t in target_tasks}
+
+    def _split_cached(
+        self, target_tasks: list[Task], keys: dict[str, str]
+    ) -> tuple[dict[str, AnalysisResult], list[Task]]:
+        """Split target tasks into cached results and tasks still to analyze."""
+        if self.cache is None or not keys:
+            return {}, target_tasks
+
+        cached: dict[str, AnalysisResult] = {}
+        misses: list[Task] = []
+        for task in target_tasks:
+            hit = self.cache.get(keys[task.id])
+            if hit is None:
+                misses.append(task)
+            else:
+                cached[task.id] = hit
+        return cached, misses
+
+    def _store_cached(self, results: list[AnalysisResult], keys: dict[str, str]) -> None:
+        """Store fresh results in the cache and persist it."""
+        if self.cache is None or not keys:
+            return
+        for result in results:
+            if result.task_id in keys and self.provider.should_cache(result):
+                self.cache.put(keys[result.task_id], result)
+        self.cache.save()
+
+    @staticmethod
+    def _bin_tasks(tasks: list[Task]) -> dict[str, list[Task]]:
+        """Group tasks into RESPONSE_BINS by expected response length.
+
+        Args:
+            tasks: Tasks to group
+
+        Returns:
+            Dict of bin name to tasks, in RESPONSE_BINS order (empty bins omitted)
+        """
+        bins: dict[str, list[Task]] = {name: [] for name, _, _ in RESPONSE_BINS}
+        last = len(RESPONSE_BINS) - 1
+        for task in tasks:
+            tokens = _estimate_tokens(f"{task.title}\n{task.description}")
+            index = next(
+                i
+                for i, (_, limit, _) in enumerate(RESPONSE_BINS)
+                if limit is None or tokens < limit
+            )
+            if task.dependencies:
+                index = min(index + 1, last)
+            bins[RESPONSE_BINS[index][0]].append(task)
+        return {name: bin_tasks for name, bin_tasks in bins.items() if bin_tasks}
+
+    def _analyze_batch(self, target_tasks: list[Task], tasks: list[Task]) -> list[AnalysisResult]:
+        """Analyze target tasks in batches per response bin, reusing cached results.
+
+        Batching tasks of similar answer length keeps short answers from waiting
+        on long ones and lets each request use a tight output token budget.
+        """
+        keys = self._cache_keys(target_tasks, tasks)
+        cached, misses = self._split_cached(target_tasks, keys)
+
+        fresh: list[AnalysisResult] = []
+        if misses:
+            budgets = {name: budget for name, _, budget in RESPONSE_BINS}
+            for name, bin_tasks in self._bin_tasks(misses).items():
+                fresh.extend(
+                    self.provider.analyze_tasks_batch(
+                        bin_tasks, tasks, max_tokens_per_task=budgets[name]
+                    )
+                )
+        self._store_cached(fresh, keys)
+
+        return list(cached.values()) + fresh
+
+    def analyze(self, task: Task, all_tasks: list[Task]) -> AnalysisResult:
         """Analyze a single task.
 
         Args:
@@ -35,11 +193,53 @@ class TaskAnalyzer:
         Returns:
             AnalysisResult with score, reasoning, and suggestions
         """
-        return self.provider.analyze_task(task, all_tasks)
+        return self._analyze_batch([task], self._context_tasks(all_tasks))[0]
+
+    def _analyze_results(
+        self, tasks: list[Task], include_closed: bool = False
+    ) -> list[AnalysisResult]:
+        """Analyze all target tasks and return results in no particular order."""
+        # Providers with native async support fan out concurrently instead
+        if self._has_native_async():
+            return asyncio.run(self._analyze_results_async(tasks, include_closed))
+
+        target_tasks = self._filter_targets(tasks, include_closed)
+        if not target_tasks:
+            return []
+
+        context = target_tasks if not include_closed else self._context_tasks(tasks)
+
+        # Analyze all uncached target tasks in a single provider call
+        return self._analyze_batch(target_tasks, context)
 
-    def analyze_all(
-        self, tasks: list["Task"], include_closed: bool = False
+    async def _analyze_results_async(
+        self, tasks: list[Task], include_closed: bool = False
     ) -> list[AnalysisResult]:
+        """Analyze all target tasks concurrently and return results unsorted."""
+        target_tasks = self._filter_targets(tasks, include_closed)
+        if not target_tasks:
+            return []
+
+        context = target_tasks if not include_closed else self._context_tasks(tasks)
+        if not self._has_native_async():
+            # Local models are shared and not thread-safe; keep the single batch call
+            return await asyncio.to_thread(self._analyze_batch, target_tasks, context)
+
+        keys = self._cache_keys(target_tasks, context)
+        cached, misses = self._split_cached(target_tasks, keys)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _run(task: Task) -> AnalysisResult:
+            async with semaphore:
+                return await self.provider.analyze_task_async(task, context)
+
+        fresh = list(await asyncio.gather(*(_run(t) for t in misses)))
+        self._store_cached(fresh, keys)
+
+        return list(cached.values()) + fresh
+
+    def analyze_all(self, tasks: list[Task], include_closed: bool = False) -> list[AnalysisResult]:
         """Analyze all tasks and return sorted results.
 
         Args:
@@ -49,26 +249,63 @@ class TaskAnalyzer:
         Returns:
             List of AnalysisResult sorted by score (highest first)
         """
-        # Filter tasks
-        if include_closed:
-            target_tasks = tasks
-        else:
-            target_tasks = [t for t in tasks if t.is_open]
+        results = self._analyze_results(tasks, include_closed)
 
-        if not target_tasks:
-            return []
+        # Sort by score (highest first)
+        results.sort(key=attrgetter("score"), reverse=True)
 
-        # Analyze each task
-        results = [self.analyze(task, tasks) for task in target_tasks]
+        return results
+
+    async def analyze_all_async(
+        self, tasks: list[Task], include_closed: bool = False
+    ) -> list[AnalysisResult]:
+        """Analyze all tasks concurrently and return sorted results.
+
+        At most `concurrency` provider requests are in flight at once. Providers
+        without native async support are analyzed in one batch call off the
+        event loop instead.
+
+        Args:
+            tasks: List of tasks to analyze
+            include_closed: Whether to include done/cancelled tasks
+
+        Returns:
+            List of AnalysisResult sorted by score (highest first)
+        """
+        results = await self._analyze_results_async(tasks, include_closed)
 
         # Sort by score (highest first)
-        results.sort(key=lambda r: r.score, reverse=True)
+        results.sort(key=attrgetter("score"), reverse=True)
 
         return results
 
+    def warm_cache(self, tasks: list[Task], include_closed: bool = False) -> int:
+        """Analyze tasks that have no cached result yet and store the results.
+
+        Meant for unattended runs (e.g. an early-morning cron job) so that later
+        interactive analysis is served from the cache.
+
+        Args:
+            tasks: List of tasks to analyze
+            include_closed: Whether to include done/cancelled tasks
+
+        Returns:
+            Number of tasks analyzed (0 if the provider does not use the cache)
+        """
+        if self.cache is None:
+            return 0
+
+        target_tasks = self._filter_targets(tasks, include_closed)
+        context = target_tasks if not include_closed else self._context_tasks(tasks)
+        keys = self._cache_keys(target_tasks, context)
+        _, misses = self._split_cached(target_tasks, keys)
+        if misses:
+            self._analyze_batch(misses, context)
+        return len(misses)
+
     def get_top_priorities(
-        self, tasks: list["Task"], count: int = 5
-    ) -> list[tuple["Task", AnalysisResult]]:
+        self, tasks: list[Task], count: int = 5
+    ) -> list[tuple[Task, AnalysisResult]]:
         """Get the top priority tasks.
 
         Args:
@@ -78,14 +315,18 @@ class TaskAnalyzer:
         Returns:
             List of (task, analysis) tuples sorted by priority
         """
-        results = self.analyze_all(tasks, include_closed=False)
+        results = self._analyze_results(tasks, include_closed=False)
+
+        # Select the top N without sorting the full result list
+        results = heapq.nlargest(count, results, key=attrgetter("score"))
 
-        # Build task lookup
-        task_map = {t.id: t for t in tasks}
+        # Build task lookup for the selected results only
+        wanted = {r.task_id for r in results}
+        task_map = {t.id: t for t in tasks if t.id in wanted}
 
         # Return top N with their tasks
         top = []
-        for result in results[:count]:
+        for result in results:
             if result.task_id in task_map:
                 top.append((task_map[result.task_id], result))
 
@@ -93,9 +334,10 @@ class TaskAnalyzer:
 
     def analyze_holistic(
         self,
-        tasks: list["Task"],
+        tasks: list[Task],
         max_tasks: int = 20,
         include_closed: bool = False,
+        chunked: bool = False,
     ) -> HolisticResult:
         """Analyze all tasks holistically for cross-task insights.
 
@@ -109,16 +351,13 @@ class TaskAnalyzer:
             tasks: List of tasks to analyze
             max_tasks: Maximum tasks to include (context window limit)
             include_closed: Whether to include done/cancelled tasks
+            chunked: Analyze all tasks in chunks of max_tasks and merge the
+                     results instead of truncating to the top max_tasks
 
         Returns:
             HolisticResult with portfolio-level insights
         """
-        # Filter tasks
-        if include_closed:
-            target_tasks = tasks
-        else:
-            target_tasks = [t for t in tasks if t.is_open]
-
+        target_tasks = self._filter_targets(tasks, include_closed)
         if not target_tasks:
             return HolisticResult(
                 overall_assessment="分析対象のオープンタスクがありません。",
@@ -126,5 +365,106 @@ class TaskAnalyzer:
                 analyzed_tasks=0,
             )
 
+        if chunked and len(target_tasks) > max_tasks:
+            chunks = self._portfolio_chunks(target_tasks, max(1, max_tasks))
+            if self._has_native_async("analyze_portfolio_async"):
+                results = asyncio.run(self._analyze_chunks_async(chunks, max_tasks))
+            else:
+                # Local providers share one model, so chunks run one after another
+                results = [self.provider.analyze_portfolio(chunk, max_tasks) for chunk in chunks]
+            return self._merge_holistic(results, target_tasks, self._rule_based_portfolio())
+
         # Delegate to provider
         return self.provider.analyze_portfolio(target_tasks, max_tasks)
+
+    @staticmethod
+    def _portfolio_chunks(tasks: list[Task], size: int) -> list[list[Task]]:
+        """Split tasks into chunks of at most size, highest rule-based score first."""
+        from .providers.rule_based import RuleBasedProvider
+
+        analyses = RuleBasedProvider().analyze_tasks_batch(tasks, tasks)
+        scores = {t.id: a.score for t, a in zip(tasks, analyses)}
+        ordered = sorted(tasks, key=lambda t: scores[t.id], reverse=True)
+        return [ordered[i : i + size] for i in range(0, len(ordered), size)]
+
+    def _rule_based_portfolio(self) -> bool:
+        """Check if portfolio analysis comes from the rule-based provider.
+
+        The llama provider falls back to rule-based analysis when no model
+        can be loaded.
+        """
+        from .providers.llama import LlamaProvider
+        from .providers.rule_based import RuleBasedProvider
+
+        if isinstance(self.provider, RuleBasedProvider):
+            return True
+        return isinstance(self.provider, LlamaProvider) and not self.provider._llm_available()
+
+    async def _analyze_chunks_async(
+        self, chunks: list[list[Task]], max_tasks: int
+    ) -> list[HolisticResult]:
+        """Analyze portfolio chunks concurrently, at most `concurrency` at once."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _run(chunk: list[Task]) -> HolisticResult:
+            async with semaphore:
+                return await self.provider.analyze_portfolio_async(chunk, max_tasks)
+
+        return list(await asyncio.gather(*(_run(c) for c in chunks)))
+
+    @staticmethod
+    def _merge_holistic(
+        results: list[HolisticResult], tasks: list[Task], rule_based: bool = False
+    ) -> HolisticResult:
+        """Merge per-chunk holistic results into one result.
+
+        Insights are ordered by importance, ranked tasks by score, groups with
+        the same name are combined and duplicate warnings are dropped. Rule-based
+        insights and warnings of a chunk only cover that chunk (a blocker's
+        dependents may sit in other chunks), so with rule_based they are
+        computed again over all tasks instead.
+        """
+        from .providers.rule_based import RuleBasedProvider
+
+        insights: list[PortfolioInsight] = []
+        warnings: list[str] = []
+        if rule_based:
+            rule_insights, rule_warnings = RuleBasedProvider().portfolio_insights(
+                tasks, index_dependencies(tasks)[1], datetime.now()
+            )
+            insights.extend(rule_insights)
+            warnings.extend(rule_warnings)
+        else:
+            for result in results:
+                insights.extend(result.insights)
+                warnings.extend(result.warnings)
+        insights.sort(key=attrgetter("priority"))
+
+        ranked_tasks = sorted(
+            (t for r in results for t in r.ranked_tasks), key=attrgetter("score"), reverse=True
+        )
+        if ranked_tasks:
+            recommended_order = [t.task_id for t in ranked_tasks]
+        else:
+            recommended_order = [tid for r in results for tid in r.recommended_order]
+
+        groups: dict[str, list[str]] = {}
+        for result in results:
+            for name, task_ids in result.task_groups:
+                members = groups.setdefault(name, [])
+                for task_id in task_ids:
+                    if task_id not in members:
+                        members.append(task_id)
+
+        return HolisticResult(
+            insights=insights,
+            ranked_tasks=ranked_tasks,
+            recommended_order=recommended_order,
+            task_groups=list(groups.items()),
+            overall_assessment="\n".join(
+                r.overall_assessment for r in results if r.overall_assessment
+            ),
+            warnings=list(dict.fromkeys(warnings)),
+            total_tasks=len(tasks),
+            analyzed_tasks=sum(r.analyzed_tasks for r in results),
+        )
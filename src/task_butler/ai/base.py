@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -11,7 +12,7 @@ if TYPE_CHECKING:
     from ..models.task import Task
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of analyzing a single task."""
 
@@ -35,27 +36,27 @@ class AnalysisResult:
             return "minimal"
 
 
-@dataclass
+@dataclass(slots=True)
 class SuggestionResult:
     """A suggested task to work on."""
 
-    task: "Task"
+    task: Task
     score: float  # 0-100 recommendation score
     reason: str  # Why this task is suggested
     estimated_minutes: int | None = None  # Estimated time to complete
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeSlot:
     """A time slot in a daily plan."""
 
     start_time: str  # HH:MM format
     end_time: str  # HH:MM format
-    task: "Task"
+    task: Task
     duration_hours: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanResult:
     """Result of daily planning."""
 
@@ -68,7 +69,7 @@ class PlanResult:
     warnings: list[str] = field(default_factory=list)  # e.g., overdue tasks
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioInsight:
     """Cross-task insight from holistic analysis."""
 
@@ -78,7 +79,7 @@ class PortfolioInsight:
     priority: int = 3  # Importance 1-5 (1=highest)
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskWithReason:
     """A task with its priority reason."""
 
@@ -87,7 +88,7 @@ class TaskWithReason:
     reason: str  # Why this task is prioritized
 
 
-@dataclass
+@dataclass(slots=True)
 class HolisticResult:
     """Result of holistic/portfolio-level task analysis."""
 
@@ -116,13 +117,37 @@ class HolisticResult:
     analyzed_tasks: int = 0  # May be less than total if truncated
 
 
+def index_dependencies(all_tasks: list[Task]) -> tuple[dict[str, int], dict[str, int]]:
+    """Index open tasks for dependency lookups in a single pass.
+
+    Args:
+        all_tasks: All tasks for context
+
+    Returns:
+        (position in all_tasks of each open task by ID,
+         number of open tasks depending on each task ID)
+    """
+    open_positions: dict[str, int] = {}
+    dependents: dict[str, int] = {}
+    for position, t in enumerate(all_tasks):
+        if not t.is_open:
+            continue
+        open_positions.setdefault(t.id, position)
+        for dep_id in set(t.dependencies):
+            dependents[dep_id] = dependents.get(dep_id, 0) + 1
+    return open_positions, dependents
+
+
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
 
     @abstractmethod
-    def analyze_task(self, task: "Task", all_tasks: list["Task"]) -> AnalysisResult:
+    def analyze_task(self, task: Task, all_tasks: list[Task]) -> AnalysisResult:
         """Analyze a single task and return priority score with reasoning.
 
+        Only open tasks in all_tasks may influence the result: TaskAnalyzer
+        drops done/cancelled tasks from the context list before calling this.
+
         Args:
             task: The task to analyze
             all_tasks: All tasks for context (dependencies, etc.)
@@ -132,10 +157,67 @@ class AIProvider(ABC):
         """
         pass
 
+    async def analyze_task_async(self, task: Task, all_tasks: list[Task]) -> AnalysisResult:
+        """Analyze a single task without blocking the event loop.
+
+        Providers backed by a network API should override this with a native
+        async implementation. The default runs analyze_task in a worker thread.
+
+        Args:
+            task: The task to analyze
+            all_tasks: All tasks for context (dependencies, etc.)
+
+        Returns:
+            AnalysisResult with score and reasoning
+        """
+        return await asyncio.to_thread(self.analyze_task, task, all_tasks)
+
+    def analyze_tasks_batch(
+        self,
+        tasks: list[Task],
+        all_tasks: list[Task],
+        max_tokens_per_task: int | None = None,
+    ) -> list[AnalysisResult]:
+        """Analyze several tasks and return one result per task.
+
+        Providers that can pack multiple tasks into a single request should
+        override this. The default implementation analyzes each task in turn.
+
+        Args:
+            tasks: The tasks to analyze
+            all_tasks: All tasks for context (dependencies, etc.)
+            max_tokens_per_task: Output token budget per task for LLM providers
+                                 (None = provider default)
+
+        Returns:
+            List of AnalysisResult in the same order as tasks
+        """
+        return [self.analyze_task(task, all_tasks) for task in tasks]
+
+    def cache_identity(self) -> str | None:
+        """Return a string identifying this provider's output for caching.
+
+        It should change whenever the provider would produce different results
+        for the same task (model, language, prompts). Return None to disable
+        result caching, which is the default for cheap providers.
+        """
+        return None
+
+    def should_cache(self, result: AnalysisResult) -> bool:
+        """Check if an analysis result may be stored in the cache.
+
+        Args:
+            result: The result to check
+
+        Returns:
+            True if the result can be reused on later runs
+        """
+        return True
+
     @abstractmethod
     def suggest_tasks(
         self,
-        tasks: list["Task"],
+        tasks: list[Task],
         hours_available: float | None = None,
         energy_level: str | None = None,
         count: int = 5,
@@ -156,7 +238,7 @@ class AIProvider(ABC):
     @abstractmethod
     def create_daily_plan(
         self,
-        tasks: list["Task"],
+        tasks: list[Task],
         working_hours: float = 8.0,
         start_time: str = "09:00",
         morning_hours: float = 4.0,
@@ -179,7 +261,7 @@ class AIProvider(ABC):
     @abstractmethod
     def analyze_portfolio(
         self,
-        tasks: list["Task"],
+        tasks: list[Task],
         max_tasks: int = 20,
     ) -> HolisticResult:
         """Analyze all tasks holistically to provide cross-task insights.
@@ -194,3 +276,21 @@ class AIProvider(ABC):
             and task groupings
         """
         pass
+
+    async def analyze_portfolio_async(
+        self,
+        tasks: list[Task],
+        max_tasks: int = 20,
+    ) -> HolisticResult:
+        """Analyze tasks holistically without blocking the event loop.
+
+        The default runs analyze_portfolio in a worker thread.
+
+        Args:
+            tasks: List of open tasks to analyze
+            max_tasks: Maximum number of tasks to include in analysis
+
+        Returns:
+            HolisticResult with portfolio-level insights
+        """
+        return await asyncio.to_thread(self.analyze_portfolio, tasks, max_tasks)
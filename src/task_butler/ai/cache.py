@@ -0,0 +1,257 @@
+"""Disk cache for task analysis results."""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .base import AnalysisResult
+
+if TYPE_CHECKING:
+    from ..models.task import Task
+
+# Maximum number of cached results kept on disk (oldest are evicted first)
+DEFAULT_MAX_ENTRIES = 1000
+
+
+class _JsonCache:
+    """Small JSON-file cache with lazy loading and oldest-first eviction."""
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            path: Cache file
+            max_entries: Maximum number of entries to keep
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: dict | None = None
+        self._dirty = False
+        self._save_at_exit = False
+        # Providers may generate from several threads (e.g. server backends)
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> dict:
+        """Get cached entries (lazy loaded from disk)."""
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict:
+        """Load entries from the cache file."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _set(self, key: str, value: object) -> None:
+        """Store a value as the newest entry, evicting the oldest beyond max_entries."""
+        with self._lock:
+            entries = self.entries
+            entries.pop(key, None)
+            entries[key] = value
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+            self._dirty = True
+            if not self._save_at_exit:
+                # Written once when the command finishes instead of after every entry
+                atexit.register(self.save)
+                self._save_at_exit = True
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed.
+
+        The file is replaced atomically, so an interrupted write never leaves a
+        truncated cache behind.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_name = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=self.path.parent, suffix=".tmp", delete=False
+                ) as f:
+                    tmp_name = f.name
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(tmp_name, self.path)
+                self._dirty = False
+            except OSError:
+                # The cache is best-effort; results are still returned
+                if tmp_name is not None:
+                    Path(tmp_name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+        self.save()
+
+
+class AnalysisCache(_JsonCache):
+    """Exact-match cache for AnalysisResult keyed by task content hash.
+
+    Keys cover everything that affects an analysis: the task's own fields,
+    the open/closed state of related tasks, the provider identity (model,
+    language, prompts) and today's date, since deadline and staleness scores
+    change from day to day.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            path: Cache file. Defaults to $TASK_BUTLER_HOME/cache/analysis.json
+            max_entries: Maximum number of entries to keep
+        """
+        if path is None:
+            from ..config import get_home_dir
+
+            path = get_home_dir() / "cache" / "analysis.json"
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(task: Task, all_tasks: list[Task], identity: str) -> str:
+        """Build the cache key for a task.
+
+        Args:
+            task: The task being analyzed
+            all_tasks: All tasks for context (dependencies, etc.)
+            identity: Provider identity string (see AIProvider.cache_identity)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        related = sorted(
+            (t.id, t.is_open)
+            for t in all_tasks
+            if t.id in task.dependencies or task.id in t.dependencies
+        )
+        payload = {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status.value,
+            "priority": task.priority.value,
+            "due": task.due_date.isoformat() if task.due_date else None,
+            "estimated_hours": task.estimated_hours,
+            "created": task.created_at.isoformat(),
+            "deps": sorted(task.dependencies),
+            "related": related,
+            "identity": identity,
+            "today": date.today().isoformat(),
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> AnalysisResult | None:
+        """Get a cached result.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached AnalysisResult, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            return AnalysisResult(
+                task_id=entry["task_id"],
+                score=entry["score"],
+                reasoning=entry["reasoning"],
+                suggestions=list(entry.get("suggestions", [])),
+            )
+        except (KeyError, TypeError):
+            return None
+
+    def put(self, key: str, result: AnalysisResult) -> None:
+        """Store a result in the cache.
+
+        Args:
+            key: Cache key from make_key
+            result: The result to store
+        """
+        self._set(
+            key,
+            {
+                "task_id": result.task_id,
+                "score": result.score,
+                "reasoning": result.reasoning,
+                "suggestions": list(result.suggestions),
+            },
+        )
+
+
+class GenerationCache(_JsonCache):
+    """Content-addressed cache for raw LLM completions.
+
+    Keys hash the full prompt together with the model and generation limits,
+    so any change to a task (which changes its prompt context) is a miss.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            path: Cache file. Defaults to $TASK_BUTLER_HOME/cache/generations.json
+            max_entries: Maximum number of entries to keep
+        """
+        if path is None:
+            from ..config import get_home_dir
+
+            path = get_home_dir() / "cache" / "generations.json"
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(prompt: str, model: str, max_tokens: int, options: str = "") -> str:
+        """Build the cache key for a completion request.
+
+        Args:
+            prompt: Full prompt text
+            model: Model name or path
+            max_tokens: Maximum tokens to generate
+            options: Other settings that change the output (e.g. early stopping)
+
+        Returns:
+            Hex BLAKE2b digest
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (model, str(max_tokens), options, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Get a cached completion.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached text, or None on a miss
+        """
+        text = self.entries.get(key)
+        return text if isinstance(text, str) else None
+
+    def put(self, key: str, text: str) -> None:
+        """Store a completion in the cache.
+
+        Args:
+            key: Cache key from make_key
+            text: Generated text
+        """
+        self._set(key, text)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import urllib.request
 from pathlib import Path
 from typing import Callable
@@ -38,23 +39,54 @@ AVAILABLE_MODELS = {
 
 DEFAULT_MODEL = "tinyllama-1.1b"
 
+# GGUF quantizations offered for every model, with file size relative to Q4_K_M.
+# 4-bit weights halve memory traffic vs 8-bit (decode is bandwidth-bound) at
+# little quality loss; Q5_K_M trades some speed for quality.
+QUANTIZATIONS = {"Q4_K_M": 1.0, "Q5_K_M": 1.15}
+DEFAULT_QUANTIZATION = "Q4_K_M"
+
+# Quantization tag in the AVAILABLE_MODELS file names and URLs
+_QUANT_TAG = re.compile(r"[qQ]4_K_M")
+
 
 class ModelManager:
     """Manages LLM model downloads and paths."""
 
-    def __init__(self, models_dir: Path | None = None):
+    def __init__(self, models_dir: Path | None = None, quantization: str | None = None):
         """Initialize model manager.
 
         Args:
             models_dir: Directory to store models. Defaults to $TASK_BUTLER_HOME/models/
+            quantization: GGUF quantization to use (see QUANTIZATIONS).
+                          Defaults to ai.llama.quantization from the config.
         """
         if models_dir is None:
             from ..config import get_home_dir
 
             models_dir = get_home_dir() / "models"
+        if quantization is None:
+            from ..config import get_config
+
+            quantization = get_config().get_ai_config()["llama"].get("quantization")
+        quantization = str(quantization or DEFAULT_QUANTIZATION).upper()
+        self.quantization = quantization if quantization in QUANTIZATIONS else DEFAULT_QUANTIZATION
         self.models_dir = models_dir
         self.models_dir.mkdir(parents=True, exist_ok=True)
 
+    def _model_info(self, model_name: str) -> dict:
+        """Get a model's info with file name, URL and size for the chosen quantization."""
+        info = dict(AVAILABLE_MODELS[model_name])
+        if self.quantization != DEFAULT_QUANTIZATION:
+
+            def retag(match: re.Match) -> str:
+                # Keep the repository's case for the leading "q" (q4_K_M vs Q4_K_M)
+                return match.group()[0] + self.quantization[1:]
+
+            info["filename"] = _QUANT_TAG.sub(retag, info["filename"])
+            info["url"] = _QUANT_TAG.sub(retag, info["url"])
+            info["size_mb"] = round(info["size_mb"] * QUANTIZATIONS[self.quantization])
+        return info
+
     def get_model_path(self, model_name: str = DEFAULT_MODEL) -> Path | None:
         """Get the path to a model file.
 
@@ -67,7 +99,7 @@ class ModelManager:
         if model_name not in AVAILABLE_MODELS:
             return None
 
-        model_info = AVAILABLE_MODELS[model_name]
+        model_info = self._model_info(model_name)
         model_path = self.models_dir / model_info["filename"]
 
         if model_path.exists():
@@ -107,7 +139,7 @@ class ModelManager:
             available = ", ".join(AVAILABLE_MODELS.keys())
             raise ValueError(f"Unknown model: {model_name}. Available: {available}")
 
-        model_info = AVAILABLE_MODELS[model_name]
+        model_info = self._model_info(model_name)
         model_path = self.models_dir / model_info["filename"]
 
         if model_path.exists():
@@ -157,7 +189,8 @@ class ModelManager:
             List of model info dicts with 'installed' key added
         """
         result = []
-        for name, info in AVAILABLE_MODELS.items():
+        for name in AVAILABLE_MODELS:
+            info = self._model_info(name)
             model_info = {
                 "name": name,
                 "display_name": info["name"],
@@ -178,10 +211,10 @@ class ModelManager:
             True if model was deleted, False if not found
         """
         model_path = self.get_model_path(model_name)
-        if model_path and model_path.exists():
-            model_path.unlink()
-            return True
-        return False
+        if model_path is None:
+            return False
+        model_path.unlink()
+        return True
 
     def ensure_model(self, model_name: str = DEFAULT_MODEL) -> Path:
         """Ensure a model is available, downloading if needed.
@@ -8,14 +8,17 @@ This module provides a centralized way to manage AI prompts with:
 
 from __future__ import annotations
 
-import re
+import string
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..config import Config
 
-# Default prompts for each language
-DEFAULT_PROMPTS = {
+# Default prompts for each language (frozen into DEFAULT_PROMPTS below)
+_DEFAULT_PROMPTS: dict[str, dict[str, str]] = {
     "en": {
         "analyze_system": "You are a task management assistant. Analyze the task and explain why it should be prioritized.\nBe concise (1-2 sentences).",
         "analyze_user": "Analyze this task and explain its priority:\n\n{context}\n\nCurrent priority score: {score}/100\n\nWhy should this task be prioritized? Give a brief explanation:",
@@ -23,6 +26,13 @@ DEFAULT_PROMPTS = {
         "suggest_user": "Task: {title}\n{context}\n\nGive 1-2 brief suggestions (one per line):",
         "reason_system": "You are a task assistant. Explain briefly why this task should be done now.\nOne sentence only.",
         "reason_user": "Task: {title}\n{context}\n\nWhy do this task now?",
+        "reasons_system": "You are a task assistant. For each task, explain briefly why it should be done now.\nOne sentence per task.",
+        "reasons_user": """For each task below, write one line in this format:
+<task id>: <one-sentence reason>
+
+Tasks ({task_count}):
+
+{task_blocks}""",
         # Portfolio/holistic analysis prompts
         "portfolio_system": """You are a task management expert. Analyze the task list holistically.""",
         "portfolio_user": """Analyze these {task_count} tasks and provide overall evaluation and insights:
@@ -35,6 +45,14 @@ Key points to analyze:
 - Any issues to be aware of
 
 Respond concisely in 3-5 sentences:""",
+        # Batch analysis prompts (multiple tasks in one request)
+        "batch_system": "You are a task management assistant. For each task, explain briefly why it should be prioritized and give 1-2 action suggestions.\nOutput one JSON object per line and nothing else.",
+        "batch_user": """For each task below, output one line of JSON in this format:
+{{"task_id": "<id>", "reasoning": "<1-2 sentences>", "suggestions": ["<suggestion>"]}}
+
+Tasks ({task_count}):
+
+{task_blocks}""",
         # UI labels for context building
         "task_name": "Task",
         "priority": "Priority",
@@ -54,6 +72,13 @@ Respond concisely in 3-5 sentences:""",
         "suggest_user": "タスク: {title}\n{context}\n\n1-2個の提案を書いてください（1行ずつ）：",
         "reason_system": "あなたはタスクアシスタントです。このタスクを今やるべき理由を簡潔に説明してください。\n一文のみで。",
         "reason_user": "タスク: {title}\n{context}\n\nなぜ今このタスクをやるべき？",
+        "reasons_system": "あなたはタスクアシスタントです。各タスクについて、今やるべき理由を簡潔に説明してください。\n1タスクにつき一文のみで。",
+        "reasons_user": """以下の各タスクについて、次の形式で1行ずつ書いてください：
+<タスクID>: <今やるべき理由（一文）>
+
+タスク（{task_count}件）：
+
+{task_blocks}""",
         # Portfolio/holistic analysis prompts
         "portfolio_system": """あなたはタスク管理の専門家です。タスク一覧を俯瞰的に分析してください。""",
         "portfolio_user": """以下の{task_count}件のタスクを分析し、全体的な評価と洞察を簡潔に述べてください。
@@ -66,6 +91,14 @@ Respond concisely in 3-5 sentences:""",
 - 注意すべき問題点はあるか
 
 簡潔に3-5文で回答してください：""",
+        # Batch analysis prompts (multiple tasks in one request)
+        "batch_system": "あなたはタスク管理アシスタントです。各タスクについて、なぜ優先すべきかを簡潔に説明し、1-2個のアクションを提案してください。\n1行に1つのJSONオブジェクトのみを出力してください。",
+        "batch_user": """以下の各タスクについて、次の形式のJSONを1行ずつ出力してください：
+{{"task_id": "<id>", "reasoning": "<1-2文の説明>", "suggestions": ["<提案>"]}}
+
+タスク（{task_count}件）：
+
+{task_blocks}""",
         # UI labels for context building
         "task_name": "タスク名",
         "priority": "優先度",
@@ -80,6 +113,17 @@ Respond concisely in 3-5 sentences:""",
     },
 }
 
+
+def _freeze(prompts: dict[str, str]) -> Mapping[str, str]:
+    """Return a read-only view of prompts with interned keys."""
+    return MappingProxyType({sys.intern(key): value for key, value in prompts.items()})
+
+
+# Read-only defaults, shared by every PromptManager without copying
+DEFAULT_PROMPTS: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {language: _freeze(prompts) for language, prompts in _DEFAULT_PROMPTS.items()}
+)
+
 # Prompt categories for documentation
 PROMPT_CATEGORIES = {
     "analyze": {
@@ -95,13 +139,18 @@ PROMPT_CATEGORIES = {
     "reason": {
         "description_en": "Priority reasoning prompts",
         "description_ja": "優先度理由プロンプト",
-        "keys": ["reason_system", "reason_user"],
+        "keys": ["reason_system", "reason_user", "reasons_system", "reasons_user"],
     },
     "portfolio": {
         "description_en": "Portfolio/holistic analysis prompts",
         "description_ja": "全体分析プロンプト",
         "keys": ["portfolio_system", "portfolio_user"],
     },
+    "batch": {
+        "description_en": "Batch analysis prompts (multiple tasks per request)",
+        "description_ja": "一括分析プロンプト（複数タスクを1回で分析）",
+        "keys": ["batch_system", "batch_user"],
+    },
     "labels": {
         "description_en": "Context labels (used in prompts)",
         "description_ja": "コンテキストラベル（プロンプト内で使用）",
@@ -154,9 +203,35 @@ PLACEHOLDER_DOCS = {
         "description_en": "Summary list of all tasks (for portfolio analysis)",
         "description_ja": "全タスクのサマリーリスト（全体分析用）",
     },
+    "task_blocks": {
+        "description_en": "Per-task details wrapped in <task id=...> blocks (for batch analysis)",
+        "description_ja": "<task id=...>で囲んだタスクごとの詳細（一括分析用）",
+    },
 }
 
 
+_formatter = string.Formatter()
+
+
+def _parse_placeholders(template: str) -> tuple[str, ...]:
+    """Extract placeholder names from a format string.
+
+    Args:
+        template: Prompt template (str.format syntax)
+
+    Returns:
+        Placeholder names in order of first appearance, without duplicates
+    """
+    try:
+        fields = [name for _, name, _, _ in _formatter.parse(template) if name]
+    except ValueError:
+        # Malformed template (e.g., unmatched brace)
+        return ()
+    # Use the root name for attribute/index fields like {task.title} or {items[0]}
+    roots = (name.partition(".")[0].partition("[")[0] for name in fields)
+    return tuple(dict.fromkeys(roots))
+
+
 class PromptManager:
     """Manages prompt loading and customization.
 
@@ -177,37 +252,50 @@ class PromptManager:
             language: Language code ('en' or 'ja')
         """
         self.language = language if language in ("en", "ja") else "ja"
-        self._prompts: dict[str, str] | None = None
+        self._prompts: Mapping[str, str] | None = None
+        self._customized_keys: frozenset[str] = frozenset()
+        self._placeholders: dict[str, tuple[str, ...]] = {}
+
+    def _load_prompts(self) -> tuple[Mapping[str, str], frozenset[str]]:
+        """Load prompts from config, falling back to defaults.
 
-    def _load_prompts(self) -> dict[str, str]:
-        """Load prompts from config, falling back to defaults."""
+        Returns:
+            Tuple of (prompts, keys that differ from the defaults)
+        """
         from ..config import get_config
 
-        # Start with defaults
-        prompts = DEFAULT_PROMPTS[self.language].copy()
+        defaults = DEFAULT_PROMPTS[self.language]
+        merged: dict[str, str] | None = None
+        customized: set[str] = set()
 
         # Load custom prompts from config
         try:
             config = get_config()
             ai_config = config.get_ai_config()
             custom_prompts = ai_config.get("prompts", {}).get(self.language, {})
-
-            # Merge custom prompts (override defaults)
-            if isinstance(custom_prompts, dict):
-                for key, value in custom_prompts.items():
-                    if isinstance(value, str) and key in prompts:
-                        prompts[key] = value
+            if not custom_prompts or not isinstance(custom_prompts, dict):
+                return defaults, frozenset()
+
+            # Merge custom prompts (override defaults); overrides identical to
+            # the default don't need a copy
+            for key, value in custom_prompts.items():
+                if isinstance(value, str) and key in defaults and value != defaults[key]:
+                    if merged is None:
+                        merged = dict(defaults)
+                    merged[key] = value
+                    customized.add(key)
         except Exception:
             # If config loading fails, use defaults
             pass
 
-        return prompts
+        # Without customizations, share the frozen defaults instead of copying them
+        return (defaults if merged is None else merged), frozenset(customized)
 
     @property
-    def prompts(self) -> dict[str, str]:
+    def prompts(self) -> Mapping[str, str]:
         """Get all prompts (lazy loaded)."""
         if self._prompts is None:
-            self._prompts = self._load_prompts()
+            self._prompts, self._customized_keys = self._load_prompts()
         return self._prompts
 
     def get(self, key: str, default: str = "") -> str:
@@ -234,10 +322,16 @@ class PromptManager:
         """
         prompt = self.get(key)
         if prompt and kwargs:
+            placeholders = self._get_placeholders(key)
+            # Nothing to substitute or unescape: skip the format-string scan
+            if not placeholders and "{" not in prompt and "}" not in prompt:
+                return prompt
+            # Return unformatted if placeholders don't match
+            if not kwargs.keys() >= set(placeholders):
+                return prompt
             try:
-                return prompt.format(**kwargs)
-            except KeyError:
-                # Return unformatted if placeholders don't match
+                return prompt.format_map(kwargs)
+            except (KeyError, IndexError, ValueError):
                 return prompt
         return prompt
 
@@ -249,19 +343,24 @@ class PromptManager:
         """
         return list(self.prompts.keys())
 
-    def list_placeholders(self, key: str) -> list[str]:
+    def _get_placeholders(self, key: str) -> tuple[str, ...]:
+        """Get placeholder names for a prompt, parsing the template once per key."""
+        placeholders = self._placeholders.get(key)
+        if placeholders is None:
+            placeholders = _parse_placeholders(self.get(key))
+            self._placeholders[key] = placeholders
+        return placeholders
+
+    def list_placeholders(self, key: str) -> tuple[str, ...]:
         """Extract placeholder names from a prompt.
 
         Args:
             key: Prompt key
 
         Returns:
-            List of placeholder names (e.g., ['context', 'score'])
+            Tuple of placeholder names (e.g., ('context', 'score'))
         """
-        prompt = self.get(key)
-        if not prompt:
-            return []
-        return re.findall(r"\{(\w+)\}", prompt)
+        return self._get_placeholders(key)
 
     def is_customized(self, key: str) -> bool:
         """Check if a prompt has been customized by the user.
@@ -272,13 +371,42 @@ class PromptManager:
         Returns:
             True if the prompt differs from the default
         """
-        current = self.get(key)
-        default = DEFAULT_PROMPTS.get(self.language, {}).get(key, "")
-        return current != default
+        if self._prompts is None:
+            self._prompts, self._customized_keys = self._load_prompts()
+        return key in self._customized_keys
+
+    def get_with_status(self, key: str, default: str = "") -> tuple[str, bool]:
+        """Get a prompt together with its customization state.
+
+        Args:
+            key: Prompt key
+            default: Default value if key not found
+
+        Returns:
+            Tuple of (prompt text, customized)
+        """
+        prompts = self.prompts
+        return prompts.get(key, default), key in self._customized_keys
+
+    def iter_prompts(self, keys: Iterable[str] | None = None) -> Iterator[tuple[str, str, bool]]:
+        """Iterate over prompts together with their customization state.
+
+        Args:
+            keys: Prompt keys to include, in order (all prompts if None)
+
+        Yields:
+            Tuples of (key, prompt text, customized)
+        """
+        prompts = self.prompts
+        customized = self._customized_keys
+        for key in prompts if keys is None else keys:
+            yield key, prompts.get(key, ""), key in customized
 
     def reload(self) -> None:
         """Reload prompts from config (clears cache)."""
         self._prompts = None
+        self._customized_keys = frozenset()
+        self._placeholders = {}
 
     @staticmethod
     def get_default_prompt(key: str, language: str = "ja") -> str:
@@ -321,11 +449,12 @@ class PromptManager:
 
 
 # Singleton instance for global access
-_prompt_manager: PromptManager | None = None
+# One manager per language so switching languages keeps loaded prompts
+_managers: dict[str, PromptManager] = {}
 
 
 def get_prompt_manager(language: str | None = None) -> PromptManager:
-    """Get the global PromptManager instance.
+    """Get the global PromptManager instance for a language.
 
     Args:
         language: Language code. If None, uses config setting.
@@ -333,8 +462,6 @@ def get_prompt_manager(language: str | None = None) -> PromptManager:
     Returns:
         PromptManager instance
     """
-    global _prompt_manager
-
     # Determine language
     if language is None:
         from ..config import get_config
@@ -343,9 +470,15 @@ def get_prompt_manager(language: str | None = None) -> PromptManager:
             language = get_config().get_ai_language()
         except Exception:
             language = "ja"
+    if language not in ("en", "ja"):
+        language = "ja"
+
+    manager = _managers.get(language)
+    if manager is None:
+        manager = _managers[language] = PromptManager(language)
+    return manager
 
-    # Create or update manager
-    if _prompt_manager is None or _prompt_manager.language != language:
-        _prompt_manager = PromptManager(language)
 
-    return _prompt_manager
+def reload_all() -> None:
+    """Discard all global PromptManager instances so prompts are reloaded from config."""
+    _managers.clear()
@@ -1,16 +1,39 @@
-"""AI providers for Task Butler."""
+"""AI providers for Task Butler.
 
-from .rule_based import RuleBasedProvider
+Providers are imported lazily on first access (PEP 562), so using the
+rule-based provider does not load llama-cpp-python.
+"""
 
-# LlamaProvider is optional (requires llama-cpp-python)
-try:
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
     from .llama import LlamaProvider, is_llama_available
-except ImportError:
-    LlamaProvider = None  # type: ignore
-    is_llama_available = lambda: False  # noqa: E731
+    from .rule_based import RuleBasedProvider
 
 __all__ = [
     "RuleBasedProvider",
     "LlamaProvider",
     "is_llama_available",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import providers on first access."""
+    if name == "RuleBasedProvider":
+        from .rule_based import RuleBasedProvider
+
+        value: Any = RuleBasedProvider
+    elif name in ("LlamaProvider", "is_llama_available"):
+        # LlamaProvider is optional (requires llama-cpp-python)
+        try:
+            from . import llama
+
+            value = getattr(llama, name)
+        except ImportError:
+            value = None if name == "LlamaProvider" else (lambda: False)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
+import json
+import os
 import re
+import threading
+from datetime import datetime
 from typing import TYPE_CHECKING
 
+from rich.console import Console
+from rich.status import Status
+
 from ..base import (
     AIProvider,
     AnalysisResult,
@@ -13,7 +22,9 @@ from ..base import (
     PortfolioInsight,
     SuggestionResult,
     TaskWithReason,
+    index_dependencies,
 )
+from ..cache import GenerationCache
 from ..model_manager import DEFAULT_MODEL, ModelManager
 from ..prompts import PromptManager
 from .rule_based import RuleBasedProvider
@@ -30,6 +41,77 @@ except ImportError:
     LLAMA_AVAILABLE = False
     Llama = None
 
+# Models loaded in this process, shared by providers with the same load settings
+_LLM_CACHE: dict[tuple, object] = {}
+_LLM_CACHE_LOCK = threading.Lock()
+
+# Console for loading/generation spinners and warnings
+_console = Console()
+
+# Precision markers in GGUF file names of unquantized (16/32-bit) models
+_UNQUANTIZED_NAME = re.compile(r"(?:^|[._-])(?:f16|f32|bf16|fp16|fp32)(?:[._-]|$)", re.IGNORECASE)
+
+# KV cache types accepted for ai.llama.kv_cache_type (f16 is llama.cpp's default)
+KV_CACHE_TYPES = ("f16", "q8_0", "q4_0")
+
+# End of the first sentence while streaming ("." etc. only count once followed by space)
+_SENTENCE_END = re.compile(r"[。！？]|[.!?](?=\s)")
+
+# Sentence ends within this many characters don't stop streaming; a shorter
+# reason is rejected by the callers anyway
+_MIN_SENTENCE_CHARS = 10
+
+# Text up to the last sentence end (greedy, so a single scan plus a short backtrack)
+_UP_TO_LAST_SENTENCE_END = re.compile(r".*[。！？.!?]", re.DOTALL)
+
+# First sentence or line boundary in a one-sentence reason
+_FIRST_SENTENCE_BOUNDARY = re.compile(r"[。.\n]")
+
+# Task descriptions are cut to this length in prompts; long notes would
+# otherwise dominate prompt length (and the KV cache n_ctx has to hold)
+_MAX_DESCRIPTION_CHARS = 240
+
+# Prompt template pieces per model family: (head, separator, tail) around the
+# system and user prompts
+_PROMPT_TEMPLATES = {
+    # Llama-2 / ELYZA format
+    "llama2": ("[INST] <<SYS>>\n", "\n<</SYS>>\n\n", " [/INST]"),
+    # Llama-3 format (the tokenizer adds <|begin_of_text|> as BOS)
+    "llama3": (
+        "<|start_header_id|>system<|end_header_id|>\n\n",
+        "<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n",
+        "<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
+    ),
+    # ChatML format (TinyLlama, Phi, etc.)
+    "chatml": ("<|system|>\n", "\n</s>\n<|user|>\n", "\n</s>\n<|assistant|>\n"),
+}
+
+# End-of-turn markers of all template families, and a run of blank lines
+_STOP_SEQUENCES = ["</s>", "<|eot_id|>", "\n\n\n"]
+
+# Concurrent requests sent to a llama.cpp server (match its --parallel slots)
+_MAX_PARALLEL_REQUESTS = 4
+
+# Numbering and bullet characters stripped from the start of suggestion lines
+_LIST_MARKER_CHARS = "0123456789.-*"
+
+# _generate options for action suggestions (two lines at most are kept)
+_SUGGESTION_OPTIONS = {"max_tokens": 100, "stop_lines": 2}
+
+# GBNF grammar for batch analysis: one JSON object per line, as batch_user asks
+_BATCH_GRAMMAR = r"""
+root ::= line+
+line ::= "{" ws task-id "," ws reasoning "," ws suggestions ws "}" "\n"
+task-id ::= "\"task_id\":" ws string
+reasoning ::= "\"reasoning\":" ws string
+suggestions ::= "\"suggestions\":" ws "[" ws ( string ( "," ws string )? )? ws "]"
+string ::= "\"" ( [^"\\\n] | "\\" ["\\/bfnrt] )* "\""
+ws ::= " "?
+"""
+
+# "<task id>: <reason>" lines in batched reason responses
+_REASON_LINE = re.compile(r"^\s*[\[<]?([\w-]+)[\]>]?\s*[:：]\s*(.+)$")
+
 
 class LlamaProvider(AIProvider):
     """AI provider using local LLM via llama-cpp-python.
@@ -38,6 +120,7 @@ class LlamaProvider(AIProvider):
     """
 
     # Model families and their prompt formats
+    LLAMA3_MODELS = ["llama-3", "llama3"]  # Use <|start_header_id|> format
     LLAMA2_MODELS = ["elyza", "llama-2", "japanese-llama"]  # Use [INST] format
     CHATML_MODELS = ["tinyllama", "phi"]  # Use <|system|> format
 
@@ -46,9 +129,17 @@ class LlamaProvider(AIProvider):
         model_path: str | None = None,
         model_name: str = DEFAULT_MODEL,
         n_ctx: int = 2048,
-        n_gpu_layers: int = 0,
+        n_gpu_layers: int = -1,
         verbose: bool = False,
         language: str = "ja",
+        prompt_cache_mb: int = 512,
+        tensor_split: list[float] | None = None,
+        kv_cache_type: str = "f16",
+        server_url: str | None = None,
+        n_threads: int = 0,
+        use_mlock: bool = False,
+        speculative: bool = False,
+        quantization: str | None = None,
     ):
         """Initialize Llama provider.
 
@@ -57,8 +148,23 @@ class LlamaProvider(AIProvider):
             model_name: Name of model to use if model_path not specified.
             n_ctx: Context window size.
             n_gpu_layers: Number of layers to offload to GPU.
+                          -1 offloads all layers when GPU offload is available.
             verbose: Whether to show verbose output.
             language: Output language ('en' for English, 'ja' for Japanese).
+            prompt_cache_mb: RAM for cached prompt states (KV cache) in MB.
+                             0 disables the cache.
+            tensor_split: Proportion of the model to put on each GPU (multi-GPU).
+            kv_cache_type: KV cache precision ('f16', 'q8_0' or 'q4_0').
+                           Quantized types need flash attention support.
+            server_url: Base URL of a llama.cpp server (OpenAI-compatible API).
+                        When set, requests go to the server instead of a
+                        model loaded in-process.
+            n_threads: CPU threads for generation. 0 uses the physical core count.
+            use_mlock: Lock the model in RAM so the OS cannot swap it out.
+            speculative: Draft tokens by prompt lookup (speculative decoding).
+            quantization: GGUF quantization of model_name downloads ('Q4_K_M'
+                          by default: 4-bit weights halve memory traffic, which
+                          bounds decode speed, at little quality loss).
         """
         self.model_path = model_path
         self.model_name = model_name
@@ -66,35 +172,121 @@ class LlamaProvider(AIProvider):
         self.n_gpu_layers = n_gpu_layers
         self.verbose = verbose
         self.language = language if language in ("en", "ja") else "ja"
+        self.prompt_cache_mb = prompt_cache_mb
+        self.tensor_split = tensor_split
+        self.kv_cache_type = kv_cache_type if kv_cache_type in KV_CACHE_TYPES else "f16"
+        self.server_url = server_url.rstrip("/") if server_url else None
+        self.n_threads = n_threads
+        self.use_mlock = use_mlock
+        self.speculative = speculative
         self._llm = None
+        # The prompt format only depends on the model, so pick it once
+        self._prompt_template = _PROMPT_TEMPLATES[self._prompt_family()]
         self._fallback = RuleBasedProvider()
-        self._model_manager = ModelManager()
+        self._model_manager = ModelManager(quantization=quantization)
         self._prompt_manager = PromptManager(self.language)
+        # Task context labels are fixed for the provider's language
+        self._context_labels = {
+            key: self._prompt_manager.get(key)
+            for key in ("task_name", "priority", "status", "description", "deadline_today")
+        }
+        self._generation_cache = GenerationCache()
+        # Token ids of static prompt heads (template + system prompt)
+        self._prefix_tokens: dict[str, list[int]] = {}
+        # Context strings by task fingerprint (see _build_task_context)
+        self._format_task_context = functools.lru_cache(maxsize=512)(self._format_task_context)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the models shared between providers (they load again on next use).
+
+        Providers that already hold a model keep it until they are discarded.
+        """
+        with _LLM_CACHE_LOCK:
+            _LLM_CACHE.clear()
+
+    def cache_identity(self) -> str | None:
+        """Identify model, language, and active prompts for result caching."""
+        import hashlib
+
+        prompts = json.dumps(dict(self._prompt_manager.prompts), sort_keys=True, ensure_ascii=False)
+        prompt_hash = hashlib.sha256(prompts.encode("utf-8")).hexdigest()[:16]
+        return f"llama:{self._model_id()}:{self.language}:{prompt_hash}"
+
+    def should_cache(self, result: AnalysisResult) -> bool:
+        """Only cache LLM-generated results, never rule-based fallbacks."""
+        return result.reasoning.startswith("🤖")
+
+    def _model_id(self) -> str:
+        """Identify where completions come from (server URL, model path or name)."""
+        return self.server_url or self.model_path or self.model_name
 
-    def _is_llama2_model(self) -> bool:
-        """Check if current model uses Llama-2 prompt format."""
-        model_lower = self.model_name.lower()
-        return any(family in model_lower for family in self.LLAMA2_MODELS)
+    def _llm_available(self) -> bool:
+        """Check if LLM generation is possible (server configured or local model loaded)."""
+        return self.server_url is not None or self._get_llm() is not None
+
+    def _prompt_family(self) -> str:
+        """Pick the prompt format from the model file name, or the model name.
+
+        Returns:
+            Key of _PROMPT_TEMPLATES ('llama3', 'llama2' or 'chatml')
+        """
+        name = (os.path.basename(self.model_path) if self.model_path else self.model_name).lower()
+        # Llama-3 first: Llama-3 based ELYZA models also contain "elyza"
+        if any(family in name for family in self.LLAMA3_MODELS):
+            return "llama3"
+        if any(family in name for family in self.LLAMA2_MODELS):
+            return "llama2"
+        return "chatml"
 
     def _format_prompt(self, system_prompt: str, user_prompt: str) -> str:
-        """Format prompt based on model type."""
-        if self._is_llama2_model():
-            # Llama-2 / ELYZA format
-            return f"""[INST] <<SYS>>
-{system_prompt}
-<</SYS>>
-
-{user_prompt} [/INST]"""
-        else:
-            # ChatML format (TinyLlama, Phi, etc.)
-            return f"""<|system|>
-{system_prompt}
-</s>
-<|user|>
-{user_prompt}
-</s>
-<|assistant|>
-"""
+        """Format prompt based on model type.
+
+        The static system prompt always comes first and user prompts put their
+        instructions before the per-task placeholders, so consecutive requests
+        share a byte-identical prefix that llama.cpp does not re-evaluate.
+        Keep varying data (task context, counts, dates) at the end of prompts.
+        """
+        head, separator, tail = self._prompt_template
+        return f"{head}{system_prompt}{separator}{user_prompt}{tail}"
+
+    def _prompt_tokens(self, llm, prompt: str) -> list[int]:
+        """Tokenize a formatted prompt, reusing the tokens of its static head.
+
+        The template head up to the user prompt only varies with the system
+        prompt, so it is tokenized once per system prompt and only the user
+        part is tokenized per request. The evaluated head is also stored in the
+        prompt cache, so each request only prefills its user part.
+        """
+        head, sep, body = prompt.partition(self._prompt_template[1])
+        if not sep:
+            return llm.tokenize(prompt.encode("utf-8"), special=True)
+
+        prefix = head + sep
+        prefix_tokens = self._prefix_tokens.get(prefix)
+        if prefix_tokens is None:
+            prefix_tokens = llm.tokenize(prefix.encode("utf-8"), special=True)
+            self._prefix_tokens[prefix] = prefix_tokens
+            self._cache_prefix_state(llm, prefix_tokens)
+        return prefix_tokens + llm.tokenize(body.encode("utf-8"), add_bos=False, special=True)
+
+    @staticmethod
+    def _cache_prefix_state(llm, prefix_tokens: list[int]) -> None:
+        """Evaluate a system prompt head once and keep its state in the prompt cache.
+
+        Cached completion states may be evicted or belong to another prompt
+        family; the head state stays reusable for every prompt sharing it.
+        """
+        cache = getattr(llm, "cache", None)
+        if cache is None:
+            return
+        try:
+            llm.reset()
+            llm.eval(prefix_tokens)
+            cache[tuple(prefix_tokens)] = llm.save_state()
+        except Exception:
+            # Generation still works, it just prefills the head again
+            pass
 
     def _get_llm(self):
         """Get or initialize the LLM instance."""
@@ -111,65 +303,312 @@ class LlamaProvider(AIProvider):
             path = Path(self.model_path)
             if not path.exists():
                 return None
+            if _UNQUANTIZED_NAME.search(path.stem):
+                _console.print(
+                    f"[yellow]{path.name} looks unquantized; a Q4_K_M or Q5_K_M GGUF "
+                    "runs 2-4x faster with little quality loss[/yellow]"
+                )
         else:
             path = self._model_manager.get_model_path(self.model_name)
             if path is None:
                 # Model not downloaded, use fallback
                 return None
 
+        n_gpu_layers = self._resolve_gpu_layers()
+        n_threads = self._resolve_threads()
+        key = (
+            str(path),
+            self.n_ctx,
+            n_gpu_layers,
+            tuple(self.tensor_split or ()),
+            self.kv_cache_type,
+            self.prompt_cache_mb,
+            n_threads,
+            self.use_mlock,
+            self.speculative,
+        )
+        # Holding the lock while loading keeps concurrent callers from loading twice
+        with _LLM_CACHE_LOCK:
+            llm = _LLM_CACHE.get(key)
+            if llm is None:
+                try:
+                    with Status(
+                        f"[dim]モデルをロード中: {self.model_name}...[/dim]",
+                        console=_console,
+                        spinner="dots",
+                    ):
+                        llm = Llama(
+                            model_path=str(path),
+                            n_ctx=self.n_ctx,
+                            n_gpu_layers=n_gpu_layers,
+                            tensor_split=self.tensor_split,
+                            n_threads=n_threads,
+                            n_threads_batch=os.cpu_count() or n_threads,
+                            use_mmap=True,
+                            use_mlock=self.use_mlock,
+                            verbose=self.verbose,
+                            **self._kv_cache_kwargs(),
+                            **self._draft_model_kwargs(n_gpu_layers),
+                        )
+                    self._enable_prompt_cache(llm)
+                except Exception:
+                    return None
+                _LLM_CACHE[key] = llm
+        self._llm = llm
+        return llm
+
+    def _resolve_gpu_layers(self) -> int:
+        """Resolve n_gpu_layers, mapping -1 (all layers) to 0 when GPU offload is unsupported."""
+        if self.n_gpu_layers >= 0:
+            return self.n_gpu_layers
         try:
-            from rich.console import Console
-            from rich.status import Status
+            from llama_cpp import llama_supports_gpu_offload
 
-            console = Console()
-            with Status(
-                f"[dim]モデルをロード中: {self.model_name}...[/dim]",
-                console=console,
-                spinner="dots",
-            ):
-                self._llm = Llama(
-                    model_path=str(path),
-                    n_ctx=self.n_ctx,
-                    n_gpu_layers=self.n_gpu_layers,
-                    verbose=self.verbose,
-                )
-            return self._llm
+            return -1 if llama_supports_gpu_offload() else 0
         except Exception:
-            return None
+            # Older llama-cpp-python: let llama.cpp cap -1 at the available layers
+            return -1
+
+    def _resolve_threads(self) -> int:
+        """Resolve n_threads, mapping 0 to the number of physical CPU cores.
+
+        Generation is memory-bound, so threads on hyperthreaded siblings only
+        compete for bandwidth; prompt evaluation still uses all logical cores.
+        """
+        if self.n_threads > 0:
+            return self.n_threads
+        try:
+            import psutil
 
-    def _generate(self, prompt: str, max_tokens: int = 512) -> str | None:
+            physical = psutil.cpu_count(logical=False)
+        except ImportError:
+            physical = None
+        return physical or max((os.cpu_count() or 2) // 2, 1)
+
+    def _kv_cache_kwargs(self) -> dict:
+        """Build Llama() arguments for a quantized KV cache (empty for f16)."""
+        if self.kv_cache_type == "f16":
+            return {}
+        import llama_cpp
+
+        ggml_type = getattr(llama_cpp, f"GGML_TYPE_{self.kv_cache_type.upper()}")
+        # llama.cpp only supports a quantized V cache with flash attention
+        return {"type_k": ggml_type, "type_v": ggml_type, "flash_attn": True}
+
+    def _draft_model_kwargs(self, n_gpu_layers: int) -> dict:
+        """Build Llama() arguments for speculative decoding (empty when disabled).
+
+        Drafts come from n-grams of the prompt rather than a second model:
+        reasons and suggestions repeat task titles and labels from the prompt,
+        and no extra weights have to be downloaded or kept in memory.
+        """
+        if not self.speculative:
+            return {}
+        try:
+            from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+        except ImportError:
+            return {}
+        # Verifying a long draft is cheap on a GPU but not on a CPU
+        return {"draft_model": LlamaPromptLookupDecoding(num_pred_tokens=10 if n_gpu_layers else 2)}
+
+    def _enable_prompt_cache(self, llm) -> None:
+        """Keep evaluated prompt states in RAM so shared prefixes are not re-evaluated.
+
+        llama.cpp already reuses the prefix shared with the immediately preceding
+        prompt; the cache also covers prompts that alternate (analysis, then
+        suggestions, then the next analysis).
+        """
+        if self.prompt_cache_mb <= 0:
+            return
+        try:
+            from llama_cpp import LlamaRAMCache
+
+            llm.set_cache(LlamaRAMCache(capacity_bytes=self.prompt_cache_mb * 1024 * 1024))
+        except Exception:
+            # Older llama-cpp-python without cache support: run uncached
+            pass
+
+    def _generate(
+        self,
+        prompt: str,
+        max_tokens: int = 512,
+        stop_sentence: bool = False,
+        stop_lines: int | None = None,
+        grammar: str | None = None,
+    ) -> str | None:
         """Generate text from prompt.
 
         Args:
             prompt: The prompt to generate from.
             max_tokens: Maximum tokens to generate.
+            stop_sentence: Stop as soon as the first sentence is complete.
+            stop_lines: Stop as soon as this many non-empty lines are complete.
+            grammar: GBNF grammar the output must follow (e.g. _BATCH_GRAMMAR).
 
         Returns:
             Generated text or None if generation failed.
         """
+        # Identical prompts (same task context) reuse the earlier completion
+        key = GenerationCache.make_key(
+            prompt,
+            self._model_id(),
+            max_tokens,
+            options=f"sentence={stop_sentence},lines={stop_lines},grammar={grammar}",
+        )
+        cached = self._generation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.server_url:
+            text = self._generate_remote(prompt, max_tokens, grammar)
+            if text is None:
+                return None
+        else:
+            text = self._generate_local(prompt, max_tokens, stop_sentence, stop_lines, grammar)
+            if text is None:
+                return None
+
+        if text:
+            self._generation_cache.put(key, text)
+        return text
+
+    def _generate_local(
+        self,
+        prompt: str,
+        max_tokens: int,
+        stop_sentence: bool,
+        stop_lines: int | None,
+        grammar: str | None = None,
+    ) -> str | None:
+        """Generate text with the in-process model."""
         llm = self._get_llm()
         if llm is None:
             return None
 
-        try:
-            from rich.console import Console
-            from rich.status import Status
+        options = {}
+        if grammar:
+            compiled = _load_grammar(grammar)
+            if compiled is not None:
+                options["grammar"] = compiled
 
-            console = Console()
+        try:
             with Status(
                 "[dim]AI分析中...[/dim]",
-                console=console,
+                console=_console,
                 spinner="dots",
             ):
-                result = llm(
-                    prompt,
-                    max_tokens=max_tokens,
-                    stop=["</s>", "\n\n\n"],
-                    echo=False,
-                )
-            return result["choices"][0]["text"].strip()
+                tokens = self._prompt_tokens(llm, prompt)
+                if stop_sentence or stop_lines:
+                    text = self._generate_streamed(
+                        llm, tokens, max_tokens, stop_sentence, stop_lines, **options
+                    )
+                else:
+                    result = llm.create_completion(
+                        tokens,
+                        max_tokens=max_tokens,
+                        stop=_STOP_SEQUENCES,
+                        echo=False,
+                        **options,
+                    )
+                    text = result["choices"][0]["text"].strip()
         except Exception:
             return None
+        return text
+
+    def _generate_remote(
+        self, prompt: str, max_tokens: int, grammar: str | None = None
+    ) -> str | None:
+        """Generate text through the llama.cpp server's /v1/completions endpoint."""
+        import urllib.request
+
+        payload = {
+            "prompt": prompt,
+            "max_tokens": max_tokens,
+            "stop": _STOP_SEQUENCES,
+            # Let the server keep the evaluated prompt in its slot, so the next
+            # request only evaluates the part after the shared prefix
+            "cache_prompt": True,
+        }
+        if grammar:
+            payload["grammar"] = grammar
+        request = urllib.request.Request(
+            f"{self.server_url}/v1/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                data = json.loads(response.read().decode("utf-8"))
+            return str(data["choices"][0]["text"]).strip()
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    def _generate_many(self, requests: list[tuple[str, dict]]) -> list[str | None]:
+        """Run independent generation requests.
+
+        A llama.cpp server batches concurrent requests (continuous batching), so
+        they are sent in parallel; the in-process model runs them in turn.
+
+        Args:
+            requests: (prompt, _generate keyword arguments) pairs
+
+        Returns:
+            Generated text (or None) per request, in order
+        """
+        if not self.server_url or len(requests) <= 1:
+            return [self._generate(prompt, **options) for prompt, options in requests]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(len(requests), _MAX_PARALLEL_REQUESTS)) as pool:
+            return list(
+                pool.map(lambda request: self._generate(request[0], **request[1]), requests)
+            )
+
+    @staticmethod
+    def _generate_streamed(
+        llm,
+        prompt: str | list[int],
+        max_tokens: int,
+        stop_sentence: bool,
+        stop_lines: int | None,
+        **options,
+    ) -> str:
+        """Stream a completion and stop decoding once the wanted text is complete.
+
+        Callers only keep the first sentence or the first few lines, so tokens
+        generated past that point would be discarded anyway.
+        """
+        pieces: list[str] = []
+        length = 0  # characters before the current piece
+        tail = ""  # last character of the previous piece, for "." + whitespace
+        current_line = ""
+        complete_lines = 0
+        for chunk in llm.create_completion(
+            prompt,
+            max_tokens=max_tokens,
+            stop=_STOP_SEQUENCES,
+            echo=False,
+            stream=True,
+            **options,
+        ):
+            piece = chunk["choices"][0]["text"]
+            pieces.append(piece)
+            # Only look at the new piece instead of rescanning the whole text
+            if stop_sentence and _SENTENCE_END.search(
+                tail + piece, max(0, _MIN_SENTENCE_CHARS - length + len(tail))
+            ):
+                break
+            if stop_lines and "\n" in piece:
+                *finished, current_line = (current_line + piece).split("\n")
+                complete_lines += sum(1 for line in finished if line.strip())
+                if complete_lines >= stop_lines:
+                    break
+            elif stop_lines:
+                current_line += piece
+            length += len(piece)
+            tail = piece[-1:] or tail
+        return "".join(pieces).strip()
 
     def analyze_task(self, task: "Task", all_tasks: list["Task"]) -> AnalysisResult:
         """Analyze a task using LLM for reasoning, rules for scoring."""
@@ -177,8 +616,7 @@ class LlamaProvider(AIProvider):
         rule_result = self._fallback.analyze_task(task, all_tasks)
 
         # Try LLM enhancement for natural language reasoning
-        llm = self._get_llm()
-        if llm is None:
+        if not self._llm_available():
             # Mark as fallback
             return AnalysisResult(
                 task_id=rule_result.task_id,
@@ -188,7 +626,7 @@ class LlamaProvider(AIProvider):
             )
 
         # Build context about the task
-        context = self._build_task_context(task, all_tasks)
+        context = self._build_task_context(task, index_dependencies(all_tasks))
 
         # Get prompts from manager
         system_prompt = self._prompt_manager.get("analyze_system")
@@ -198,19 +636,28 @@ class LlamaProvider(AIProvider):
 
         prompt = self._format_prompt(system_prompt, user_prompt)
 
-        response = self._generate(prompt, max_tokens=150)
+        requests = [(prompt, {"max_tokens": 150, "stop_sentence": True})]
+        if self.server_url:
+            # Servers handle both requests at once, so ask for suggestions up front
+            requests.append((self._suggestions_prompt(task, context), _SUGGESTION_OPTIONS))
+        responses = self._generate_many(requests)
+
+        response = responses[0]
         if response:
             # Clean up the response
             reasoning = response.strip()
             # Remove any incomplete sentences at the end
-            if reasoning and not reasoning.endswith(("。", ".", "!", "?")):
-                last_period = max(reasoning.rfind("。"), reasoning.rfind("."))
-                if last_period > 0:
-                    reasoning = reasoning[: last_period + 1]
+            if reasoning and not reasoning.endswith(("。", "！", "？", ".", "!", "?")):
+                complete = _UP_TO_LAST_SENTENCE_END.match(reasoning)
+                if complete and complete.end() > 1:
+                    reasoning = complete.group()
 
             if reasoning and len(reasoning) > 10:
                 # Generate suggestions using LLM
-                suggestions = self._generate_suggestions_llm(task, context)
+                if len(responses) > 1:
+                    suggestions = self._parse_suggestions(responses[1])
+                else:
+                    suggestions = self._generate_suggestions_llm(task, context)
 
                 return AnalysisResult(
                     task_id=task.id,
@@ -229,24 +676,118 @@ class LlamaProvider(AIProvider):
 
     def _generate_suggestions_llm(self, task: "Task", context: str) -> list[str]:
         """Generate action suggestions using LLM."""
+        prompt = self._suggestions_prompt(task, context)
+        return self._parse_suggestions(self._generate(prompt, **_SUGGESTION_OPTIONS))
+
+    def _suggestions_prompt(self, task: "Task", context: str) -> str:
+        """Build the action suggestion prompt for a task."""
         system_prompt = self._prompt_manager.get("suggest_system")
-        user_prompt = self._prompt_manager.format(
-            "suggest_user", title=task.title, context=context
-        )
+        user_prompt = self._prompt_manager.format("suggest_user", title=task.title, context=context)
+        return self._format_prompt(system_prompt, user_prompt)
+
+    @staticmethod
+    def _parse_suggestions(response: str | None) -> list[str]:
+        """Parse up to two action suggestions from an LLM response."""
+        if not response:
+            return []
+        # Only the first two non-empty lines are considered; later ones are not scanned
+        lines = itertools.islice(filter(None, map(str.strip, response.splitlines())), 2)
+        suggestions = []
+        for line in lines:
+            # Remove numbering
+            line = line.lstrip(_LIST_MARKER_CHARS).lstrip()
+            if len(line) > 5:
+                suggestions.append(line)
+        return suggestions
+
+    def analyze_tasks_batch(
+        self,
+        tasks: list["Task"],
+        all_tasks: list["Task"],
+        max_tokens_per_task: int | None = None,
+    ) -> list[AnalysisResult]:
+        """Analyze multiple tasks with a single LLM request.
+
+        Each task is sent as a <task id="..."> block and the model answers with
+        one JSON line per task. Scores always come from the rule-based provider;
+        tasks the model skips or answers badly fall back to rule-based reasoning.
+        """
+        if len(tasks) <= 1:
+            return [self.analyze_task(task, all_tasks) for task in tasks]
+
+        rule_results = [self._fallback.analyze_task(task, all_tasks) for task in tasks]
+
+        llm_results: dict[str, tuple[str, list[str]]] = {}
+        if self._llm_available():
+            index = index_dependencies(all_tasks)
+            now = datetime.now()
+            blocks = [
+                f'<task id="{task.short_id}">\n{self._build_task_context(task, index, now)}\n</task>'
+                for task in tasks
+            ]
+            system_prompt = self._prompt_manager.get("batch_system")
+            user_prompt = self._prompt_manager.format(
+                "batch_user", task_count=len(tasks), task_blocks="\n\n".join(blocks)
+            )
+            prompt = self._format_prompt(system_prompt, user_prompt)
+            max_tokens = (max_tokens_per_task or 120) * len(tasks)
+            response = self._generate(
+                prompt, max_tokens=max_tokens, stop_lines=len(tasks), grammar=_BATCH_GRAMMAR
+            )
+            if response:
+                llm_results = self._parse_batch_response(response, tasks)
+
+        results = []
+        for task, rule_result in zip(tasks, rule_results):
+            reasoning, suggestions = llm_results.get(task.id, ("", []))
+            if len(reasoning) > 10:
+                results.append(
+                    AnalysisResult(
+                        task_id=task.id,
+                        score=rule_result.score,
+                        reasoning=f"🤖 {reasoning}",
+                        suggestions=suggestions or rule_result.suggestions,
+                    )
+                )
+            else:
+                results.append(
+                    AnalysisResult(
+                        task_id=rule_result.task_id,
+                        score=rule_result.score,
+                        reasoning=f"📋 {rule_result.reasoning}",
+                        suggestions=rule_result.suggestions,
+                    )
+                )
+        return results
 
-        prompt = self._format_prompt(system_prompt, user_prompt)
-        response = self._generate(prompt, max_tokens=100)
-        if response:
-            lines = [line.strip() for line in response.strip().split("\n") if line.strip()]
-            # Clean up suggestions
-            suggestions = []
-            for line in lines[:2]:
-                # Remove numbering
-                line = re.sub(r"^[\d\.\-\*]+\s*", "", line)
-                if line and len(line) > 5:
-                    suggestions.append(line)
-            return suggestions
-        return []
+    def _parse_batch_response(
+        self, response: str, tasks: list["Task"]
+    ) -> dict[str, tuple[str, list[str]]]:
+        """Parse JSON lines from a batch response into (reasoning, suggestions) by task ID."""
+        task_map = {t.short_id: t.id for t in tasks}
+        task_map.update({t.id: t.id for t in tasks})
+
+        parsed: dict[str, tuple[str, list[str]]] = {}
+        for line in response.splitlines():
+            # Tolerates list markers before and commas or notes after each object
+            data = _first_json_object(line) if "{" in line else None
+            if data is None:
+                continue
+
+            full_id = task_map.get(str(data.get("task_id", "")))
+            if full_id is None:
+                continue
+
+            reasoning = str(data.get("reasoning", "")).strip()
+            raw_suggestions = data.get("suggestions", [])
+            suggestions = (
+                [str(s).strip() for s in raw_suggestions if str(s).strip()][:2]
+                if isinstance(raw_suggestions, list)
+                else []
+            )
+            parsed[full_id] = (reasoning, suggestions)
+
+        return parsed
 
     def suggest_tasks(
         self,
@@ -259,8 +800,7 @@ class LlamaProvider(AIProvider):
         # Get rule-based suggestions for ordering
         rule_suggestions = self._fallback.suggest_tasks(tasks, hours_available, energy_level, count)
 
-        llm = self._get_llm()
-        if llm is None:
+        if not self._llm_available():
             # Mark as fallback
             return [
                 SuggestionResult(
@@ -272,41 +812,92 @@ class LlamaProvider(AIProvider):
                 for s in rule_suggestions
             ]
 
-        # Enhance each suggestion with LLM reasoning
-        enhanced_suggestions = []
-        for suggestion in rule_suggestions[:count]:
-            task = suggestion.task
-            context = self._build_task_context(task, tasks)
-
-            system_prompt = self._prompt_manager.get("reason_system")
-            user_prompt = self._prompt_manager.format(
-                "reason_user", title=task.title, context=context
+        # Enhance the suggestions with LLM reasoning in one request
+        selected = rule_suggestions[:count]
+        reasons = self._generate_reasons_llm([s.task for s in selected], tasks)
+
+        return [
+            SuggestionResult(
+                task=suggestion.task,
+                score=suggestion.score,
+                # Default to rule-based with fallback marker
+                reason=(
+                    f"🤖 {reasons[suggestion.task.id]}"
+                    if suggestion.task.id in reasons
+                    else f"📋 {suggestion.reason}"
+                ),
+                estimated_minutes=suggestion.estimated_minutes,
             )
+            for suggestion in selected
+        ]
 
-            prompt = self._format_prompt(system_prompt, user_prompt)
-            response = self._generate(prompt, max_tokens=80)
-            reason = f"📋 {suggestion.reason}"  # Default to rule-based with fallback marker
+    def _generate_reasons_llm(self, tasks: list["Task"], all_tasks: list["Task"]) -> dict[str, str]:
+        """Generate one-sentence "why now" reasons for tasks.
 
-            if response:
-                cleaned = response.strip()
-                # Take first sentence only
-                for sep in ["。", ".", "\n"]:
-                    if sep in cleaned:
-                        cleaned = cleaned.split(sep)[0] + ("。" if sep == "。" else "")
-                        break
-                if cleaned and len(cleaned) > 5:
-                    reason = f"🤖 {cleaned}"
-
-            enhanced_suggestions.append(
-                SuggestionResult(
-                    task=task,
-                    score=suggestion.score,
-                    reason=reason,
-                    estimated_minutes=suggestion.estimated_minutes,
+        The in-process model answers for all tasks in a single request; with a
+        server backend each task gets its own request and they run concurrently.
+
+        Returns:
+            Dict of task ID to reason (tasks without a usable reason are omitted)
+        """
+        if not tasks:
+            return {}
+
+        index = index_dependencies(all_tasks)
+        now = datetime.now()
+        if len(tasks) == 1 or self.server_url:
+            # A server decodes short per-task requests side by side, which beats
+            # one long combined completion; locally one request is cheaper
+            system_prompt = self._prompt_manager.get("reason_system")
+            requests = []
+            for task in tasks:
+                user_prompt = self._prompt_manager.format(
+                    "reason_user",
+                    title=task.title,
+                    context=self._build_task_context(task, index, now),
                 )
+                prompt = self._format_prompt(system_prompt, user_prompt)
+                requests.append((prompt, {"max_tokens": 80, "stop_sentence": True}))
+            responses = self._generate_many(requests)
+            raw = {task.id: response for task, response in zip(tasks, responses) if response}
+        else:
+            blocks = [
+                f'<task id="{task.short_id}">\n{self._build_task_context(task, index, now)}\n</task>'
+                for task in tasks
+            ]
+            system_prompt = self._prompt_manager.get("reasons_system")
+            user_prompt = self._prompt_manager.format(
+                "reasons_user", task_count=len(tasks), task_blocks="\n\n".join(blocks)
             )
-
-        return enhanced_suggestions
+            prompt = self._format_prompt(system_prompt, user_prompt)
+            response = self._generate(prompt, max_tokens=80 * len(tasks), stop_lines=len(tasks))
+            raw = self._parse_reasons_response(response, tasks) if response else {}
+
+        reasons = {}
+        for task_id, text in raw.items():
+            cleaned = text.strip()
+            # Take first sentence only
+            boundary = _FIRST_SENTENCE_BOUNDARY.search(cleaned)
+            if boundary:
+                cleaned = cleaned[: boundary.start()] + ("。" if boundary.group() == "。" else "")
+            if cleaned and len(cleaned) > 5:
+                reasons[task_id] = cleaned
+        return reasons
+
+    def _parse_reasons_response(self, response: str, tasks: list["Task"]) -> dict[str, str]:
+        """Parse "<task id>: <reason>" lines into reasons by full task ID."""
+        task_map = {t.short_id: t.id for t in tasks}
+        task_map.update({t.id: t.id for t in tasks})
+
+        reasons: dict[str, str] = {}
+        for line in response.splitlines():
+            match = _REASON_LINE.match(line)
+            if match is None:
+                continue
+            full_id = task_map.get(match.group(1))
+            if full_id is not None and full_id not in reasons:
+                reasons[full_id] = match.group(2)
+        return reasons
 
     def create_daily_plan(
         self,
@@ -354,8 +945,7 @@ class LlamaProvider(AIProvider):
         total_tasks = len(tasks)
 
         # Try LLM analysis
-        llm = self._get_llm()
-        if llm is None:
+        if not self._llm_available():
             return self._fallback.analyze_portfolio(tasks, max_tasks)
 
         # Build compact task summary
@@ -373,27 +963,33 @@ class LlamaProvider(AIProvider):
         response = self._generate(prompt, max_tokens=1200)
 
         if response:
-            result = self._parse_portfolio_response(response, analyzed_tasks)
+            result, llm_reasons = self._parse_portfolio_response(response, analyzed_tasks)
             result.total_tasks = total_tasks
             result.analyzed_tasks = len(analyzed_tasks)
 
-            # Get rule-based scores for reliable scoring
-            analyses = {t.id: self._fallback.analyze_task(t, tasks) for t in analyzed_tasks}
-
-            # Get LLM reasons (stored in _parse_portfolio_response)
-            llm_reasons = getattr(result, "_llm_reasons", {})
+            # Get rule-based scores for reliable scoring, only for tasks the LLM ranked
+            task_map = {t.id: t for t in analyzed_tasks}
+            ranked = [
+                task_map[tid] for tid in dict.fromkeys(result.recommended_order) if tid in task_map
+            ]
+            # One batch shares the dependency index instead of rebuilding it per task
+            analyses: dict[str, AnalysisResult] = {
+                t.id: analysis
+                for t, analysis in zip(ranked, self._fallback.analyze_tasks_batch(ranked, tasks))
+            }
 
             # Build ranked_tasks with LLM reasons (fallback to rule-based if no LLM reason)
-            result.ranked_tasks = [
-                TaskWithReason(
-                    task_id=tid,
-                    score=analyses[tid].score if tid in analyses else 50.0,
-                    reason=llm_reasons.get(tid) or (
-                        analyses[tid].reasoning if tid in analyses else "分析データなし"
-                    ),
+            result.ranked_tasks = []
+            for tid in result.recommended_order:
+                analysis = analyses.get(tid)
+                result.ranked_tasks.append(
+                    TaskWithReason(
+                        task_id=tid,
+                        score=analysis.score if analysis else 50.0,
+                        reason=llm_reasons.get(tid)
+                        or (analysis.reasoning if analysis else "分析データなし"),
+                    )
                 )
-                for tid in result.recommended_order
-            ]
 
             # Add warning if tasks were truncated
             if total_tasks > max_tasks:
@@ -411,8 +1007,7 @@ class LlamaProvider(AIProvider):
 
     def _build_portfolio_summary(self, tasks: list["Task"]) -> str:
         """Build a compact summary of all tasks for portfolio analysis."""
-        from datetime import datetime
-
+        now = datetime.now()
         lines = []
         for t in tasks:
             parts = [f"[{t.short_id}] {t.title}"]
@@ -422,7 +1017,7 @@ class LlamaProvider(AIProvider):
 
             # Deadline
             if t.due_date:
-                days = (t.due_date - datetime.now()).days
+                days = (t.due_date - now).days
                 if days < 0:
                     parts.append(f"期限{-days}日超過" if self.language == "ja" else f"{-days}d overdue")
                 elif days == 0:
@@ -444,10 +1039,8 @@ class LlamaProvider(AIProvider):
 
     def _parse_portfolio_response(
         self, response: str, tasks: list["Task"]
-    ) -> HolisticResult:
-        """Parse LLM response into HolisticResult."""
-        import json
-
+    ) -> tuple[HolisticResult, dict[str, str]]:
+        """Parse LLM response into HolisticResult and per-task LLM reasons (by task ID)."""
         task_map = {t.short_id: t.id for t in tasks}
 
         # Try to extract JSON from response
@@ -455,11 +1048,8 @@ class LlamaProvider(AIProvider):
         llm_reasons: dict[str, str] = {}  # task_id -> reason from LLM
 
         try:
-            # Find JSON in response
-            json_match = re.search(r"\{[\s\S]*\}", response)
-            if json_match:
-                data = json.loads(json_match.group())
-
+            data = _first_json_object(response)
+            if data is not None:
                 # Parse recommended order (supports both old and new format)
                 if "order" in data and isinstance(data["order"], list):
                     for item in data["order"]:
@@ -528,50 +1118,103 @@ class LlamaProvider(AIProvider):
             else:
                 result.overall_assessment = f"Analyzed {len(tasks)} tasks."
 
-        # Store LLM reasons in result for later use
-        result._llm_reasons = llm_reasons  # type: ignore[attr-defined]
+        return result, llm_reasons
 
-        return result
+    def _build_task_context(
+        self,
+        task: "Task",
+        index: tuple[dict[str, int], dict[str, int]],
+        now: datetime | None = None,
+    ) -> str:
+        """Build context string for a task.
 
-    def _build_task_context(self, task: "Task", all_tasks: list["Task"]) -> str:
-        """Build context string for a task."""
+        Args:
+            task: Task to describe
+            index: Dependency index of the surrounding tasks (see index_dependencies)
+            now: Reference time for deadlines (pass one value for a whole request)
+        """
+        now = now or datetime.now()
+        open_positions, dependents = index
+        # Everything the context shows, so unchanged tasks reuse the formatted string
+        description = task.description
+        if description and len(description) > _MAX_DESCRIPTION_CHARS:
+            description = description[:_MAX_DESCRIPTION_CHARS] + "…"
+        fingerprint = (
+            task.title,
+            task.priority.value,
+            task.status.value,
+            description,
+            (task.due_date - now).days if task.due_date else None,
+            task.estimated_hours,
+            len(open_positions.keys() & task.dependencies),
+            dependents.get(task.id, 0),
+        )
+        return self._format_task_context(fingerprint)
+
+    def _format_task_context(self, fingerprint: tuple) -> str:
+        """Format a task context from the fingerprint built by _build_task_context."""
         pm = self._prompt_manager
+        labels = self._context_labels
+        title, priority, status, description, days, hours, blocking, blocked_by = fingerprint
 
         lines = [
-            f"{pm.get('task_name')}: {task.title}",
-            f"{pm.get('priority')}: {task.priority.value}",
-            f"{pm.get('status')}: {task.status.value}",
+            f"{labels['task_name']}: {title}",
+            f"{labels['priority']}: {priority}",
+            f"{labels['status']}: {status}",
         ]
 
-        if task.description:
-            lines.append(f"{pm.get('description')}: {task.description}")
-
-        if task.due_date:
-            from datetime import datetime
+        if description:
+            lines.append(f"{labels['description']}: {description}")
 
-            days = (task.due_date - datetime.now()).days
+        if days is not None:
             if days < 0:
                 lines.append(pm.format("deadline_overdue", days=days * -1))
             elif days == 0:
-                lines.append(pm.get("deadline_today"))
+                lines.append(labels["deadline_today"])
             else:
                 lines.append(pm.format("deadline_days", days=days))
 
-        if task.estimated_hours:
-            lines.append(pm.format("estimated_hours", hours=task.estimated_hours))
+        if hours:
+            lines.append(pm.format("estimated_hours", hours=hours))
 
         # Check dependencies
-        blocking = [t for t in all_tasks if t.id in task.dependencies and t.is_open]
         if blocking:
-            lines.append(pm.format("blocking", count=len(blocking)))
+            lines.append(pm.format("blocking", count=blocking))
 
-        blocked_by = [t for t in all_tasks if task.id in t.dependencies and t.is_open]
         if blocked_by:
-            lines.append(pm.format("blocked_by", count=len(blocked_by)))
+            lines.append(pm.format("blocked_by", count=blocked_by))
 
         return "\n".join(lines)
 
 
+def _first_json_object(text: str) -> dict | None:
+    """Decode the JSON object starting at the first "{" in text (None if there is none).
+
+    Uses raw_decode instead of matching the whole span with a regex, so any text
+    after the object is ignored. Only the first "{" is tried: when the object is
+    truncated, a nested object further on must not be mistaken for the response.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_grammar(gbnf: str):
+    """Compile a GBNF grammar once (None when the llama_cpp build lacks grammar support)."""
+    try:
+        from llama_cpp import LlamaGrammar
+
+        return LlamaGrammar.from_string(gbnf, verbose=False)
+    except Exception:
+        return None
+
+
 def is_llama_available() -> bool:
     """Check if llama-cpp-python is available."""
     return LLAMA_AVAILABLE
@@ -14,12 +14,12 @@ from ..base import (
     SuggestionResult,
     TaskWithReason,
     TimeSlot,
+    index_dependencies,
 )
 
 if TYPE_CHECKING:
     from ...models.task import Task
 
-
 class RuleBasedProvider(AIProvider):
     """Rule-based implementation using weighted scoring.
 
@@ -53,22 +53,53 @@ class RuleBasedProvider(AIProvider):
 
     def analyze_task(self, task: "Task", all_tasks: list["Task"]) -> AnalysisResult:
         """Analyze a task using weighted scoring rules."""
+        return self._analyze(task, all_tasks, index_dependencies(all_tasks))
+
+    def analyze_tasks_batch(
+        self,
+        tasks: list["Task"],
+        all_tasks: list["Task"],
+        max_tokens_per_task: int | None = None,
+    ) -> list[AnalysisResult]:
+        """Analyze several tasks, indexing dependencies once for all of them."""
+        return self._analyze_batch(tasks, all_tasks, index_dependencies(all_tasks))
+
+    def _analyze_batch(
+        self,
+        tasks: list["Task"],
+        all_tasks: list["Task"],
+        index: tuple[dict[str, int], dict[str, int]],
+    ) -> list[AnalysisResult]:
+        """Analyze several tasks with a prebuilt dependency index."""
+        if type(self).analyze_task is not RuleBasedProvider.analyze_task:
+            # A subclass customizes single-task analysis; keep routing through it
+            return [self.analyze_task(task, all_tasks) for task in tasks]
+        return [self._analyze(task, all_tasks, index) for task in tasks]
+
+    def _analyze(
+        self,
+        task: "Task",
+        all_tasks: list["Task"],
+        index: tuple[dict[str, int], dict[str, int]],
+    ) -> AnalysisResult:
+        """Analyze a task with a prebuilt dependency index (see index_dependencies)."""
         scores = {}
         reasons = []
+        now = datetime.now()
 
         # 1. Deadline score (0-100)
-        deadline_score = self._calculate_deadline_score(task)
+        deadline_score = self._calculate_deadline_score(task, now)
         scores["deadline"] = deadline_score
         if deadline_score >= 80:
             if task.due_date:
-                days = (task.due_date - datetime.now()).days
+                days = (task.due_date - now).days
                 reasons.append(f"期限が近い（{days}日後）" if days >= 0 else "期限超過")
 
         # 2. Dependency score (0-100)
-        dependency_score = self._calculate_dependency_score(task, all_tasks)
+        blocked_count = index[1].get(task.id, 0)
+        dependency_score = self._calculate_dependency_score(blocked_count)
         scores["dependencies"] = dependency_score
         if dependency_score >= 50:
-            blocked_count = len(self._get_blocked_tasks(task.id, all_tasks))
             if blocked_count > 0:
                 reasons.append(f"{blocked_count}個のタスクがブロックされています")
 
@@ -77,10 +108,10 @@ class RuleBasedProvider(AIProvider):
         scores["effort"] = effort_score
 
         # 4. Staleness score (0-100)
-        staleness_score = self._calculate_staleness_score(task)
+        staleness_score = self._calculate_staleness_score(task, now)
         scores["staleness"] = staleness_score
         if staleness_score >= 70:
-            days = (datetime.now() - task.created_at).days
+            days = (now - task.created_at).days
             reasons.append(f"{days}日間未着手")
 
         # 5. Priority score (0-100)
@@ -97,7 +128,7 @@ class RuleBasedProvider(AIProvider):
         )
 
         # Generate suggestions
-        suggestions = self._generate_suggestions(task, scores, all_tasks)
+        suggestions = self._generate_suggestions(task, scores, all_tasks, index[0])
 
         # Build reasoning
         if not reasons:
@@ -126,7 +157,8 @@ class RuleBasedProvider(AIProvider):
             return []
 
         # Analyze all tasks
-        analyses = {t.id: self.analyze_task(t, tasks) for t in open_tasks}
+        results = self.analyze_tasks_batch(open_tasks, tasks)
+        analyses = {t.id: result for t, result in zip(open_tasks, results)}
 
         # Sort by score
         sorted_tasks = sorted(open_tasks, key=lambda t: analyses[t.id].score, reverse=True)
@@ -283,12 +315,12 @@ class RuleBasedProvider(AIProvider):
 
     # Helper methods
 
-    def _calculate_deadline_score(self, task: "Task") -> float:
+    def _calculate_deadline_score(self, task: "Task", now: datetime | None = None) -> float:
         """Calculate urgency score based on deadline."""
         if not task.due_date:
             return 30.0  # No deadline = moderate baseline
 
-        days_until = (task.due_date - datetime.now()).days
+        days_until = (task.due_date - (now or datetime.now())).days
 
         if days_until < 0:
             return 100.0  # Overdue
@@ -307,11 +339,8 @@ class RuleBasedProvider(AIProvider):
         else:
             return 10.0  # Far future
 
-    def _calculate_dependency_score(self, task: "Task", all_tasks: list["Task"]) -> float:
-        """Calculate impact score based on how many tasks this blocks."""
-        blocked_tasks = self._get_blocked_tasks(task.id, all_tasks)
-        blocked_count = len(blocked_tasks)
-
+    def _calculate_dependency_score(self, blocked_count: int) -> float:
+        """Calculate impact score based on how many open tasks this blocks."""
         if blocked_count == 0:
             return 20.0
         elif blocked_count == 1:
@@ -323,10 +352,6 @@ class RuleBasedProvider(AIProvider):
         else:
             return 100.0
 
-    def _get_blocked_tasks(self, task_id: str, all_tasks: list["Task"]) -> list["Task"]:
-        """Get tasks that are blocked by the given task."""
-        return [t for t in all_tasks if task_id in t.dependencies and t.is_open]
-
     def _calculate_effort_score(self, task: "Task") -> float:
         """Calculate effort score (higher for smaller tasks)."""
         if not task.estimated_hours:
@@ -346,9 +371,9 @@ class RuleBasedProvider(AIProvider):
         else:
             return 10.0  # Large task
 
-    def _calculate_staleness_score(self, task: "Task") -> float:
+    def _calculate_staleness_score(self, task: "Task", now: datetime | None = None) -> float:
         """Calculate staleness based on how long task has been open."""
-        days_open = (datetime.now() - task.created_at).days
+        days_open = ((now or datetime.now()) - task.created_at).days
 
         if days_open <= 1:
             return 10.0  # Fresh
@@ -377,15 +402,20 @@ class RuleBasedProvider(AIProvider):
         return priority_map.get(task.priority, 50.0)
 
     def _generate_suggestions(
-        self, task: "Task", scores: dict[str, float], all_tasks: list["Task"]
+        self,
+        task: "Task",
+        scores: dict[str, float],
+        all_tasks: list["Task"],
+        open_positions: dict[str, int],
     ) -> list[str]:
         """Generate actionable suggestions based on analysis."""
         suggestions = []
 
-        # Check blocking dependencies
-        blocking = [t for t in all_tasks if t.id in task.dependencies and t.is_open]
+        # Check blocking dependencies (the first open one in task list order)
+        blocking = [open_positions[dep] for dep in task.dependencies if dep in open_positions]
         if blocking:
-            suggestions.append(f"まず「{blocking[0].title}」を完了してください（依存関係）")
+            first = all_tasks[min(blocking)]
+            suggestions.append(f"まず「{first.title}」を完了してください（依存関係）")
 
         # Check if task is stale
         if scores["staleness"] >= 70:
@@ -454,8 +484,10 @@ class RuleBasedProvider(AIProvider):
         analyzed_tasks = tasks[:max_tasks]
         total_tasks = len(tasks)
 
-        # Analyze each task
-        analyses = {t.id: self.analyze_task(t, tasks) for t in analyzed_tasks}
+        # Analyze each task; the dependency index is reused for blocker insights
+        index = index_dependencies(tasks)
+        results = self._analyze_batch(analyzed_tasks, tasks, index)
+        analyses = {t.id: result for t, result in zip(analyzed_tasks, results)}
 
         # Sort by score to get recommended order
         sorted_tasks = sorted(
@@ -474,11 +506,77 @@ class RuleBasedProvider(AIProvider):
         ]
 
         # Build insights
+        now = datetime.now()
+        insights, warnings = self.portfolio_insights(analyzed_tasks, index[1], now)
+        overdue_count = sum(1 for t in analyzed_tasks if t.due_date and t.due_date < now)
+
+        # Group by priority
+        from ...models.enums import Priority
+
+        priority_groups: dict[str, list[str]] = {}
+        for t in analyzed_tasks:
+            key = t.priority.value
+            if key not in priority_groups:
+                priority_groups[key] = []
+            priority_groups[key].append(t.id)
+
+        task_groups: list[tuple[str, list[str]]] = []
+        for priority, task_ids in priority_groups.items():
+            if len(task_ids) >= 2:
+                task_groups.append((f"優先度: {priority}", task_ids))
+
+        # Build overall assessment
+        high_priority_count = len([t for t in analyzed_tasks if analyses[t.id].score >= 70])
+        assessment_parts = [f"{len(analyzed_tasks)}件のタスクを分析しました。"]
+        if high_priority_count > 0:
+            assessment_parts.append(f"高優先度: {high_priority_count}件。")
+        if overdue_count:
+            assessment_parts.append(f"期限超過: {overdue_count}件に注意。")
+
+        result = HolisticResult(
+            insights=insights,
+            ranked_tasks=ranked_tasks,
+            recommended_order=recommended_order,
+            task_groups=task_groups,
+            overall_assessment=" ".join(assessment_parts),
+            warnings=warnings,
+            total_tasks=total_tasks,
+            analyzed_tasks=len(analyzed_tasks),
+        )
+
+        # Add warning if tasks were truncated
+        if total_tasks > max_tasks:
+            result.warnings.insert(
+                0, f"タスク数が多いため、上位{max_tasks}件のみ分析しました（全{total_tasks}件中）"
+            )
+
+        return result
+
+    def portfolio_insights(
+        self,
+        tasks: list["Task"],
+        dependents: dict[str, int],
+        now: datetime,
+    ) -> tuple[list[PortfolioInsight], list[str]]:
+        """Build the count-based insights and warnings for a set of tasks.
+
+        Covers overdue tasks, tasks due within 3 days, the top blocker and
+        stale tasks.
+
+        Args:
+            tasks: Tasks to report on
+            dependents: Number of open tasks depending on each task ID
+                        (see index_dependencies)
+            now: Reference time for deadlines and staleness
+
+        Returns:
+            (insights, warnings)
+        """
         insights: list[PortfolioInsight] = []
         warnings: list[str] = []
 
         # 1. Check for overdue tasks
-        overdue_tasks = [t for t in analyzed_tasks if t.due_date and t.due_date < datetime.now()]
+        overdue_tasks = [t for t in tasks if t.due_date and t.due_date < now]
         if overdue_tasks:
             insights.append(
                 PortfolioInsight(
@@ -491,12 +589,8 @@ class RuleBasedProvider(AIProvider):
             warnings.append(f"{len(overdue_tasks)}件のタスクが期限超過")
 
         # 2. Check for tasks due soon (within 3 days)
-        soon_tasks = [
-            t
-            for t in analyzed_tasks
-            if t.due_date
-            and datetime.now() <= t.due_date < datetime.now() + timedelta(days=3)
-        ]
+        soon_limit = now + timedelta(days=3)
+        soon_tasks = [t for t in tasks if t.due_date and now <= t.due_date < soon_limit]
         if soon_tasks:
             insights.append(
                 PortfolioInsight(
@@ -509,10 +603,10 @@ class RuleBasedProvider(AIProvider):
 
         # 3. Find blocking tasks (tasks that block others)
         blocker_tasks = []
-        for t in analyzed_tasks:
-            blocked_by_this = self._get_blocked_tasks(t.id, tasks)
-            if len(blocked_by_this) >= 2:
-                blocker_tasks.append((t, len(blocked_by_this)))
+        for t in tasks:
+            blocked_count = dependents.get(t.id, 0)
+            if blocked_count >= 2:
+                blocker_tasks.append((t, blocked_count))
         if blocker_tasks:
             blocker_tasks.sort(key=lambda x: x[1], reverse=True)
             top_blocker = blocker_tasks[0]
@@ -525,25 +619,8 @@ class RuleBasedProvider(AIProvider):
                 )
             )
 
-        # 4. Group by priority
-        from ...models.enums import Priority
-
-        priority_groups: dict[str, list[str]] = {}
-        for t in analyzed_tasks:
-            key = t.priority.value
-            if key not in priority_groups:
-                priority_groups[key] = []
-            priority_groups[key].append(t.id)
-
-        task_groups: list[tuple[str, list[str]]] = []
-        for priority, task_ids in priority_groups.items():
-            if len(task_ids) >= 2:
-                task_groups.append((f"優先度: {priority}", task_ids))
-
-        # 5. Check for stale tasks
-        stale_tasks = [
-            t for t in analyzed_tasks if (datetime.now() - t.created_at).days >= 14
-        ]
+        # 4. Check for stale tasks
+        stale_tasks = [t for t in tasks if (now - t.created_at).days >= 14]
         if stale_tasks:
             insights.append(
                 PortfolioInsight(
@@ -554,29 +631,4 @@ class RuleBasedProvider(AIProvider):
                 )
             )
 
-        # Build overall assessment
-        high_priority_count = len([t for t in analyzed_tasks if analyses[t.id].score >= 70])
-        assessment_parts = [f"{len(analyzed_tasks)}件のタスクを分析しました。"]
-        if high_priority_count > 0:
-            assessment_parts.append(f"高優先度: {high_priority_count}件。")
-        if overdue_tasks:
-            assessment_parts.append(f"期限超過: {len(overdue_tasks)}件に注意。")
-
-        result = HolisticResult(
-            insights=insights,
-            ranked_tasks=ranked_tasks,
-            recommended_order=recommended_order,
-            task_groups=task_groups,
-            overall_assessment=" ".join(assessment_parts),
-            warnings=warnings,
-            total_tasks=total_tasks,
-            analyzed_tasks=len(analyzed_tasks),
-        )
-
-        # Add warning if tasks were truncated
-        if total_tasks > max_tasks:
-            result.warnings.insert(
-                0, f"タスク数が多いため、上位{max_tasks}件のみ分析しました（全{total_tasks}件中）"
-            )
-
-        return result
+        return insights, warnings
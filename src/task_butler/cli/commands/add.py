@@ -18,36 +18,43 @@ from ..date_picker import pick_date
 
 console = Console()
 
+# Recurrence keywords and "every N <unit>s" units
+_RECURRENCE_FREQUENCIES = {
+    "daily": Frequency.DAILY,
+    "weekly": Frequency.WEEKLY,
+    "monthly": Frequency.MONTHLY,
+    "yearly": Frequency.YEARLY,
+}
+_RECURRENCE_UNITS = {
+    "day": Frequency.DAILY,
+    "week": Frequency.WEEKLY,
+    "month": Frequency.MONTHLY,
+    "year": Frequency.YEARLY,
+}
+_EVERY_N_PATTERN = re.compile(r"every\s+(\d+)\s+(day|week|month|year)s?")
+
+# Relative due dates, as days from today
+_RELATIVE_DUE_DAYS = {"today": 0, "tomorrow": 1, "next week": 7}
+# YYYY-MM-DD, YYYY/MM/DD, MM/DD and MM-DD (same separator throughout)
+_DUE_DATE_PATTERN = re.compile(r"(?:(\d{4})([-/]))?(\d{1,2})([-/])(\d{1,2})")
+
 
 def parse_due_date(value: str) -> datetime:
     """Parse due date from string."""
-    formats = [
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        "%m/%d",
-        "%m-%d",
-    ]
-
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(value, fmt)
-            # If year not specified, use current year
-            if dt.year == 1900:
-                dt = dt.replace(year=datetime.now().year)
-            return dt
-        except ValueError:
-            continue
-
-    # Try relative dates
-    value_lower = value.lower()
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    days = _RELATIVE_DUE_DAYS.get(value.lower())
+    if days is not None:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today + timedelta(days=days)
 
-    if value_lower == "today":
-        return today
-    elif value_lower == "tomorrow":
-        return today + timedelta(days=1)
-    elif value_lower == "next week":
-        return today + timedelta(weeks=1)
+    match = _DUE_DATE_PATTERN.fullmatch(value)
+    if match:
+        year, year_sep, month, sep, day = match.groups()
+        if year_sep in (None, sep):
+            try:
+                # If year not specified, use current year
+                return datetime(int(year) if year else datetime.now().year, int(month), int(day))
+            except ValueError:
+                pass
 
     raise typer.BadParameter(f"Invalid date format: {value}")
 
@@ -56,27 +63,16 @@ def parse_recurrence(value: str) -> RecurrenceRule:
     """Parse recurrence rule from string."""
     value_lower = value.lower()
 
-    if value_lower == "daily":
-        return RecurrenceRule(frequency=Frequency.DAILY)
-    elif value_lower == "weekly":
-        return RecurrenceRule(frequency=Frequency.WEEKLY)
-    elif value_lower == "monthly":
-        return RecurrenceRule(frequency=Frequency.MONTHLY)
-    elif value_lower == "yearly":
-        return RecurrenceRule(frequency=Frequency.YEARLY)
+    frequency = _RECURRENCE_FREQUENCIES.get(value_lower)
+    if frequency is not None:
+        return RecurrenceRule(frequency=frequency)
 
     # Try "every N days/weeks/months"
-    match = re.match(r"every\s+(\d+)\s+(day|week|month|year)s?", value_lower)
+    match = _EVERY_N_PATTERN.match(value_lower)
     if match:
-        interval = int(match.group(1))
-        unit = match.group(2)
-        freq_map = {
-            "day": Frequency.DAILY,
-            "week": Frequency.WEEKLY,
-            "month": Frequency.MONTHLY,
-            "year": Frequency.YEARLY,
-        }
-        return RecurrenceRule(frequency=freq_map[unit], interval=interval)
+        return RecurrenceRule(
+            frequency=_RECURRENCE_UNITS[match.group(2)], interval=int(match.group(1))
+        )
 
     raise typer.BadParameter(f"Invalid recurrence format: {value}")
 
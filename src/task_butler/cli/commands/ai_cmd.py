@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 console = Console()
 
@@ -18,34 +17,45 @@ ai_app = typer.Typer(
 @ai_app.command(name="status")
 def ai_status() -> None:
     """Show AI provider status and configuration."""
-    from ...ai.model_manager import ModelManager
-    from ...ai.providers.llama import is_llama_available
     from ...config import get_config
 
     config = get_config()
     ai_config = config.get_ai_config()
     provider_name = ai_config.get("provider", "rule_based")
 
+    if provider_name == "llama":
+        from ...ai.providers.llama import is_llama_available
+
+        llama_installed = is_llama_available()
+    else:
+        # Only locate the package: importing it loads the native llama.cpp library
+        from importlib.util import find_spec
+
+        llama_installed = find_spec("llama_cpp") is not None
+
     console.print("[bold]AI Configuration[/bold]")
     console.print()
     console.print(f"  Provider: [cyan]{provider_name}[/cyan]")
     console.print(
-        f"  llama-cpp-python: {'[green]installed[/green]' if is_llama_available() else '[dim]not installed[/dim]'}"
+        f"  llama-cpp-python: {'[green]installed[/green]' if llama_installed else '[dim]not installed[/dim]'}"
     )
 
     if provider_name == "llama":
+        from ...ai.model_manager import ModelManager
+
         llama_config = ai_config.get("llama", {})
         console.print()
         console.print("[bold]Llama Configuration[/bold]")
         console.print(f"  Model: {llama_config.get('model_name', 'tinyllama-1.1b')}")
+        console.print(f"  Quantization: {llama_config.get('quantization', 'Q4_K_M')}")
         console.print(f"  Context size: {llama_config.get('n_ctx', 2048)}")
-        console.print(f"  GPU layers: {llama_config.get('n_gpu_layers', 0)}")
+        console.print(f"  GPU layers: {llama_config.get('n_gpu_layers', -1)}")
 
         # Check if model is downloaded
         manager = ModelManager()
         model_name = llama_config.get("model_name", "tinyllama-1.1b")
-        if manager.is_model_available(model_name):
-            model_path = manager.get_model_path(model_name)
+        model_path = manager.get_model_path(model_name)
+        if model_path:
             console.print(f"  Model path: [green]{model_path}[/green]")
         else:
             console.print("  Model path: [yellow]not downloaded[/yellow]")
@@ -56,6 +66,8 @@ def ai_status() -> None:
 @ai_app.command(name="models")
 def list_models() -> None:
     """List available AI models."""
+    from rich.table import Table
+
     from ...ai.model_manager import ModelManager
 
     manager = ModelManager()
@@ -95,8 +107,8 @@ def download_model(
 
     manager = ModelManager()
 
-    if manager.is_model_available(model_name):
-        model_path = manager.get_model_path(model_name)
+    model_path = manager.get_model_path(model_name)
+    if model_path:
         console.print(f"[green]Model already downloaded: {model_path}[/green]")
         return
 
@@ -122,21 +134,24 @@ def delete_model(
 
     manager = ModelManager()
 
-    if not manager.is_model_available(model_name):
+    # Looked up once; the same path is reported on and deleted
+    model_path = manager.get_model_path(model_name)
+    if model_path is None:
         console.print(f"[yellow]Model not found: {model_name}[/yellow]")
-        raise typer.Exit(0)
+        return
 
     if not force:
         confirm = typer.confirm(f"Delete model '{model_name}'?")
         if not confirm:
             console.print("[dim]Cancelled[/dim]")
-            raise typer.Exit(0)
+            return
 
-    if manager.delete_model(model_name):
-        console.print(f"[green]✓[/green] Deleted: {model_name}")
-    else:
+    try:
+        model_path.unlink()
+    except OSError:
         console.print(f"[red]Failed to delete: {model_name}[/red]")
         raise typer.Exit(1)
+    console.print(f"[green]✓[/green] Deleted: {model_name}")
 
 
 @ai_app.command(name="prompts")
@@ -158,6 +173,9 @@ def show_prompts(
         tb ai prompts -p                 # Show all placeholders
         tb ai prompts analyze_user -p    # Show placeholders for a prompt
     """
+    from rich.table import Table
+    from rich.text import Text
+
     from ...ai.prompts import (
         DEFAULT_PROMPTS,
         PLACEHOLDER_DOCS,
@@ -204,8 +222,7 @@ def show_prompts(
             prompt_text = PromptManager.get_default_prompt(key, language)
             console.print(f"[bold]Default prompt: {key}[/bold] [dim](language: {language})[/dim]")
         else:
-            prompt_text = manager.get(key)
-            is_custom = manager.is_customized(key)
+            prompt_text, is_custom = manager.get_with_status(key)
             status = "[yellow](customized)[/yellow]" if is_custom else "[dim](default)[/dim]"
             console.print(f"[bold]Prompt: {key}[/bold] {status}")
 
@@ -231,16 +248,15 @@ def show_prompts(
         category_desc = category.get(desc_key, category.get("description_ja", ""))
         console.print(f"[bold cyan]{category_desc}[/bold cyan]")
 
-        for prompt_key in category["keys"]:
-            is_custom = manager.is_customized(prompt_key)
+        for prompt_key, prompt_text, is_custom in manager.iter_prompts(category["keys"]):
             status = " [yellow]*[/yellow]" if is_custom else ""
-            prompt_text = manager.get(prompt_key)
-            # Truncate long prompts
-            if len(prompt_text) > 60:
-                prompt_text = prompt_text[:57] + "..."
-            # Replace newlines for display
-            prompt_text = prompt_text.replace("\n", "\\n")
-            console.print(f"  [cyan]{prompt_key}[/cyan]{status}: {prompt_text}")
+            line = Text.from_markup(f"  [cyan]{prompt_key}[/cyan]{status}: ")
+            # Replace newlines for display and cut to 60 terminal cells (CJK
+            # characters take two), without reading the prompt as markup
+            preview = Text(prompt_text.replace("\n", "\\n"))
+            preview.truncate(60, overflow="ellipsis")
+            line.append_text(preview)
+            console.print(line)
 
         console.print()
 
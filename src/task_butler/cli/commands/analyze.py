@@ -2,19 +2,56 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import heapq
+from operator import attrgetter
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+
+from ...models.enums import Priority
+from ...storage import AmbiguousTaskIdError
 
 console = Console()
 
+# Display names for the configured AI provider
+_PROVIDER_LABELS = {
+    "rule_based": "ルールベース",
+    "llama": "ローカルLLM (llama)",
+    "openai": "OpenAI API",
+}
+
+# Obsidian Tasks emoji per priority
+_PRIORITY_ICONS = {
+    Priority.URGENT: "🔺",
+    Priority.HIGH: "⏫",
+    Priority.MEDIUM: "🔼",
+    Priority.LOW: "🔽",
+    Priority.LOWEST: "⏬",
+}
+
+# Icon per holistic insight type (other types get 💡)
+_INSIGHT_ICONS = {
+    "warning": "⚠️",
+    "blocker": "🚫",
+    "sequence": "📋",
+    "optimization": "⏰",
+}
+
+# Score display colors, checked from the highest threshold down
+_SCORE_COLORS = ((80, "red"), (60, "yellow"), (40, "green"))
+
+
+def _score_color(score: float) -> str:
+    """Get the display color for a priority score."""
+    for threshold, color in _SCORE_COLORS:
+        if score >= threshold:
+            return color
+    return "dim"
+
 
 def analyze_tasks(
     ctx: typer.Context,
-    task_id: Optional[str] = typer.Argument(
+    task_id: str | None = typer.Argument(
         None, help="Task ID to analyze (analyzes all if not specified)"
     ),
     count: int = typer.Option(10, "--count", "-n", help="Number of tasks to show"),
@@ -24,6 +61,12 @@ def analyze_tasks(
     limit: int = typer.Option(
         20, "--limit", "-l", help="Maximum tasks for holistic analysis (default: 20)"
     ),
+    chunked: bool = typer.Option(
+        False, "--chunked", "-c", help="Analyze tasks beyond --limit in chunks (holistic mode)"
+    ),
+    warm_cache: bool = typer.Option(
+        False, "--warm-cache", help="Analyze uncached tasks and only store the results (for cron)"
+    ),
     save: bool = typer.Option(False, "--save", "-s", help="Save analysis results to tasks"),
     table: bool = typer.Option(False, "--table", "-t", help="Show as table (individual mode only)"),
 ) -> None:
@@ -39,7 +82,6 @@ def analyze_tasks(
     - How long the task has been open
     - Explicit priority setting
     """
-    from ...ai.analyzer import TaskAnalyzer
     from ...config import get_config
     from ...core.task_manager import TaskManager
 
@@ -52,27 +94,45 @@ def analyze_tasks(
     manager = TaskManager(
         storage_dir, format=format, organization=organization, kanban_dirs=kanban_dirs
     )
-    analyzer = TaskAnalyzer()
 
     # Show AI provider info
     ai_provider = config.get_ai_provider()
-    provider_labels = {
-        "rule_based": "ルールベース",
-        "llama": "ローカルLLM (llama)",
-        "openai": "OpenAI API",
-    }
-    console.print(f"[dim]AIプロバイダー: {provider_labels.get(ai_provider, ai_provider)}[/dim]")
+    console.print(f"[dim]AIプロバイダー: {_PROVIDER_LABELS.get(ai_provider, ai_provider)}[/dim]")
 
     # Get all tasks
     all_tasks = manager.list(include_done=False)
 
     if not all_tasks:
         console.print("[dim]No open tasks to analyze[/dim]")
-        raise typer.Exit(0)
+        return
+    task_map = {t.id: t for t in all_tasks}
+
+    # The AI stack (and any model bindings) only loads once there is work to do
+    from ...ai.analyzer import TaskAnalyzer
+
+    analyzer = TaskAnalyzer()
+
+    if warm_cache:
+        if analyzer.cache is None:
+            console.print("[dim]Result caching is not used by this AI provider[/dim]")
+            return
+        analyzed = analyzer.warm_cache(all_tasks)
+        console.print(f"[green]✓[/green] Cached analysis for {analyzed} tasks")
+        return
 
     if task_id:
-        # Analyze single task (always individual mode)
-        task = manager.get(task_id)
+        # Analyze single task (always individual mode); a full ID of an open task is
+        # already loaded, prefixes go through the manager so closed tasks count too
+        task = task_map.get(task_id)
+        if task is None:
+            try:
+                task = manager.get(task_id)
+            except AmbiguousTaskIdError as e:
+                console.print(f"[red]Error:[/red] Ambiguous task ID '{task_id}'")
+                console.print("Matching tasks:")
+                for t in e.matches:
+                    console.print(f"  {t.short_id} - {t.title}")
+                raise typer.Exit(1)
         if not task:
             console.print(f"[red]Task not found: {task_id}[/red]")
             raise typer.Exit(1)
@@ -91,56 +151,41 @@ def analyze_tasks(
         results = analyzer.analyze_all(all_tasks)[:count]
 
         if table:
-            _show_analysis_table(results, all_tasks)
+            _show_analysis_table(results, task_map)
         else:
-            _show_analysis_list(results, all_tasks)
+            _show_analysis_list(results, task_map)
 
         if save:
-            # Save all analyses
-            task_map = {t.id: t for t in all_tasks}
-            for result in results:
-                if result.task_id in task_map:
-                    note = f"AI分析スコア: {result.score}/100 - {result.reasoning}"
-                    manager.add_note(result.task_id, note)
+            # Save all analyses (the tasks are already loaded, so files are only written)
+            manager.add_notes(
+                {
+                    result.task_id: f"AI分析スコア: {result.score}/100 - {result.reasoning}"
+                    for result in results
+                    if result.task_id in task_map
+                },
+                tasks=all_tasks,
+            )
             console.print(f"\n[green]✓[/green] Analysis saved to {len(results)} tasks")
 
     else:
         # Holistic analysis mode (default)
-        holistic_result = analyzer.analyze_holistic(all_tasks, max_tasks=limit)
-        _show_holistic_analysis(holistic_result, all_tasks)
+        holistic_result = analyzer.analyze_holistic(all_tasks, max_tasks=limit, chunked=chunked)
+        _show_holistic_analysis(holistic_result, task_map)
 
 
 def _show_single_analysis(task, result) -> None:
     """Show detailed analysis for a single task."""
-    from ...models.enums import Priority
-
-    priority_icons = {
-        Priority.URGENT: "🔺",
-        Priority.HIGH: "⏫",
-        Priority.MEDIUM: "🔼",
-        Priority.LOW: "🔽",
-        Priority.LOWEST: "⏬",
-    }
-
     console.print()
     console.print("[bold]📊 タスク分析[/bold]")
     console.print()
 
-    icon = priority_icons.get(task.priority, "🔼")
+    icon = _PRIORITY_ICONS.get(task.priority, "🔼")
     console.print(f"[bold]{icon} {task.title}[/bold] ({task.short_id})")
     console.print()
 
     # Score with color
     score = result.score
-    if score >= 80:
-        score_color = "red"
-    elif score >= 60:
-        score_color = "yellow"
-    elif score >= 40:
-        score_color = "green"
-    else:
-        score_color = "dim"
-
+    score_color = _score_color(score)
     console.print(f"スコア: [{score_color}]{score:.1f}/100[/{score_color}] ({result.score_label})")
     console.print(f"理由: {result.reasoning}")
 
@@ -151,20 +196,8 @@ def _show_single_analysis(task, result) -> None:
             console.print(f"  • {suggestion}")
 
 
-def _show_analysis_list(results, all_tasks) -> None:
+def _show_analysis_list(results, task_map) -> None:
     """Show analysis results as a list."""
-    from ...models.enums import Priority
-
-    task_map = {t.id: t for t in all_tasks}
-
-    priority_icons = {
-        Priority.URGENT: "🔺",
-        Priority.HIGH: "⏫",
-        Priority.MEDIUM: "🔼",
-        Priority.LOW: "🔽",
-        Priority.LOWEST: "⏬",
-    }
-
     console.print()
     console.print("[bold]📊 タスク分析結果[/bold] [dim](個別分析モード)[/dim]")
     console.print()
@@ -174,17 +207,8 @@ def _show_analysis_list(results, all_tasks) -> None:
         if not task:
             continue
 
-        icon = priority_icons.get(task.priority, "🔼")
-
-        # Score color
-        if result.score >= 80:
-            score_color = "red"
-        elif result.score >= 60:
-            score_color = "yellow"
-        elif result.score >= 40:
-            score_color = "green"
-        else:
-            score_color = "dim"
+        icon = _PRIORITY_ICONS.get(task.priority, "🔼")
+        score_color = _score_color(result.score)
 
         console.print(f"{i}. {icon} [bold]{task.title}[/bold] ({task.short_id})")
         console.print(
@@ -193,19 +217,9 @@ def _show_analysis_list(results, all_tasks) -> None:
         console.print()
 
 
-def _show_analysis_table(results, all_tasks) -> None:
+def _show_analysis_table(results, task_map) -> None:
     """Show analysis results as a table."""
-    from ...models.enums import Priority
-
-    task_map = {t.id: t for t in all_tasks}
-
-    priority_labels = {
-        Priority.URGENT: "urgent",
-        Priority.HIGH: "high",
-        Priority.MEDIUM: "medium",
-        Priority.LOW: "low",
-        Priority.LOWEST: "lowest",
-    }
+    from rich.table import Table
 
     table = Table(title="📊 タスク分析結果 (個別分析モード)")
     table.add_column("#", style="dim", width=3)
@@ -214,27 +228,18 @@ def _show_analysis_table(results, all_tasks) -> None:
     table.add_column("タスク", width=30)
     table.add_column("理由", width=40)
 
-    for i, result in enumerate(results, 1):
-        task = task_map.get(result.task_id)
-        if not task:
-            continue
-
-        # Score color
-        if result.score >= 80:
-            score_str = f"[red]{result.score:.1f}[/red]"
-        elif result.score >= 60:
-            score_str = f"[yellow]{result.score:.1f}[/yellow]"
-        elif result.score >= 40:
-            score_str = f"[green]{result.score:.1f}[/green]"
-        else:
-            score_str = f"[dim]{result.score:.1f}[/dim]"
-
-        priority = priority_labels.get(task.priority, "medium")
-
+    # Skip results for tasks that are not in the analyzed set
+    rows = [
+        (i, result, task_map[result.task_id])
+        for i, result in enumerate(results, 1)
+        if result.task_id in task_map
+    ]
+    for i, result, task in rows:
+        score_color = _score_color(result.score)
         table.add_row(
             str(i),
-            score_str,
-            priority,
+            f"[{score_color}]{result.score:.1f}[/{score_color}]",
+            task.priority.value,
             f"{task.title} ({task.short_id})",
             result.reasoning,
         )
@@ -243,9 +248,9 @@ def _show_analysis_table(results, all_tasks) -> None:
     console.print(table)
 
 
-def _show_holistic_analysis(result, all_tasks) -> None:
+def _show_holistic_analysis(result, task_map) -> None:
     """Show holistic analysis results."""
-    task_map = {t.id: t for t in all_tasks}
+    from rich.panel import Panel
 
     console.print()
     console.print("[bold]📊 タスク全体分析[/bold]")
@@ -260,17 +265,8 @@ def _show_holistic_analysis(result, all_tasks) -> None:
     # Insights - show before assessment for context
     if result.insights:
         console.print("[bold cyan]【重要な洞察】[/bold cyan]")
-        sorted_insights = sorted(result.insights, key=lambda x: x.priority)
-        for insight in sorted_insights[:5]:
-            icon = "💡"
-            if insight.insight_type == "warning":
-                icon = "⚠️"
-            elif insight.insight_type == "blocker":
-                icon = "🚫"
-            elif insight.insight_type == "sequence":
-                icon = "📋"
-            elif insight.insight_type == "optimization":
-                icon = "⏰"
+        for insight in heapq.nsmallest(5, result.insights, key=attrgetter("priority")):
+            icon = _INSIGHT_ICONS.get(insight.insight_type, "💡")
             console.print(f"  {icon} {insight.description}")
         console.print()
 
@@ -285,16 +281,7 @@ def _show_holistic_analysis(result, all_tasks) -> None:
         for i, ranked in enumerate(result.ranked_tasks[:10], 1):
             task = task_map.get(ranked.task_id)
             if task:
-                # Score color
-                if ranked.score >= 80:
-                    score_color = "red"
-                elif ranked.score >= 60:
-                    score_color = "yellow"
-                elif ranked.score >= 40:
-                    score_color = "green"
-                else:
-                    score_color = "dim"
-
+                score_color = _score_color(ranked.score)
                 console.print(
                     f"  {i}. [{score_color}]{ranked.score:.0f}点[/{score_color}] "
                     f"[bold]{task.title}[/bold] ({task.short_id})"
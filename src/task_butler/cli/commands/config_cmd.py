@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 config_app = typer.Typer(
     name="config",
@@ -30,14 +29,25 @@ def config_show() -> None:
         console.print(f"  storage.dir = {config.config_dir / 'tasks'}")
         return
 
+    rows = [
+        (f"{section}.{key}", str(value))
+        for section, values in sorted(all_config.items())
+        if isinstance(values, dict)
+        for key, value in sorted(values.items())
+    ]
+    if not rows:
+        # Only top-level scalars are set; a table would have no rows
+        for key, value in sorted(all_config.items()):
+            console.print(f"  {key} = {value}")
+        return
+
+    from rich.table import Table
+
     table = Table(title="Configuration")
     table.add_column("Key", style="cyan")
     table.add_column("Value", style="green")
-
-    for section, values in sorted(all_config.items()):
-        if isinstance(values, dict):
-            for key, value in sorted(values.items()):
-                table.add_row(f"{section}.{key}", str(value))
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -92,7 +102,7 @@ def config_init() -> None:
         overwrite = typer.confirm("Configuration already exists. Overwrite?", default=False)
         if not overwrite:
             console.print("[yellow]Cancelled[/yellow]")
-            raise typer.Exit(0)
+            return
 
     # Storage format
     console.print("[cyan]Storage Format:[/cyan]")
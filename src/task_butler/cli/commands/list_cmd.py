@@ -6,7 +6,6 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from ...core.task_manager import TaskManager
 from ...models.enums import Priority, Status
@@ -134,6 +133,8 @@ def _list_table(
     include_done: bool,
 ) -> None:
     """Table format."""
+    from rich.table import Table
+
     tasks = manager.list(
         status=status,
         priority=priority,
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -18,6 +20,15 @@ from ...storage.obsidian import ObsidianTasksFormat, ParsedObsidianTask
 
 console = Console()
 
+# Threads reading task files for obsidian check (reads are I/O-bound)
+_CHECK_READ_WORKERS = 8
+
+# Indentation before a "- [" list item; lines that don't match are never stripped
+_TASK_PREFIX_RE = re.compile(r"[ \t]*(?=- \[)")
+
+# First line of a task file body that starts (after indentation) with "- ["
+_OBSIDIAN_LINE_RE = re.compile(rb"^[ \t]*(- \[.*)", re.MULTILINE)
+
 
 class LinkFormat(str, Enum):
     """Link format for source replacement."""
@@ -35,6 +46,23 @@ class ImportedTaskInfo:
     original_line: str
 
 
+def _find_obsidian_line(data: bytes) -> str | None:
+    """Find the Obsidian Tasks line in raw task file content.
+
+    The scan runs over the undecoded bytes; only the matching line is decoded.
+
+    Args:
+        data: Raw file content.
+
+    Returns:
+        The stripped Obsidian Tasks line, or None if the file has none.
+    """
+    match = _OBSIDIAN_LINE_RE.search(data)
+    if match is None:
+        return None
+    return match.group(1).decode("utf-8").strip()
+
+
 def find_vault_root(path: Path) -> Path | None:
     """Find Obsidian vault root by looking for .obsidian directory.
 
@@ -151,13 +179,10 @@ def export_tasks(
         console.print("[dim]No tasks to export[/dim]")
         return
 
-    lines = []
-
     if format == "tasks":
         # Export as Obsidian Tasks format
-        for task in tasks:
-            line = formatter.to_obsidian_line(task)
-            lines.append(line)
+        to_line = formatter.to_obsidian_line
+        lines = [to_line(task) for task in tasks]
     else:
         # Export as frontmatter format (one task per output)
         console.print("[yellow]Frontmatter export creates individual files.[/yellow]")
@@ -171,10 +196,16 @@ def export_tasks(
     output_text = "\n".join(lines)
 
     if output:
-        output.write_text(output_text, encoding="utf-8")
+        # One pre-encoded write; also keeps "\n" line endings on every platform
+        output.write_bytes(output_text.encode("utf-8"))
         console.print(f"[green]✓[/green] Exported {len(tasks)} tasks to {output}")
+    elif console.is_terminal:
+        # Tasks lines contain "[x]", which Rich would otherwise read as markup
+        console.print(output_text, markup=False, highlight=False)
     else:
-        console.print(output_text)
+        # Piped output: write the lines as-is, without Rich rendering or wrapping;
+        # typer.echo also copes with stdout replaced by a plain text stream
+        typer.echo(output_text)
 
 
 def _collect_files(
@@ -261,157 +292,151 @@ def _import_single_file(
     Returns:
         Tuple of (imported, updated, skipped, errors, imported_task_info) lists
     """
-    content = file.read_text(encoding="utf-8")
-    lines = content.split("\n")
-
     imported = []
     updated = []
     skipped = []
     errors = []
     imported_task_info: list[ImportedTaskInfo] = []
 
-    for i, line in enumerate(lines, 1):
-        original_line = line
-        line = line.strip()
-        # Check for Obsidian Tasks checkbox format: - [ ] or - [x] or - [X]
-        # Skip regular wiki links like - [[...]] which also start with "- ["
-        if not (
-            line.startswith("- [ ] ") or line.startswith("- [x] ") or line.startswith("- [X] ")
-        ):
-            continue
-
-        try:
-            parsed = formatter.from_obsidian_line(line)
-
-            # Check for duplicates
-            existing = manager.find_duplicate(parsed.title, parsed.due_date)
-
-            if existing:
-                # Determine action
-                action = global_action.get("action", duplicate_action)
-
-                if action == DuplicateAction.INTERACTIVE:
-                    choice = _prompt_duplicate_action(existing, parsed)
-                    if choice == "a":
-                        global_action["action"] = DuplicateAction.SKIP
-                        action = DuplicateAction.SKIP
-                    elif choice == "A":
-                        global_action["action"] = DuplicateAction.UPDATE
-                        action = DuplicateAction.UPDATE
-                    elif choice == "s":
-                        action = DuplicateAction.SKIP
-                    elif choice == "u":
-                        action = DuplicateAction.UPDATE
-                    elif choice == "f":
-                        action = DuplicateAction.FORCE
-
-                if action == DuplicateAction.SKIP:
-                    if dry_run:
-                        console.print(
-                            f"  [dim]Line {i}:[/dim] [yellow]SKIP[/yellow] {parsed.title} "
-                            f"(duplicate of {existing.short_id})"
-                        )
-                    skipped.append((parsed, existing))
-                    continue
+    # Stream the file; universal newlines number lines like read_text().split("\n"),
+    # which is also how _replace_lines_with_links counts them
+    with file.open(encoding="utf-8") as f:
+        for i, original_line in enumerate(f, 1):
+            # Cheap reject before slicing: most lines of a note are not tasks
+            prefix = _TASK_PREFIX_RE.match(original_line)
+            if prefix is None:
+                continue
+            original_line = original_line.removesuffix("\n")
+            line = original_line[prefix.end() :].rstrip()
+            # Check for Obsidian Tasks checkbox format: - [ ] or - [x] or - [X]
+            # Skip regular wiki links like - [[...]] which also start with "- ["
+            if not (
+                line.startswith("- [ ] ") or line.startswith("- [x] ") or line.startswith("- [X] ")
+            ):
+                continue
 
-                elif action == DuplicateAction.UPDATE:
-                    if dry_run:
-                        console.print(
-                            f"  [dim]Line {i}:[/dim] [blue]UPDATE[/blue] {parsed.title} "
-                            f"(existing: {existing.short_id})"
-                        )
-                        # Track for link replacement even in dry-run
-                        imported_task_info.append(
-                            ImportedTaskInfo(
-                                task=existing,
-                                line_number=i,
-                                original_line=original_line,
+            try:
+                parsed = formatter.from_obsidian_line(line)
+
+                # Check for duplicates
+                existing = manager.find_duplicate(parsed.title, parsed.due_date)
+
+                if existing:
+                    # Determine action
+                    action = global_action.get("action", duplicate_action)
+
+                    if action == DuplicateAction.INTERACTIVE:
+                        choice = _prompt_duplicate_action(existing, parsed)
+                        if choice == "a":
+                            global_action["action"] = DuplicateAction.SKIP
+                            action = DuplicateAction.SKIP
+                        elif choice == "A":
+                            global_action["action"] = DuplicateAction.UPDATE
+                            action = DuplicateAction.UPDATE
+                        elif choice == "s":
+                            action = DuplicateAction.SKIP
+                        elif choice == "u":
+                            action = DuplicateAction.UPDATE
+                        elif choice == "f":
+                            action = DuplicateAction.FORCE
+
+                    if action == DuplicateAction.SKIP:
+                        if dry_run:
+                            console.print(
+                                f"  [dim]Line {i}:[/dim] [yellow]SKIP[/yellow] {parsed.title} "
+                                f"(duplicate of {existing.short_id})"
+                            )
+                        skipped.append((parsed, existing))
+                        continue
+
+                    elif action == DuplicateAction.UPDATE:
+                        if dry_run:
+                            console.print(
+                                f"  [dim]Line {i}:[/dim] [blue]UPDATE[/blue] {parsed.title} "
+                                f"(existing: {existing.short_id})"
+                            )
+                            # Track for link replacement even in dry-run
+                            imported_task_info.append(
+                                ImportedTaskInfo(
+                                    task=existing,
+                                    line_number=i,
+                                    original_line=original_line,
+                                )
+                            )
+                        else:
+                            # Update existing task
+                            manager.update(
+                                existing.id,
+                                priority=parsed.priority or existing.priority,
+                                due_date=parsed.due_date,
+                                scheduled_date=parsed.scheduled_date,
+                                start_date=parsed.start_date,
+                                tags=parsed.tags if parsed.tags else None,
                             )
-                        )
-                    else:
-                        # Update existing task
-                        manager.update(
-                            existing.id,
-                            priority=parsed.priority or existing.priority,
-                            due_date=parsed.due_date,
-                            scheduled_date=parsed.scheduled_date,
-                            start_date=parsed.start_date,
-                            tags=parsed.tags if parsed.tags else None,
-                        )
 
-                        # Handle status change
-                        if parsed.is_completed and existing.status != Status.DONE:
-                            manager.complete(existing.id)
-                            if parsed.completed_at:
-                                task = manager.get(existing.id)
-                                if task:
-                                    task.completed_at = parsed.completed_at
-                                    manager.repository.update(task)
-
-                        # Track for link replacement
-                        imported_task_info.append(
-                            ImportedTaskInfo(
-                                task=existing,
-                                line_number=i,
-                                original_line=original_line,
+                            # Handle status change
+                            if parsed.is_completed and existing.status != Status.DONE:
+                                manager.complete(existing.id, completed_at=parsed.completed_at)
+
+                            # Track for link replacement
+                            imported_task_info.append(
+                                ImportedTaskInfo(
+                                    task=existing,
+                                    line_number=i,
+                                    original_line=original_line,
+                                )
                             )
-                        )
-                        updated.append(existing)
-                    continue
+                            updated.append(existing)
+                        continue
 
-                # FORCE: fall through to create new task
+                    # FORCE: fall through to create new task
 
-            # Create new task
-            if dry_run:
-                status = "done" if parsed.is_completed else "pending"
-                priority = parsed.priority.value if parsed.priority else "medium"
-                console.print(
-                    f"  [dim]Line {i}:[/dim] [green]NEW[/green] {parsed.title} [{status}, {priority}]"
-                )
-                imported.append(parsed)
-            else:
-                task = manager.add(
-                    title=parsed.title,
-                    priority=parsed.priority or Priority.MEDIUM,
-                    due_date=parsed.due_date,
-                    scheduled_date=parsed.scheduled_date,
-                    start_date=parsed.start_date,
-                    tags=parsed.tags,
-                )
+                # Create new task
+                if dry_run:
+                    status = "done" if parsed.is_completed else "pending"
+                    priority = parsed.priority.value if parsed.priority else "medium"
+                    console.print(
+                        f"  [dim]Line {i}:[/dim] [green]NEW[/green] {parsed.title} [{status}, {priority}]"
+                    )
+                    imported.append(parsed)
+                else:
+                    task = manager.add(
+                        title=parsed.title,
+                        priority=parsed.priority or Priority.MEDIUM,
+                        due_date=parsed.due_date,
+                        scheduled_date=parsed.scheduled_date,
+                        start_date=parsed.start_date,
+                        tags=parsed.tags,
+                    )
 
-                # Set source tracking if vault_root is provided
-                if source_file_relative:
-                    task.source_file = source_file_relative
-                    task.source_line = i
+                    # Set source tracking if vault_root is provided
+                    if source_file_relative:
+                        task.source_file = source_file_relative
+                        task.source_line = i
 
-                # Set obsidian_has_created based on whether source had ➕
-                task.obsidian_has_created = parsed.created_at is not None
-                if parsed.created_at:
-                    task.created_at = parsed.created_at
+                    # Set obsidian_has_created based on whether source had ➕
+                    task.obsidian_has_created = parsed.created_at is not None
+                    if parsed.created_at:
+                        task.created_at = parsed.created_at
 
-                manager.repository.update(task)
+                    manager.repository.update(task)
 
-                # Update status if completed
-                if parsed.is_completed:
-                    manager.complete(task.id)
-                    if parsed.completed_at:
-                        task = manager.get(task.id)
-                        if task:
-                            task.completed_at = parsed.completed_at
-                            manager.repository.update(task)
-
-                # Track for link replacement
-                imported_task_info.append(
-                    ImportedTaskInfo(
-                        task=task,
-                        line_number=i,
-                        original_line=original_line,
+                    # Update status if completed
+                    if parsed.is_completed:
+                        task = manager.complete(task.id, completed_at=parsed.completed_at)
+
+                    # Track for link replacement
+                    imported_task_info.append(
+                        ImportedTaskInfo(
+                            task=task,
+                            line_number=i,
+                            original_line=original_line,
+                        )
                     )
-                )
-                imported.append(task)
+                    imported.append(task)
 
-        except ValueError as e:
-            errors.append((i, line, str(e)))
+            except ValueError as e:
+                errors.append((i, line, str(e)))
 
     return imported, updated, skipped, errors, imported_task_info
 
@@ -436,8 +461,10 @@ def _replace_lines_with_links(
         organization: Organization method ("flat" or "kanban")
         kanban_dirs: Custom directory names for Kanban mode
     """
-    content = file.read_text(encoding="utf-8")
-    lines = content.split("\n")
+    # newline="" splits lines like the import did but keeps each line's own ending,
+    # so CRLF files are written back unchanged
+    with file.open(encoding="utf-8", newline="") as f:
+        lines = f.readlines()
 
     # Sort by line number descending to replace from bottom up
     # (so line numbers don't shift as we replace)
@@ -453,10 +480,12 @@ def _replace_lines_with_links(
             # Preserve leading whitespace from original line
             original = info.original_line
             leading_whitespace = original[: len(original) - len(original.lstrip())]
-            lines[line_idx] = f"{leading_whitespace}- {link}"
+            line = lines[line_idx]
+            ending = line[len(line.rstrip("\r\n")) :]
+            lines[line_idx] = f"{leading_whitespace}- {link}{ending}"
 
     # Write back
-    file.write_text("\n".join(lines), encoding="utf-8")
+    file.write_bytes("".join(lines).encode("utf-8"))
 
 
 @obsidian_app.command(name="import")
@@ -608,6 +637,7 @@ def import_tasks(
     total_skipped = []
     total_errors = []
     total_task_infos: dict[Path, list[ImportedTaskInfo]] = {}
+    total_links = 0  # Task lines that would be (or are) replaced with links
     global_action: dict = {}  # For storing "all skip" or "all update" choice
 
     for file in files:
@@ -639,6 +669,7 @@ def import_tasks(
         total_errors.extend(errors)
         if task_infos:
             total_task_infos[file] = task_infos
+            total_links += len(task_infos)
 
     # Replace source lines with links if requested
     if link and total_task_infos and not dry_run:
@@ -646,10 +677,7 @@ def import_tasks(
             _replace_lines_with_links(
                 file, task_infos, storage_dir, vault_root, link_format, organization, kanban_dirs
             )
-        console.print(
-            f"[green]✓[/green] Replaced {sum(len(t) for t in total_task_infos.values())} "
-            f"task line(s) with links"
-        )
+        console.print(f"[green]✓[/green] Replaced {total_links} task line(s) with links")
 
     # Summary
     console.print()
@@ -660,8 +688,7 @@ def import_tasks(
             console.print(f"  Would update: {len(total_updated)} existing task(s)")
         if total_skipped:
             console.print(f"  Would skip: {len(total_skipped)} duplicate(s)")
-        if link and total_task_infos:
-            total_links = sum(len(t) for t in total_task_infos.values())
+        if link and total_links:
             console.print(f"  Would replace: {total_links} line(s) with links")
         if total_errors:
             console.print(f"  [yellow]Parse errors: {len(total_errors)}[/yellow]")
@@ -700,30 +727,15 @@ def check_conflicts(
     )
     formatter = ObsidianTasksFormat()
 
-    tasks = manager.list(include_done=True)
-
-    if not tasks:
-        console.print("[dim]No tasks found[/dim]")
-        return
-
+    checked = 0
     conflicts_found = 0
+    # Collect the report and print it once instead of one console write per line
+    out: list[str] = []
 
-    for task in tasks:
-        # Read the raw file to find Obsidian Tasks line
-        task_path = manager.repository.storage._task_path(task.id)
-        if not task_path.exists():
-            continue
-
-        content = task_path.read_text(encoding="utf-8")
-
-        # Find Obsidian Tasks line in content
-        obsidian_line = None
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("- ["):
-                obsidian_line = line
-                break
-
+    # One scan yields each task with its raw file, so files are not looked up again
+    for task, _, data in manager.repository.storage.iter_raw(max_workers=_CHECK_READ_WORKERS):
+        checked += 1
+        obsidian_line = _find_obsidian_line(data)
         if not obsidian_line:
             continue
 
@@ -731,9 +743,15 @@ def check_conflicts(
 
         if conflicts:
             conflicts_found += 1
-            console.print(f"\n[yellow]⚠ Conflict in task {task.short_id}:[/yellow] {task.title}")
-            for conflict in conflicts:
-                console.print(f"  {conflict}")
+            out.append(f"\n[yellow]⚠ Conflict in task {task.short_id}:[/yellow] {task.title}")
+            out.append("\n".join(f"  {conflict}" for conflict in conflicts))
+
+    if checked == 0:
+        console.print("[dim]No tasks found[/dim]")
+        return
+
+    if out:
+        console.print("\n".join(out))
 
     if conflicts_found == 0:
         console.print("[green]✓[/green] No conflicts found")
@@ -781,88 +799,90 @@ def resolve_conflicts(
         console.print("Use 'frontmatter' or 'obsidian'")
         raise typer.Exit(1)
 
+    storage = manager.repository.storage
+    entries: Iterable[tuple[Task, Path, bytes]]
     if task_id:
         task = manager.get(task_id)
         if not task:
             console.print(f"[red]Error:[/red] Task not found: {task_id}")
             raise typer.Exit(1)
-        tasks = [task]
+        task_path = storage._task_path(task.id)
+        entries = [(task, task_path, task_path.read_bytes())] if task_path.exists() else []
     else:
-        tasks = manager.list(include_done=True)
+        # One scan yields each task with its raw file, so files are not looked up again;
+        # the file list is taken before any file is read, so rewrites don't affect it
+        entries = storage.iter_raw()
 
     resolved = 0
+    # Collect the report and print it once instead of one console write per line;
+    # printing in finally still reports files rewritten before an error
+    out: list[str] = []
 
-    for task in tasks:
-        task_path = manager.repository.storage._task_path(task.id)
-        if not task_path.exists():
-            continue
-
-        content = task_path.read_text(encoding="utf-8")
-        lines = content.split("\n")
-
-        # Find Obsidian Tasks line
-        obsidian_line_idx = None
-        obsidian_line = None
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if stripped.startswith("- ["):
-                obsidian_line_idx = i
-                obsidian_line = stripped
-                break
-
-        if not obsidian_line:
-            continue
+    try:
+        for task, task_path, data in entries:
+            # Find Obsidian Tasks line; only the matched line is decoded
+            match = _OBSIDIAN_LINE_RE.search(data)
+            if match is None:
+                continue
+            obsidian_line = match.group(1).decode("utf-8").rstrip()
 
-        conflicts = formatter.detect_conflicts(task, obsidian_line)
+            if strategy == "frontmatter":
+                # A line identical to the one the frontmatter renders to can't conflict
+                new_line = formatter.to_obsidian_line(task)
+                if new_line == obsidian_line:
+                    continue
 
-        if not conflicts:
-            continue
+            conflicts = formatter.detect_conflicts(task, obsidian_line)
 
-        if dry_run:
-            console.print(f"\n[bold]Would resolve {task.short_id}:[/bold] {task.title}")
-            console.print(f"  Strategy: {strategy}")
-            for conflict in conflicts:
-                console.print(f"  {conflict}")
-            resolved += 1
-            continue
+            if not conflicts:
+                continue
 
-        if strategy == "frontmatter":
-            # Update the Obsidian Tasks line to match frontmatter
-            new_line = formatter.to_obsidian_line(task)
-            lines[obsidian_line_idx] = new_line
-            new_content = "\n".join(lines)
-            task_path.write_text(new_content, encoding="utf-8")
-        else:
-            # Update frontmatter to match Obsidian Tasks line
-            parsed = formatter.from_obsidian_line(obsidian_line)
+            if dry_run:
+                out.append(f"\n[bold]Would resolve {task.short_id}:[/bold] {task.title}")
+                out.append(f"  Strategy: {strategy}")
+                out.append("\n".join(f"  {conflict}" for conflict in conflicts))
+                resolved += 1
+                continue
 
-            # Apply changes from parsed line
-            from ...models.enums import Status
+            if strategy == "frontmatter":
+                # Update the Obsidian Tasks line to match frontmatter, splicing it into the
+                # raw bytes so the rest of the file (and a CRLF ending) is copied as-is
+                line_end = match.end() - match.group(1).endswith(b"\r")
+                task_path.write_bytes(
+                    data[: match.start()] + new_line.encode("utf-8") + data[line_end:]
+                )
+            else:
+                # Update frontmatter to match Obsidian Tasks line
+                parsed = formatter.from_obsidian_line(obsidian_line)
 
-            if parsed.is_completed and task.status != Status.DONE:
-                task.status = Status.DONE
-                if parsed.completed_at:
-                    task.completed_at = parsed.completed_at
-            elif not parsed.is_completed and task.status == Status.DONE:
-                task.status = Status.PENDING
-                task.completed_at = None
+                # Apply changes from parsed line
+                if parsed.is_completed and task.status != Status.DONE:
+                    task.status = Status.DONE
+                    if parsed.completed_at:
+                        task.completed_at = parsed.completed_at
+                elif not parsed.is_completed and task.status == Status.DONE:
+                    task.status = Status.PENDING
+                    task.completed_at = None
 
-            if parsed.priority:
-                task.priority = parsed.priority
+                if parsed.priority:
+                    task.priority = parsed.priority
 
-            if parsed.due_date:
-                task.due_date = parsed.due_date
-            if parsed.scheduled_date:
-                task.scheduled_date = parsed.scheduled_date
-            if parsed.start_date:
-                task.start_date = parsed.start_date
+                if parsed.due_date:
+                    task.due_date = parsed.due_date
+                if parsed.scheduled_date:
+                    task.scheduled_date = parsed.scheduled_date
+                if parsed.start_date:
+                    task.start_date = parsed.start_date
 
-            task.tags = parsed.tags
+                task.tags = parsed.tags
 
-            manager.repository.update(task)
+                manager.repository.update(task)
 
-        resolved += 1
-        console.print(f"[green]✓[/green] Resolved {task.short_id}: {task.title}")
+            resolved += 1
+            out.append(f"[green]✓[/green] Resolved {task.short_id}: {task.title}")
+    finally:
+        if out:
+            console.print("\n".join(out))
 
     if resolved == 0:
         console.print("[dim]No conflicts to resolve[/dim]")
@@ -994,10 +1014,14 @@ def fix_created(
             else:
                 # Search for matching task title
                 for line in lines:
-                    stripped = line.strip()
-                    if (
-                        stripped.startswith("- [ ]") or stripped.lower().startswith("- [x]")
-                    ) and task.title in stripped:
+                    # Cheap rejects first; only candidate task lines get sliced
+                    if task.title not in line:
+                        continue
+                    prefix = _TASK_PREFIX_RE.match(line)
+                    if prefix is None:
+                        continue
+                    stripped = line[prefix.end() :].rstrip()
+                    if stripped.startswith("- [ ]") or stripped.lower().startswith("- [x]"):
                         original_line = stripped
                         break
 
@@ -1151,10 +1175,8 @@ def fix_links(
                 for i, line in enumerate(lines):
                     # Check if this line contains a wiki link to this task
                     # Link format: - [[path|title]] or - ![[path|title]]
-                    if f"|{task.title}]]" in line and line.strip().startswith("- "):
+                    if f"|{task.title}]]" in line and line.lstrip().startswith("- "):
                         # Extract existing link
-                        import re
-
                         link_match = re.search(r"(!?\[\[[^\]]+\]\])", line)
                         if link_match:
                             existing_link = link_match.group(1)
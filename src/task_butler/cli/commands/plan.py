@@ -7,7 +7,6 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
 
 console = Console()
 
@@ -78,7 +77,7 @@ def plan_day(
 
     if not all_tasks:
         console.print("[dim]No open tasks to schedule[/dim]")
-        raise typer.Exit(0)
+        return
 
     # Create plan
     plan = planner.create_plan(
@@ -93,6 +92,8 @@ def plan_day(
 
 def _display_plan(plan) -> None:
     """Display the daily plan with rich formatting."""
+    from rich.panel import Panel
+
     from ...models.enums import Priority
 
     priority_icons = {
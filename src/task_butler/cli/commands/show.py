@@ -6,7 +6,6 @@ from typing import Annotated
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
 
 from ...core.task_manager import TaskManager
 from ...models.enums import Priority, Status
@@ -28,6 +27,8 @@ def show_task(
     Tab completion shows only open tasks.
     For completed tasks, use 'tb list --done' to find IDs, then type manually.
     """
+    from rich.panel import Panel
+
     from ...config import get_config
 
     config = get_config()
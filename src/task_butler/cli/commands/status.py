@@ -155,7 +155,7 @@ def delete_task(
         confirm = typer.confirm(f"Delete '{task.title}'?")
         if not confirm:
             console.print("[dim]Cancelled[/dim]")
-            raise typer.Exit(0)
+            return
 
     try:
         manager.delete(task.id)  # Use full ID to avoid re-lookup
@@ -60,7 +60,7 @@ def suggest_tasks(
 
     if not all_tasks:
         console.print("[dim]No open tasks[/dim]")
-        raise typer.Exit(0)
+        return
 
     # Validate energy level
     if energy and energy not in ("low", "medium", "high"):
@@ -89,7 +89,7 @@ def suggest_tasks(
 
     if not suggestions:
         console.print("[dim]No matching tasks found[/dim]")
-        raise typer.Exit(0)
+        return
 
     # Display suggestions
     priority_icons = {
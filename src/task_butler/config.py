@@ -217,7 +217,20 @@ class Config:
             else:
                 raise ValueError(f"Unknown organization.kanban key: {name}")
         elif section == "ai" and subsection == "llama":
-            if name in ("model_name", "model_path", "n_ctx", "n_gpu_layers"):
+            if name in (
+                "model_name",
+                "model_path",
+                "n_ctx",
+                "n_gpu_layers",
+                "prompt_cache_mb",
+                "tensor_split",
+                "kv_cache_type",
+                "server_url",
+                "n_threads",
+                "use_mlock",
+                "speculative",
+                "quantization",
+            ):
                 pass  # Valid llama settings
             else:
                 raise ValueError(f"Unknown ai.llama key: {name}")
@@ -233,8 +246,9 @@ class Config:
                 "weight_effort",
                 "weight_staleness",
                 "weight_priority",
+                "concurrency",
             ):
-                pass  # Valid analysis weights
+                pass  # Valid analysis settings
             else:
                 raise ValueError(f"Unknown ai.analysis key: {name}")
         elif section == "ai" and subsection == "planning":
@@ -355,6 +369,8 @@ class Config:
     def get_ai_config(self) -> dict:
         """Get all AI-related configuration.
 
+        TASK_BUTLER_N_GPU_LAYERS overrides ai.llama.n_gpu_layers from the file.
+
         Returns:
             Dictionary with AI configuration
         """
@@ -365,7 +381,14 @@ class Config:
                 "model_name": "tinyllama-1.1b",
                 "model_path": "",
                 "n_ctx": 2048,
-                "n_gpu_layers": 0,
+                "n_gpu_layers": -1,
+                "prompt_cache_mb": 512,
+                "kv_cache_type": "f16",
+                "server_url": "",
+                "n_threads": 0,
+                "use_mlock": False,
+                "speculative": False,
+                "quantization": "Q4_K_M",
             },
             "openai": {
                 "model": "gpt-4o-mini",
@@ -377,6 +400,7 @@ class Config:
                 "weight_effort": 0.20,
                 "weight_staleness": 0.15,
                 "weight_priority": 0.10,
+                "concurrency": 8,
             },
             "planning": {
                 "default_hours": 8.0,
@@ -396,6 +420,11 @@ class Config:
             else:
                 result[key] = value
 
+        # Environment variable (e.g. 0 to force CPU inference for one run)
+        env_gpu_layers = os.environ.get("TASK_BUTLER_N_GPU_LAYERS")
+        if env_gpu_layers:
+            result["llama"] = {**result["llama"], "n_gpu_layers": env_gpu_layers}
+
         return result
 
     def save(self) -> None:
@@ -407,13 +436,29 @@ class Config:
             tomli_w.dump(self._file_config, f)
 
 
-# Global config instance
+# Global config instance and the (path, mtime) of the file it was loaded from
 _config: Config | None = None
+_config_stamp: tuple[Path, int | None] | None = None
+
+
+def _config_file_stamp() -> tuple[Path, int | None]:
+    """Identify the current config file version (path and modification time)."""
+    path = get_home_dir() / "config.toml"
+    try:
+        return path, path.stat().st_mtime_ns
+    except OSError:
+        return path, None
 
 
 def get_config() -> Config:
-    """Get the global config instance (lazy initialization)."""
-    global _config
-    if _config is None:
+    """Get the global config instance (lazy initialization).
+
+    The file is parsed once per process and again only when it changes on
+    disk or TASK_BUTLER_HOME points somewhere else.
+    """
+    global _config, _config_stamp
+    stamp = _config_file_stamp()
+    if _config is None or stamp != _config_stamp:
         _config = Config()
+        _config_stamp = stamp
     return _config
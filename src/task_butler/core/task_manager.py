@@ -140,13 +140,26 @@ class TaskManager:
         task.start()
         return self.repository.update(task)
 
-    def complete(self, task_id: str, actual_hours: float | None = None) -> Task:
-        """Mark a task as done."""
+    def complete(
+        self,
+        task_id: str,
+        actual_hours: float | None = None,
+        completed_at: datetime | None = None,
+    ) -> Task:
+        """Mark a task as done.
+
+        Args:
+            task_id: Task ID (full or short)
+            actual_hours: Actual time spent
+            completed_at: Completion time to record (default: now)
+        """
         task = self.repository.get(task_id)
         if not task:
             raise ValueError(f"Task not found: {task_id}")
 
         task.complete(actual_hours)
+        if completed_at is not None:
+            task.completed_at = completed_at
         updated_task = self.repository.update(task)
 
         # If this is a recurring task instance, create the next one
@@ -198,6 +211,30 @@ class TaskManager:
         task.add_note(content)
         return self.repository.update(task)
 
+    def add_notes(self, notes: dict[str, str], tasks: list[Task] | None = None) -> list[Task]:
+        """Add one note to each of several tasks, writing each task file once.
+
+        Args:
+            notes: Note content by task ID
+            tasks: Tasks already loaded by the caller; these are updated in place
+                   instead of being read from disk again
+
+        Returns:
+            The updated tasks
+
+        Raises:
+            ValueError: If a task is not found (notes before it are already saved)
+        """
+        loaded = {t.id: t for t in tasks or []}
+        updated = []
+        for task_id, content in notes.items():
+            task = loaded.get(task_id) or self.repository.get(task_id)
+            if not task:
+                raise ValueError(f"Task not found: {task_id}")
+            task.add_note(content)
+            updated.append(self.repository.update(task))
+        return updated
+
     def update(
         self,
         task_id: str,
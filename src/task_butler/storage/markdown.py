@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 
@@ -303,7 +304,10 @@ class MarkdownStorage:
         if not path.exists():
             return None
 
-        post = frontmatter.load(path)
+        return self._task_from_post(frontmatter.load(path))
+
+    def _task_from_post(self, post: frontmatter.Post) -> Task:
+        """Build a Task from a parsed frontmatter document."""
         metadata = post.metadata
 
         # Parse recurrence rule if present
@@ -401,6 +405,42 @@ class MarkdownStorage:
                     seen_ids.add(task.id)
         return tasks
 
+    def _load_raw(self, path: Path) -> tuple[Task, bytes]:
+        """Read a task file once and parse the task from its bytes."""
+        data = path.read_bytes()
+        return self._task_from_post(frontmatter.loads(data.decode("utf-8"))), data
+
+    def iter_raw(self, max_workers: int = 1) -> Iterator[tuple[Task, Path, bytes]]:
+        """Iterate over all tasks together with their file path and raw content.
+
+        Each file is read once; the task is parsed from the same bytes that are
+        yielded, so callers inspecting the file body don't read it again.
+
+        Args:
+            max_workers: Threads reading files concurrently (1 reads them in order)
+
+        Yields:
+            Tuples of (task, file path, raw file content)
+        """
+        paths = [
+            path for search_dir in self._get_all_search_dirs() for path in search_dir.glob("*.md")
+        ]
+
+        if max_workers > 1 and len(paths) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # File reads release the GIL, so threads overlap the disk latency
+            with ThreadPoolExecutor(max_workers=min(len(paths), max_workers)) as pool:
+                loaded = list(pool.map(self._load_raw, paths))
+        else:
+            loaded = map(self._load_raw, paths)
+
+        seen_ids: set[str] = set()
+        for path, (task, data) in zip(paths, loaded):
+            if task.id not in seen_ids:
+                seen_ids.add(task.id)
+                yield task, path, data
+
     def exists(self, task_id: str) -> bool:
         """Check if a task exists."""
         return self._find_task_file(task_id).exists()
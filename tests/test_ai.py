@@ -1,13 +1,25 @@
 """Tests for AI integration module."""
 
+import asyncio
+import json
+import sys
+import threading
+import types
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import pytest
 
-from task_butler.ai import DailyPlanner, TaskAnalyzer, TaskSuggester
-from task_butler.ai.base import AnalysisResult, PlanResult, SuggestionResult
+import task_butler.config
+from task_butler.ai import DailyPlanner, TaskAnalyzer, TaskSuggester, _parse_tensor_split
+from task_butler.ai.base import AnalysisResult, PlanResult, SuggestionResult, index_dependencies
+from task_butler.ai.cache import AnalysisCache, GenerationCache
+from task_butler.ai.model_manager import ModelManager
+from task_butler.ai.prompts import DEFAULT_PROMPTS, PromptManager, get_prompt_manager, reload_all
+from task_butler.ai.providers import llama
+from task_butler.ai.providers.llama import _UNQUANTIZED_NAME, LlamaProvider
 from task_butler.ai.providers.rule_based import RuleBasedProvider
-from task_butler.models.enums import Priority
+from task_butler.models.enums import Priority, Status
 from task_butler.models.task import Task
 
 
@@ -64,6 +76,79 @@ def stale_task():
     )
 
 
+@pytest.fixture
+def butler_home(tmp_path, monkeypatch):
+    """Point TASK_BUTLER_HOME at a temporary directory."""
+    monkeypatch.setenv("TASK_BUTLER_HOME", str(tmp_path))
+    return tmp_path
+
+
+class FakeLlama:
+    """Stand-in for llama_cpp.Llama that records calls.
+
+    Tokens are numbered in tokenize order. Streamed completions replay
+    `pieces`; other completions answer "answer <n>" for the n-th request.
+    """
+
+    def __init__(self, pieces=(), **load_kwargs):
+        self.pieces = list(pieces)
+        self.load_kwargs = load_kwargs
+        self.cache = None
+        self.tokenized: list[tuple[bytes, bool]] = []
+        self.prompts: list = []
+        self.completion_kwargs: list[dict] = []
+        self.yielded: list[str] = []
+        self.evaluated: list[list[int]] = []
+
+    def tokenize(self, text, add_bos=True, special=False):
+        self.tokenized.append((text, add_bos))
+        return [len(self.tokenized)]
+
+    def create_completion(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        self.completion_kwargs.append(kwargs)
+        if stream:
+            return self._stream()
+        return {"choices": [{"text": f" answer {len(self.prompts)} "}]}
+
+    def _stream(self):
+        for piece in self.pieces:
+            self.yielded.append(piece)
+            yield {"choices": [{"text": piece}]}
+
+    def set_cache(self, cache):
+        self.cache = cache
+
+    def reset(self):
+        pass
+
+    def eval(self, tokens):
+        self.evaluated.append(tokens)
+
+    def save_state(self):
+        return f"state-{len(self.evaluated)}"
+
+
+@pytest.fixture
+def fake_llama(monkeypatch):
+    """Serve a FakeLlama to every LlamaProvider instead of loading a model."""
+    llm = FakeLlama()
+    monkeypatch.setattr(LlamaProvider, "_get_llm", lambda self: llm)
+    return llm
+
+
+@pytest.fixture
+def fake_llama_cpp(monkeypatch):
+    """Return a function installing a fake llama_cpp (sub)module with given attributes."""
+
+    def install(name="llama_cpp", **attrs):
+        module = types.SimpleNamespace(**attrs)
+        monkeypatch.setitem(sys.modules, name, module)
+        return module
+
+    return install
+
+
 class TestRuleBasedProvider:
     """Tests for RuleBasedProvider."""
 
@@ -93,6 +178,24 @@ class TestRuleBasedProvider:
             or "標準" in result.reasoning
         )
 
+    def test_dependency_index_ignores_closed_tasks(self, sample_tasks):
+        """Test that only open tasks count as blocked or blocking."""
+        provider = RuleBasedProvider()
+        sample_tasks[3].dependencies = ["task-3", "task-1"]
+        sample_tasks[2].status = Status.DONE
+
+        results = provider.analyze_tasks_batch(sample_tasks, sample_tasks)
+
+        # task-1 blocks task-4 and task-5; task-3 is done, so task-4 waits on task-1
+        assert "2個のタスクがブロックされています" in results[0].reasoning
+        assert (
+            results[3].suggestions[0]
+            == "まず「Urgent task due today」を完了してください（依存関係）"
+        )
+        assert [r.score for r in results] == [
+            provider.analyze_task(t, sample_tasks).score for t in sample_tasks
+        ]
+
     def test_analyze_stale_task(self, stale_task, sample_tasks):
         """Test that stale tasks get higher scores."""
         provider = RuleBasedProvider()
@@ -148,6 +251,717 @@ class TestRuleBasedProvider:
         assert len(plan.morning_slots) + len(plan.afternoon_slots) > 0
 
 
+# Streamed completion pieces: two sentences across three lines
+_STREAM_PIECES = ["First one", ". Sec", "ond one!\n", "Third\n", "Fourth\n"]
+
+
+class TestBatchAnalysis:
+    """Tests for batched task analysis."""
+
+    def test_default_batch_matches_single_analysis(self, sample_tasks):
+        """Test that the default batch path returns one result per task in order."""
+        provider = RuleBasedProvider()
+
+        results = provider.analyze_tasks_batch(sample_tasks, sample_tasks)
+
+        assert [r.task_id for r in results] == [t.id for t in sample_tasks]
+        for task, result in zip(sample_tasks, results):
+            assert result.score == provider.analyze_task(task, sample_tasks).score
+
+    def test_analyze_all_uses_one_batch_call_per_bin(self, sample_tasks):
+        """Test that analyze_all hands each response bin to the provider at once."""
+
+        class CountingProvider(RuleBasedProvider):
+            budgets: list[int | None] = []
+
+            def analyze_tasks_batch(self, tasks, all_tasks, max_tokens_per_task=None):
+                CountingProvider.budgets.append(max_tokens_per_task)
+                return super().analyze_tasks_batch(tasks, all_tasks)
+
+        analyzer = TaskAnalyzer(provider=CountingProvider())
+
+        results = analyzer.analyze_all(sample_tasks)
+
+        assert len(results) == 5
+        # Short titles go to "short"; the task with a dependency moves to "medium"
+        assert CountingProvider.budgets == [80, 120]
+
+    def test_context_excludes_closed_tasks(self, sample_tasks):
+        """Test that closed tasks are not passed to the provider as context."""
+
+        class RecordingProvider(RuleBasedProvider):
+            def __init__(self):
+                super().__init__()
+                self.context_ids: set[str] = set()
+
+            def analyze_tasks_batch(self, tasks, all_tasks, max_tokens_per_task=None):
+                self.context_ids.update(t.id for t in all_tasks)
+                return super().analyze_tasks_batch(tasks, all_tasks)
+
+        sample_tasks[0].status = Status.DONE
+        provider = RecordingProvider()
+        analyzer = TaskAnalyzer(provider=provider)
+
+        results = analyzer.analyze_all(sample_tasks, include_closed=True)
+
+        assert len(results) == 5
+        assert provider.context_ids == {"task-2", "task-3", "task-4", "task-5"}
+
+    def test_bin_tasks_by_length(self):
+        """Test grouping tasks by expected response length."""
+        short = Task(id="s", title="Short")
+        long = Task(id="l", title="Long", description="details " * 200)
+        dependent = Task(id="d", title="Dependent", dependencies=["s"])
+
+        bins = TaskAnalyzer._bin_tasks([long, short, dependent])
+
+        assert list(bins) == ["short", "medium", "long"]
+        assert [t.id for t in bins["short"]] == ["s"]
+        assert [t.id for t in bins["medium"]] == ["d"]
+        assert [t.id for t in bins["long"]] == ["l"]
+
+    def test_llama_parse_batch_response(self, sample_tasks, butler_home):
+        """Test parsing JSON lines from a batch LLM response."""
+        provider = LlamaProvider()
+        response = "\n".join(
+            [
+                '{"task_id": "task-1", "reasoning": "Due today.", "suggestions": ["Start now"]}',
+                "not json",
+                '{"task_id": "unknown", "reasoning": "Ignored."}',
+                '{"task_id": "task-2", "reasoning": "Due tomorrow."',
+                '- {"task_id": "task-3", "reasoning": "Blocked."}, (end)',
+            ]
+        )
+
+        parsed = provider._parse_batch_response(response, sample_tasks)
+
+        assert parsed == {"task-1": ("Due today.", ["Start now"]), "task-3": ("Blocked.", [])}
+
+    def test_llama_suggest_tasks_uses_one_request(
+        self, sample_tasks, butler_home, fake_llama, monkeypatch
+    ):
+        """Test that suggestion reasons come from a single batched LLM request."""
+        provider = LlamaProvider(language="en")
+        prompts: list[str] = []
+
+        def fake_generate(prompt, max_tokens=512, **kwargs):
+            prompts.append(prompt)
+            return "task-1: It is due today and blocks another task.\ntask-2 - no colon here"
+
+        monkeypatch.setattr(provider, "_generate", fake_generate)
+
+        suggestions = provider.suggest_tasks(sample_tasks, count=3)
+
+        assert len(prompts) == 1
+        reasons = {s.task.id: s.reason for s in suggestions}
+        assert reasons["task-1"] == "🤖 It is due today and blocks another task"
+        assert all(r.startswith("📋") for tid, r in reasons.items() if tid != "task-1")
+
+    def test_llama_analyze_drops_incomplete_sentence(
+        self, sample_tasks, butler_home, fake_llama, monkeypatch
+    ):
+        """Test that analysis reasons end at the last complete sentence."""
+        provider = LlamaProvider(language="en")
+        monkeypatch.setattr(
+            provider, "_generate", lambda prompt, **kwargs: "Start it now! It blocks the rel"
+        )
+
+        result = provider.analyze_task(sample_tasks[0], sample_tasks)
+
+        assert result.reasoning == "🤖 Start it now!"
+
+    def test_llama_enables_prompt_cache(self, butler_home, fake_llama_cpp):
+        """Test that a RAM prompt cache of the configured size is attached to the model."""
+        fake_llama_cpp(LlamaRAMCache=lambda capacity_bytes: capacity_bytes)
+
+        llm = FakeLlama()
+        LlamaProvider(prompt_cache_mb=64)._enable_prompt_cache(llm)
+        assert llm.cache == 64 * 1024 * 1024
+
+        llm = FakeLlama()
+        LlamaProvider(prompt_cache_mb=0)._enable_prompt_cache(llm)
+        assert llm.cache is None
+
+    def test_llama_generate_reuses_cached_completion(self, butler_home, fake_llama):
+        """Test that an identical prompt is answered from the generation cache."""
+        provider = LlamaProvider()
+
+        assert provider._generate("same prompt", max_tokens=50) == "answer 1"
+        assert provider._generate("same prompt", max_tokens=50) == "answer 1"
+        assert provider._generate("other prompt", max_tokens=50) == "answer 2"
+        assert len(fake_llama.prompts) == 2
+        # Completions are written out once, not after every generation
+        assert not (butler_home / "cache" / "generations.json").exists()
+        provider._generation_cache.save()
+        assert (butler_home / "cache" / "generations.json").exists()
+
+    @pytest.mark.parametrize(
+        ("configured", "supported", "expected"), [(-1, True, -1), (-1, False, 0), (10, False, 10)]
+    )
+    def test_llama_resolves_gpu_layers(
+        self, butler_home, fake_llama_cpp, configured, supported, expected
+    ):
+        """Test that -1 offloads all layers only when GPU offload is available."""
+        fake_llama_cpp(llama_supports_gpu_offload=lambda: supported)
+
+        assert LlamaProvider(n_gpu_layers=configured)._resolve_gpu_layers() == expected
+
+    def test_llama_kv_cache_kwargs(self, butler_home, fake_llama_cpp):
+        """Test Llama() arguments for quantized KV caches."""
+        fake_llama_cpp(GGML_TYPE_Q8_0=8)
+
+        assert LlamaProvider()._kv_cache_kwargs() == {}
+        assert LlamaProvider(kv_cache_type="bogus")._kv_cache_kwargs() == {}
+        assert LlamaProvider(kv_cache_type="q8_0")._kv_cache_kwargs() == {
+            "type_k": 8,
+            "type_v": 8,
+            "flash_attn": True,
+        }
+
+    def test_unquantized_model_names(self):
+        """Test detecting unquantized GGUF file names."""
+        assert _UNQUANTIZED_NAME.search("llama-2-7b.f16")
+        assert _UNQUANTIZED_NAME.search("model-BF16")
+        assert not _UNQUANTIZED_NAME.search("tinyllama-1.1b-chat-v1.0.Q4_K_M")
+
+    def test_parse_tensor_split(self):
+        """Test parsing tensor_split from config values."""
+        assert _parse_tensor_split([0.6, 0.4]) == [0.6, 0.4]
+        assert _parse_tensor_split("0.5, 0.5") == [0.5, 0.5]
+        assert _parse_tensor_split("") is None
+        assert _parse_tensor_split("a,b") is None
+
+    @pytest.mark.parametrize(
+        ("pieces", "options", "expected", "consumed"),
+        [
+            (_STREAM_PIECES, {"stop_sentence": True}, "First one. Second one!", 3),
+            (_STREAM_PIECES, {"stop_lines": 2}, "First one. Second one!\nThird", 4),
+            (
+                ["Done", ".", " Then more", " text. ", "Skip"],
+                {"stop_sentence": True},
+                "Done. Then more text.",
+                4,
+            ),
+            (["1. A", "\n\n2", ". B\n", "3. C\n"], {"stop_lines": 2}, "1. A\n\n2. B", 3),
+        ],
+    )
+    def test_llama_generate_stops_early(
+        self, butler_home, fake_llama, pieces, options, expected, consumed
+    ):
+        """Test that streamed generation stops once the wanted text is complete."""
+        fake_llama.pieces = pieces
+
+        assert LlamaProvider()._generate("prompt", **options) == expected
+        assert len(fake_llama.yielded) == consumed
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            ({"model_name": "elyza-7b"}, "[INST] <<SYS>>\nsys\n<</SYS>>\n\nuser [/INST]"),
+            (
+                {"model_name": "tinyllama-1.1b"},
+                "<|system|>\nsys\n</s>\n<|user|>\nuser\n</s>\n<|assistant|>\n",
+            ),
+            (
+                {"model_path": "/models/Llama-3-ELYZA-JP-8B-q4_k_m.gguf"},
+                "<|start_header_id|>system<|end_header_id|>\n\nsys<|eot_id|>"
+                "<|start_header_id|>user<|end_header_id|>\n\nuser<|eot_id|>"
+                "<|start_header_id|>assistant<|end_header_id|>\n\n",
+            ),
+            (
+                {"model_path": "/models/ELYZA-japanese-Llama-2-7b.gguf"},
+                "[INST] <<SYS>>\nsys\n<</SYS>>\n\nuser [/INST]",
+            ),
+        ],
+    )
+    def test_llama_format_prompt_by_model_family(self, butler_home, model, expected):
+        """Test that the prompt template follows the model file or model name."""
+        provider = LlamaProvider(**model)
+
+        assert provider._format_prompt("sys", "user") == expected
+
+    def test_llama_prompt_tokens_reuse_static_head(self, butler_home):
+        """Test that the template head is tokenized once per system prompt."""
+        provider = LlamaProvider(model_name="tinyllama-1.1b")
+        llm = FakeLlama()
+        first = provider._format_prompt("system", "first task")
+        second = provider._format_prompt("system", "second task")
+
+        assert provider._prompt_tokens(llm, first) == [1, 2]
+        assert provider._prompt_tokens(llm, second) == [1, 3]
+        assert llm.tokenized[0] == (b"<|system|>\nsystem\n</s>\n<|user|>\n", True)
+        assert llm.tokenized[2] == (b"second task\n</s>\n<|assistant|>\n", False)
+
+    def test_llama_prompt_tokens_cache_head_state(self, butler_home):
+        """Test that each system prompt head is evaluated once into the prompt cache."""
+        provider = LlamaProvider(model_name="tinyllama-1.1b")
+        llm = FakeLlama()
+        llm.cache = {}
+        for system, user in [("a", "one"), ("a", "two"), ("bb", "three")]:
+            provider._prompt_tokens(llm, provider._format_prompt(system, user))
+
+        assert len(llm.evaluated) == 2
+        assert list(llm.cache.values()) == ["state-1", "state-2"]
+
+    def test_llama_task_context_dependency_counts(self, sample_tasks, butler_home):
+        """Test that the dependency index counts open blockers and dependents."""
+        provider = LlamaProvider(language="en")
+        sample_tasks[3].dependencies = ["task-1", "task-5"]
+        index = index_dependencies(sample_tasks)
+
+        assert index == (
+            {t.id: i for i, t in enumerate(sample_tasks)},
+            {"task-1": 2, "task-5": 1},
+        )
+        assert "Waiting for this task: 2 tasks" in provider._build_task_context(
+            sample_tasks[0], index
+        )
+        assert "Waiting for this task" not in provider._build_task_context(sample_tasks[2], index)
+
+        sample_tasks[4].status = Status.DONE
+        index = index_dependencies(sample_tasks)
+        assert "Waiting for this task: 1 tasks" in provider._build_task_context(
+            sample_tasks[0], index
+        )
+
+    def test_llama_task_context_truncates_long_description(self, sample_tasks, butler_home):
+        """Test that long descriptions are cut so they do not dominate the prompt."""
+        provider = LlamaProvider(language="en")
+        sample_tasks[0].description = "x" * 1000
+
+        context = provider._build_task_context(sample_tasks[0], index_dependencies(sample_tasks))
+        assert f"Description: {'x' * 240}…" in context
+        assert "x" * 241 not in context
+
+    def test_llama_task_context_uses_reference_time(self, sample_tasks, butler_home):
+        """Test that deadlines are measured from the reference time passed in."""
+        provider = LlamaProvider(language="en")
+        index = index_dependencies(sample_tasks)
+        now = sample_tasks[0].due_date - timedelta(days=3)
+
+        assert "Deadline: in 3 days" in provider._build_task_context(sample_tasks[0], index, now)
+        assert "Deadline: today" in provider._build_task_context(
+            sample_tasks[1], index, now + timedelta(days=4)
+        )
+
+    def test_llama_task_context_reused_for_unchanged_task(self, sample_tasks, butler_home):
+        """Test that context strings are formatted once per unchanged task."""
+        provider = LlamaProvider(language="en")
+        index = index_dependencies(sample_tasks)
+
+        first = provider._build_task_context(sample_tasks[0], index)
+        assert provider._build_task_context(sample_tasks[0], index) == first
+        assert provider._format_task_context.cache_info().hits == 1
+
+        sample_tasks[0].title = "Renamed task"
+        assert "Renamed task" in provider._build_task_context(sample_tasks[0], index)
+
+    def test_llama_parse_suggestions_strips_numbering(self):
+        """Test that numbering and bullets are removed from suggestion lines."""
+        response = "1. Draft the outline\n\n-* Book a meeting room\n3) Too late"
+        assert LlamaProvider._parse_suggestions(response) == [
+            "Draft the outline",
+            "Book a meeting room",
+        ]
+        assert LlamaProvider._parse_suggestions("12.\nok") == []
+        assert LlamaProvider._parse_suggestions(None) == []
+
+    @pytest.mark.parametrize(("configured", "expected"), [(0, 4), (6, 6)])
+    def test_llama_resolves_threads(self, butler_home, monkeypatch, configured, expected):
+        """Test that n_threads = 0 uses the physical core count."""
+        # Without psutil, physical cores are estimated as half the logical CPUs
+        monkeypatch.setitem(sys.modules, "psutil", None)
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+        assert LlamaProvider(n_threads=configured)._resolve_threads() == expected
+
+    @pytest.mark.parametrize(("n_gpu_layers", "expected"), [(-1, 10), (0, 2)])
+    def test_llama_speculative_uses_prompt_lookup_drafts(
+        self, butler_home, fake_llama_cpp, n_gpu_layers, expected
+    ):
+        """Test that speculative decoding drafts longer runs with GPU offload."""
+        fake_llama_cpp(
+            "llama_cpp.llama_speculative", LlamaPromptLookupDecoding=types.SimpleNamespace
+        )
+
+        assert LlamaProvider()._draft_model_kwargs(n_gpu_layers) == {}
+        kwargs = LlamaProvider(speculative=True)._draft_model_kwargs(n_gpu_layers)
+        assert kwargs["draft_model"].num_pred_tokens == expected
+
+    def test_llama_model_shared_between_providers(self, butler_home, monkeypatch):
+        """Test that providers with the same load settings share one loaded model."""
+        model = butler_home / "model-Q4_K_M.gguf"
+        model.write_bytes(b"")
+        monkeypatch.setattr(llama, "LLAMA_AVAILABLE", True)
+        monkeypatch.setattr(llama, "Llama", FakeLlama)
+        LlamaProvider.clear_cache()
+
+        try:
+            first = LlamaProvider(model_path=str(model))._get_llm()
+            second = LlamaProvider(model_path=str(model))._get_llm()
+            other = LlamaProvider(model_path=str(model), n_ctx=4096)._get_llm()
+            LlamaProvider.clear_cache()
+            reloaded = LlamaProvider(model_path=str(model))._get_llm()
+        finally:
+            LlamaProvider.clear_cache()
+
+        assert first is second
+        assert other is not first
+        assert reloaded is not first
+        assert [llm.load_kwargs["n_ctx"] for llm in (first, other, reloaded)] == [2048, 4096, 2048]
+        assert first.load_kwargs["use_mmap"] and not first.load_kwargs["use_mlock"]
+
+    @pytest.mark.parametrize(
+        ("response", "expected"),
+        [
+            ("Start it first. It unblocks two tasks", "Start it first"),
+            ("最優先で着手する。期限は今日です", "最優先で着手する。"),
+            ("Due today\nso start now.", "Due today"),
+        ],
+    )
+    def test_llama_reason_keeps_first_sentence(
+        self, sample_tasks, butler_home, monkeypatch, response, expected
+    ):
+        """Test that suggestion reasons are cut at the first sentence boundary."""
+        provider = LlamaProvider(language="en")
+        monkeypatch.setattr(provider, "_generate", lambda prompt, **kwargs: response)
+
+        reasons = provider._generate_reasons_llm([sample_tasks[0]], sample_tasks)
+        assert reasons == {"task-1": expected}
+
+    def test_llama_batch_analysis_constrains_output_to_json(
+        self, sample_tasks, butler_home, fake_llama, fake_llama_cpp
+    ):
+        """Test that batch analysis samples under the JSON-lines grammar."""
+        compiled = object()
+        fake_llama_cpp(
+            LlamaGrammar=types.SimpleNamespace(from_string=lambda gbnf, verbose=True: compiled)
+        )
+        llama._load_grammar.cache_clear()
+        reply = {"reasoning": "Needed before the deadline.", "suggestions": ["Start now"]}
+        fake_llama.pieces = [
+            json.dumps({"task_id": task.id, **reply}) + "\n" for task in sample_tasks[:2]
+        ]
+
+        provider = LlamaProvider(language="en")
+        try:
+            results = provider.analyze_tasks_batch(sample_tasks[:2], sample_tasks)
+        finally:
+            llama._load_grammar.cache_clear()
+
+        assert fake_llama.completion_kwargs[0]["grammar"] is compiled
+        assert [r.reasoning for r in results] == ["🤖 Needed before the deadline."] * 2
+
+    def test_llama_server_suggest_reasons_run_concurrently(
+        self, sample_tasks, butler_home, monkeypatch
+    ):
+        """Test that a server backend gets one concurrent reason request per task."""
+        provider = LlamaProvider(language="en", server_url="http://localhost:8000")
+        # Only returns once all three requests are in flight at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_remote(prompt, max_tokens, grammar=None):
+            barrier.wait()
+            return "It is the next step toward the deadline."
+
+        monkeypatch.setattr(provider, "_generate_remote", fake_remote)
+
+        results = provider.suggest_tasks(sample_tasks[:3], count=3)
+        assert [r.reason for r in results] == ["🤖 It is the next step toward the deadline"] * 3
+
+    def test_llama_server_backend(self, sample_tasks, butler_home):
+        """Test analysis through a llama.cpp server's completions endpoint."""
+        requests: list[dict] = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                requests.append({"path": self.path, **body})
+                if "suggestions" in body["prompt"]:
+                    text = "1. Block an hour this morning\n2. Ask for a review"
+                else:
+                    text = "It is due today and other work depends on it."
+                data = json.dumps({"choices": [{"text": text}]}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/"
+            provider = LlamaProvider(language="en", server_url=url)
+
+            result = provider.analyze_task(sample_tasks[0], sample_tasks)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert result.reasoning == "🤖 It is due today and other work depends on it."
+        assert result.suggestions == ["Block an hour this morning", "Ask for a review"]
+        assert len(requests) == 2
+        assert all(r["path"] == "/v1/completions" for r in requests)
+        assert all(r["cache_prompt"] for r in requests)
+
+    def test_llama_parse_portfolio_response(self, sample_tasks, butler_home):
+        """Test that per-task reasons are returned alongside the portfolio result."""
+        provider = LlamaProvider()
+        response = '{"order": [{"id": "task-2", "reason": "Blocks others"}, "task-1"]}'
+
+        result, reasons = provider._parse_portfolio_response(response, sample_tasks)
+
+        assert result.recommended_order == ["task-2", "task-1"]
+        assert reasons == {"task-2": "Blocks others"}
+
+    def test_llama_parse_portfolio_response_skips_surrounding_text(self, sample_tasks, butler_home):
+        """Test that the JSON object is found between prose, ignoring braces after it."""
+        provider = LlamaProvider()
+        response = (
+            'Here is the plan:\n{"order": ["task-3"], "assessment": "Fine"}\n'
+            "Let me know if you need {more}."
+        )
+
+        result, _ = provider._parse_portfolio_response(response, sample_tasks)
+
+        assert result.recommended_order == ["task-3"]
+        assert result.overall_assessment == "Fine"
+
+    def test_llama_parse_portfolio_response_truncated(self, sample_tasks, butler_home):
+        """Test that a truncated response falls back to free-form text, not a nested object."""
+        provider = LlamaProvider()
+        response = '{"order": [{"id": "task-3", "reason": "x"}], "assessment": "ok" trailing'
+
+        result, reasons = provider._parse_portfolio_response(response, sample_tasks)
+
+        assert result.overall_assessment == response
+        assert reasons == {}
+
+    def test_llama_portfolio_scores_only_ranked_tasks(self, sample_tasks, butler_home, monkeypatch):
+        """Test that rule-based scores are computed in one batch of the tasks the LLM ranked."""
+        provider = LlamaProvider(server_url="http://localhost:8000")
+        response = '{"order": ["task-2", {"id": "task-1", "reason": "Due today"}, "task-2"]}'
+        monkeypatch.setattr(provider, "_generate", lambda prompt, **kwargs: response)
+        batches: list[list[str]] = []
+        analyze_batch = provider._fallback.analyze_tasks_batch
+
+        def counting_batch(tasks, all_tasks):
+            batches.append([t.id for t in tasks])
+            return analyze_batch(tasks, all_tasks)
+
+        monkeypatch.setattr(provider._fallback, "analyze_tasks_batch", counting_batch)
+
+        result = provider.analyze_portfolio(sample_tasks)
+
+        assert batches == [["task-2", "task-1"]]
+        assert [r.task_id for r in result.ranked_tasks] == ["task-2", "task-1", "task-2"]
+        assert result.ranked_tasks[1].reason == "Due today"
+
+
+class TestModelManager:
+    """Tests for model file resolution."""
+
+    @pytest.mark.parametrize(
+        ("quantization", "expected"),
+        [
+            ("Q4_K_M", "ELYZA-japanese-Llama-2-7b-fast-instruct-q4_K_M.gguf"),
+            ("q5_k_m", "ELYZA-japanese-Llama-2-7b-fast-instruct-q5_K_M.gguf"),
+            ("Q8_0", "ELYZA-japanese-Llama-2-7b-fast-instruct-q4_K_M.gguf"),
+        ],
+    )
+    def test_quantization_selects_gguf_file(self, butler_home, quantization, expected):
+        """Test that the quantization picks the file name and URL to download."""
+        manager = ModelManager(models_dir=butler_home, quantization=quantization)
+        info = manager._model_info("elyza-jp-7b")
+
+        assert info["filename"] == expected
+        assert info["url"].endswith("/" + expected)
+        assert manager.get_model_path("elyza-jp-7b") is None
+        (butler_home / expected).write_bytes(b"")
+        assert manager.get_model_path("elyza-jp-7b") == butler_home / expected
+
+    def test_delete_model(self, butler_home):
+        """Test deleting a downloaded model and a missing one."""
+        manager = ModelManager(models_dir=butler_home)
+        model_path = butler_home / manager._model_info("tinyllama-1.1b")["filename"]
+        model_path.write_bytes(b"")
+
+        assert manager.delete_model("tinyllama-1.1b") is True
+        assert not model_path.exists()
+        assert manager.delete_model("tinyllama-1.1b") is False
+
+
+class TestAsyncAnalysis:
+    """Tests for concurrent async task analysis."""
+
+    @staticmethod
+    def _make_async_provider():
+        class AsyncProvider(RuleBasedProvider):
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.max_in_flight = 0
+
+            async def analyze_task_async(self, task, all_tasks):
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0.01)
+                self.in_flight -= 1
+                return self.analyze_task(task, all_tasks)
+
+        return AsyncProvider()
+
+    def test_analyze_all_async_respects_concurrency(self, sample_tasks):
+        """Test that no more than `concurrency` requests run at once."""
+        provider = self._make_async_provider()
+        analyzer = TaskAnalyzer(provider=provider, concurrency=2)
+
+        results = asyncio.run(analyzer.analyze_all_async(sample_tasks))
+
+        assert len(results) == 5
+        assert provider.max_in_flight == 2
+        for i in range(len(results) - 1):
+            assert results[i].score >= results[i + 1].score
+
+    def test_analyze_all_uses_native_async(self, sample_tasks):
+        """Test that the sync API fans out when the provider supports async."""
+        provider = self._make_async_provider()
+        analyzer = TaskAnalyzer(provider=provider, concurrency=8)
+
+        results = analyzer.analyze_all(sample_tasks)
+
+        assert len(results) == 5
+        assert provider.max_in_flight == 5
+
+    def test_analyze_all_async_batches_without_native_async(self, sample_tasks, monkeypatch):
+        """Test that providers without native async get one batch call, not a fan-out."""
+        provider = RuleBasedProvider()
+        batches = []
+        original = provider.analyze_tasks_batch
+
+        def record(tasks, all_tasks, max_tokens_per_task=None):
+            batches.append([t.id for t in tasks])
+            return original(tasks, all_tasks, max_tokens_per_task)
+
+        monkeypatch.setattr(provider, "analyze_tasks_batch", record)
+        monkeypatch.setattr(
+            provider, "analyze_task_async", lambda *args: pytest.fail("fanned out per task")
+        )
+        analyzer = TaskAnalyzer(provider=provider, concurrency=8)
+
+        results = asyncio.run(analyzer.analyze_all_async(sample_tasks))
+
+        assert len(results) == 5
+        assert sorted(tid for batch in batches for tid in batch) == [t.id for t in sample_tasks]
+
+    def test_default_async_uses_thread(self, sample_tasks):
+        """Test the default analyze_task_async wrapper."""
+        provider = RuleBasedProvider()
+
+        result = asyncio.run(provider.analyze_task_async(sample_tasks[0], sample_tasks))
+
+        assert result.task_id == "task-1"
+
+
+class TestAnalysisCache:
+    """Tests for cached task analysis."""
+
+    @staticmethod
+    def _make_cacheable_provider():
+        class CacheableProvider(RuleBasedProvider):
+            def __init__(self):
+                super().__init__()
+                self.analyzed: list[str] = []
+
+            def cache_identity(self):
+                return "test"
+
+            def analyze_task(self, task, all_tasks):
+                self.analyzed.append(task.id)
+                return super().analyze_task(task, all_tasks)
+
+        return CacheableProvider()
+
+    def test_second_run_hits_cache(self, sample_tasks, tmp_path):
+        """Test that unchanged tasks are not re-analyzed."""
+        provider = self._make_cacheable_provider()
+        cache = AnalysisCache(tmp_path / "analysis.json")
+        analyzer = TaskAnalyzer(provider=provider, cache=cache)
+
+        first = analyzer.analyze_all(sample_tasks)
+        provider.analyzed.clear()
+        second = analyzer.analyze_all(sample_tasks)
+
+        assert provider.analyzed == []
+        assert [r.task_id for r in second] == [r.task_id for r in first]
+
+    def test_warm_cache(self, sample_tasks, tmp_path):
+        """Test that warming the cache lets the next run skip the provider."""
+        provider = self._make_cacheable_provider()
+        analyzer = TaskAnalyzer(provider=provider, cache=AnalysisCache(tmp_path / "a.json"))
+
+        assert analyzer.warm_cache(sample_tasks) == 5
+        assert analyzer.warm_cache(sample_tasks) == 0
+        provider.analyzed.clear()
+        analyzer.analyze_all(sample_tasks)
+
+        assert provider.analyzed == []
+
+    def test_warm_cache_without_cache_support(self, sample_tasks):
+        """Test that warming is a no-op for providers that don't cache."""
+        analyzer = TaskAnalyzer(provider=RuleBasedProvider())
+
+        assert analyzer.warm_cache(sample_tasks) == 0
+
+    def test_changed_task_is_reanalyzed(self, sample_tasks, tmp_path):
+        """Test that editing a task invalidates its cache entry."""
+        provider = self._make_cacheable_provider()
+        analyzer = TaskAnalyzer(provider=provider, cache=AnalysisCache(tmp_path / "a.json"))
+
+        analyzer.analyze_all(sample_tasks)
+        provider.analyzed.clear()
+        sample_tasks[2].title = "Renamed task"
+        analyzer.analyze_all(sample_tasks)
+
+        assert provider.analyzed == ["task-3"]
+
+    def test_cache_persists_to_disk(self, sample_tasks, tmp_path):
+        """Test that a new cache instance reads earlier results."""
+        path = tmp_path / "analysis.json"
+        analyzer = TaskAnalyzer(provider=self._make_cacheable_provider(), cache=AnalysisCache(path))
+        analyzer.analyze(sample_tasks[0], sample_tasks)
+
+        provider = self._make_cacheable_provider()
+        result = TaskAnalyzer(provider=provider, cache=AnalysisCache(path)).analyze(
+            sample_tasks[0], sample_tasks
+        )
+
+        assert provider.analyzed == []
+        assert result.task_id == "task-1"
+
+    def test_save_replaces_cache_file(self, tmp_path):
+        """Test that saving writes the whole file and leaves no temporary files."""
+        path = tmp_path / "generations.json"
+        path.write_text("{corrupt", encoding="utf-8")
+        cache = GenerationCache(path)
+        cache.put("key", "text")
+        cache.save()
+
+        assert GenerationCache(path).get("key") == "text"
+        assert [p.name for p in tmp_path.iterdir()] == ["generations.json"]
+
+    def test_rule_based_provider_not_cached(self, sample_tasks):
+        """Test that providers without a cache identity skip caching."""
+        analyzer = TaskAnalyzer(provider=RuleBasedProvider())
+
+        assert analyzer.cache is None
+
+
 class TestTaskAnalyzer:
     """Tests for TaskAnalyzer facade."""
 
@@ -183,6 +997,97 @@ class TestTaskAnalyzer:
         for task, analysis in top:
             assert task.id == analysis.task_id
 
+    def test_get_top_priorities_matches_ranked_list(self, sample_tasks):
+        """Test that top priorities agree with the head of the full ranking."""
+        analyzer = TaskAnalyzer()
+
+        ranked = analyzer.analyze_all(sample_tasks)
+        top = analyzer.get_top_priorities(sample_tasks, count=2)
+
+        assert [analysis.task_id for _, analysis in top] == [r.task_id for r in ranked[:2]]
+
+    def test_analyze_holistic_truncates_by_default(self, sample_tasks):
+        """Test that holistic analysis covers only max_tasks without chunking."""
+        analyzer = TaskAnalyzer()
+
+        result = analyzer.analyze_holistic(sample_tasks, max_tasks=2)
+
+        assert result.total_tasks == 5
+        assert result.analyzed_tasks == 2
+
+    def test_analyze_holistic_chunked(self, sample_tasks):
+        """Test that chunked holistic analysis covers and ranks every task."""
+        analyzer = TaskAnalyzer()
+
+        result = analyzer.analyze_holistic(sample_tasks, max_tasks=2, chunked=True)
+
+        assert result.total_tasks == 5
+        assert result.analyzed_tasks == 5
+        assert sorted(result.recommended_order) == [t.id for t in sample_tasks]
+        scores = [t.score for t in result.ranked_tasks]
+        assert scores == sorted(scores, reverse=True)
+        assert not any("上位" in w for w in result.warnings)
+
+    def test_analyze_holistic_chunked_recounts_insights(self, sample_tasks):
+        """Test that count-based insights cover all chunks instead of each one."""
+        overdue = datetime.now() - timedelta(days=2)
+        sample_tasks[2].due_date = overdue
+        sample_tasks[3].due_date = overdue
+        sample_tasks[3].dependencies = ["task-1"]
+        analyzer = TaskAnalyzer()
+
+        result = analyzer.analyze_holistic(sample_tasks, max_tasks=2, chunked=True)
+
+        by_type = {}
+        for insight in result.insights:
+            by_type.setdefault(insight.insight_type, []).append(insight)
+        assert [len(v) for v in by_type.values()] == [1] * len(by_type)
+        assert sorted(by_type["warning"][0].related_tasks) == ["task-1", "task-3", "task-4"]
+        assert by_type["blocker"][0].related_tasks == ["task-1"]
+        assert "2件" in by_type["blocker"][0].description
+        assert [w for w in result.warnings if "期限超過" in w] == ["3件のタスクが期限超過"]
+
+    def test_analyze_holistic_chunked_blocker_across_chunks(self):
+        """Test that a blocker is found when its dependents sit in other chunks."""
+        tasks = [
+            Task(id="a", title="A blocker"),
+            Task(id="b", title="B", dependencies=["a"]),
+            Task(id="c", title="C", dependencies=["a"]),
+        ]
+        analyzer = TaskAnalyzer(provider=RuleBasedProvider())
+
+        whole = analyzer.analyze_holistic(tasks, max_tasks=10)
+        chunked = analyzer.analyze_holistic(tasks, max_tasks=1, chunked=True)
+
+        blockers = [i for i in chunked.insights if i.insight_type == "blocker"]
+        assert [(i.insight_type, i.description) for i in blockers] == [
+            (i.insight_type, i.description) for i in whole.insights if i.insight_type == "blocker"
+        ]
+        assert blockers[0].related_tasks == ["a"]
+        assert chunked.warnings == whole.warnings
+
+    def test_analyze_holistic_chunks_run_concurrently(self, sample_tasks):
+        """Test that native async providers analyze chunks concurrently."""
+
+        class AsyncPortfolioProvider(RuleBasedProvider):
+            in_flight = 0
+            max_in_flight = 0
+
+            async def analyze_portfolio_async(self, tasks, max_tasks=20):
+                cls = AsyncPortfolioProvider
+                cls.in_flight += 1
+                cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+                await asyncio.sleep(0.01)
+                cls.in_flight -= 1
+                return self.analyze_portfolio(tasks, max_tasks)
+
+        analyzer = TaskAnalyzer(provider=AsyncPortfolioProvider(), concurrency=8)
+
+        result = analyzer.analyze_holistic(sample_tasks, max_tasks=2, chunked=True)
+
+        assert result.analyzed_tasks == 5
+        assert AsyncPortfolioProvider.max_in_flight == 3
+
 
 class TestTaskSuggester:
     """Tests for TaskSuggester facade."""
@@ -293,3 +1198,131 @@ class TestAnalysisResult:
         """Test minimal score label."""
         result = AnalysisResult(task_id="1", score=10, reasoning="test")
         assert result.score_label == "minimal"
+
+    def test_uses_slots(self):
+        """Test that result instances do not carry a per-instance __dict__."""
+        result = AnalysisResult(task_id="1", score=10, reasoning="test")
+        assert not hasattr(result, "__dict__")
+
+
+class TestPromptManager:
+    """Tests for PromptManager."""
+
+    @pytest.fixture
+    def manager(self, butler_home, monkeypatch):
+        """Create a PromptManager with an empty config."""
+        monkeypatch.setattr(task_butler.config, "_config", None)
+        return PromptManager("en")
+
+    def test_list_placeholders(self, manager):
+        """Test extracting placeholders from a prompt."""
+        assert manager.list_placeholders("analyze_user") == ("context", "score")
+        assert manager.list_placeholders("analyze_system") == ()
+
+    def test_format(self, manager):
+        """Test formatting a prompt with placeholder values."""
+        result = manager.format("deadline_days", days=3)
+
+        assert result == "Deadline: in 3 days"
+
+    def test_format_missing_placeholder_returns_template(self, manager):
+        """Test that missing placeholder values leave the prompt unformatted."""
+        result = manager.format("analyze_user", context="ctx")
+
+        assert result == manager.get("analyze_user")
+
+    def test_defaults_shared_without_customization(self, manager):
+        """Test that uncustomized prompts reuse the frozen defaults."""
+        assert manager.prompts is DEFAULT_PROMPTS["en"]
+
+    def test_custom_prompt_overrides_default(self, manager, tmp_path):
+        """Test that config.toml prompts override the defaults."""
+        (tmp_path / "config.toml").write_text(
+            '[ai.prompts.en]\nanalyze_system = "Custom system prompt"\n', encoding="utf-8"
+        )
+
+        assert manager.get("analyze_system") == "Custom system prompt"
+        assert manager.get("analyze_user") == DEFAULT_PROMPTS["en"]["analyze_user"]
+        assert DEFAULT_PROMPTS["en"]["analyze_system"] != "Custom system prompt"
+
+    def test_is_customized(self, manager, tmp_path):
+        """Test that only overrides differing from the defaults count as customized."""
+        default_user = DEFAULT_PROMPTS["en"]["analyze_user"].replace("\n", "\\n")
+        (tmp_path / "config.toml").write_text(
+            "[ai.prompts.en]\n"
+            'analyze_system = "Custom system prompt"\n'
+            f'analyze_user = "{default_user}"\n',
+            encoding="utf-8",
+        )
+
+        assert manager.is_customized("analyze_system")
+        assert not manager.is_customized("analyze_user")
+        assert not manager.is_customized("unknown_key")
+
+    def test_iter_prompts(self, manager, tmp_path):
+        """Test iterating prompts with their customization state in one pass."""
+        (tmp_path / "config.toml").write_text(
+            '[ai.prompts.en]\nanalyze_system = "Custom system prompt"\n', encoding="utf-8"
+        )
+
+        selected = list(manager.iter_prompts(["analyze_system", "analyze_user"]))
+
+        assert selected == [
+            ("analyze_system", "Custom system prompt", True),
+            ("analyze_user", DEFAULT_PROMPTS["en"]["analyze_user"], False),
+        ]
+        assert [key for key, _, _ in manager.iter_prompts()] == manager.list_keys()
+
+    def test_get_with_status(self, manager, tmp_path):
+        """Test getting a prompt and its customization state together."""
+        (tmp_path / "config.toml").write_text(
+            '[ai.prompts.en]\nanalyze_system = "Custom system prompt"\n', encoding="utf-8"
+        )
+
+        assert manager.get_with_status("analyze_system") == ("Custom system prompt", True)
+        assert manager.get_with_status("analyze_user") == (
+            DEFAULT_PROMPTS["en"]["analyze_user"],
+            False,
+        )
+        assert manager.get_with_status("missing", "fallback") == ("fallback", False)
+
+    def test_default_valued_override_shares_defaults(self, manager, tmp_path):
+        """Test that overrides equal to the defaults don't copy the prompt table."""
+        default_system = DEFAULT_PROMPTS["en"]["analyze_system"].replace("\n", "\\n")
+        (tmp_path / "config.toml").write_text(
+            f'[ai.prompts.en]\nanalyze_system = "{default_system}"\n', encoding="utf-8"
+        )
+
+        assert manager.prompts is DEFAULT_PROMPTS["en"]
+
+    @pytest.mark.parametrize("language", ["en", "ja"])
+    def test_batch_prompt_keeps_task_data_last(self, language):
+        """Test that batch instructions precede task data to share a prompt prefix."""
+        template = DEFAULT_PROMPTS[language]["batch_user"]
+
+        assert template.rstrip().endswith("{task_blocks}")
+        assert template.index('"task_id"') < template.index("{task_count}")
+
+    def test_list_placeholders_skips_escaped_braces(self, manager):
+        """Test that {{literal}} braces are not reported as placeholders."""
+        assert manager.list_placeholders("batch_user") == ("task_count", "task_blocks")
+
+    def test_format_without_placeholders_returns_prompt(self, manager):
+        """Test formatting a prompt that has no placeholders."""
+        result = manager.format("analyze_system", context="unused")
+
+        assert result is manager.get("analyze_system")
+
+    def test_get_prompt_manager_per_language(self, butler_home):
+        """Test that one global manager is kept per language."""
+        reload_all()
+
+        en = get_prompt_manager("en")
+        ja = get_prompt_manager("ja")
+
+        assert en.language == "en" and ja.language == "ja"
+        assert get_prompt_manager("en") is en
+        assert get_prompt_manager("fr") is ja
+
+        reload_all()
+        assert get_prompt_manager("en") is not en
@@ -49,6 +49,33 @@ class TestAddCommand:
         assert result.exit_code == 0
         assert "Created task" in result.output
 
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("2024-06-15", (2024, 6, 15)),
+            ("2024/6/5", (2024, 6, 5)),
+            ("06/15", (None, 6, 15)),
+            ("6-5", (None, 6, 5)),
+            ("2024-06/15", None),
+            ("13/01", None),
+            ("someday", None),
+        ],
+    )
+    def test_parse_due_date_formats(self, value, expected):
+        """Test the accepted absolute due date formats."""
+        from datetime import datetime
+
+        import typer
+
+        from task_butler.cli.commands.add import parse_due_date
+
+        if expected is None:
+            with pytest.raises(typer.BadParameter):
+                parse_due_date(value)
+            return
+        year, month, day = expected
+        assert parse_due_date(value) == datetime(year or datetime.now().year, month, day)
+
     def test_add_task_with_tags(self, cli_args):
         """Test adding a task with tags."""
         result = runner.invoke(app, cli_args + ["add", "Tagged task", "--tags", "work,important"])
@@ -143,6 +170,53 @@ class TestShowCommand:
         assert "not found" in result.output
 
 
+class TestAnalyzeCommand:
+    """Tests for the analyze command."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_home(self, tmp_path, monkeypatch):
+        """Keep the analysis config and caches out of the user's home."""
+        import task_butler.config
+
+        monkeypatch.setenv("TASK_BUTLER_HOME", str(tmp_path / "home"))
+        monkeypatch.setattr(task_butler.config, "_config", None)
+
+    def test_analyze_task_by_short_id(self, cli_args, storage_dir):
+        """Test analyzing a single open task by its short ID."""
+        manager = TaskManager(storage_dir)
+        task = manager.add(title="Write report")
+        manager.add(title="Call Bob")
+
+        result = runner.invoke(app, cli_args + ["analyze", task.short_id])
+        assert result.exit_code == 0
+        assert "Write report" in result.output
+        assert "Call Bob" not in result.output
+
+    def test_analyze_prefix_matching_done_task_is_ambiguous(self, cli_args, storage_dir):
+        """Test that a prefix shared with a done task is reported as ambiguous."""
+        from task_butler.models.task import Task
+
+        manager = TaskManager(storage_dir)
+        for task_id, title in [("aaaa1111", "Open task"), ("aaaa2222", "Done task")]:
+            task = Task(title=title)
+            task.id = f"{task_id}-2222-3333-4444-555555555555"
+            manager.repository.create(task)
+        manager.complete("aaaa2222")
+
+        result = runner.invoke(app, cli_args + ["analyze", "aaaa"])
+        assert result.exit_code == 1
+        assert "Ambiguous task ID" in result.output
+        assert "Done task" in result.output
+
+    def test_analyze_nonexistent_task(self, cli_args, storage_dir):
+        """Test analyzing a task that doesn't exist."""
+        TaskManager(storage_dir).add(title="Write report")
+
+        result = runner.invoke(app, cli_args + ["analyze", "invalid-id"])
+        assert result.exit_code == 1
+        assert "Task not found" in result.output
+
+
 class TestStatusCommands:
     """Tests for status-changing commands."""
 
@@ -271,6 +345,58 @@ class TestOtherCommands:
         assert "important" in result.output
         assert "work" in result.output
 
+    def test_obsidian_export_piped(self, cli_args, storage_dir):
+        """Test that piped export writes Tasks lines verbatim."""
+        manager = TaskManager(storage_dir)
+        task = manager.add(title="Finished task", tags=["work"])
+        manager.complete(task.id)
+
+        result = runner.invoke(app, cli_args + ["obsidian", "export", "--include-done"])
+        assert result.exit_code == 0
+        assert result.output.startswith("- [x] Finished task ")
+        assert result.output.rstrip("\n").endswith("#work")
+
+    def test_obsidian_resolve_only_rewrites_tasks_line(self, cli_args, storage_dir):
+        """Test that resolve replaces the Tasks line and leaves other bytes as they were."""
+        manager = TaskManager(storage_dir, format="hybrid")
+        task = manager.add(title="Resolve me", priority="high")
+        task_path = next(storage_dir.glob("*.md"))
+        original = task_path.read_bytes().replace(b"\n", b"\r\n")
+        edited = original.replace("⏫".encode(), "🔽".encode())
+        task_path.write_bytes(edited)
+
+        result = runner.invoke(
+            app, cli_args + ["--format", "hybrid", "obsidian", "resolve", "-t", task.id]
+        )
+        assert result.exit_code == 0
+        assert "Resolved 1 task(s)" in result.output
+        assert task_path.read_bytes() == original
+
+    def test_obsidian_resolve_reports_rewrites_before_error(
+        self, cli_args, storage_dir, monkeypatch
+    ):
+        """Test that files rewritten before a failing write are still reported."""
+        manager = TaskManager(storage_dir, format="hybrid")
+        for title in ("First", "Second"):
+            manager.add(title=title, priority="high")
+        for task_path in storage_dir.glob("*.md"):
+            task_path.write_bytes(task_path.read_bytes().replace("⏫".encode(), "🔽".encode()))
+
+        writes = []
+        write_bytes = type(task_path).write_bytes
+
+        def fail_second(path, data):
+            writes.append(path)
+            if len(writes) == 2:
+                raise OSError("disk full")
+            return write_bytes(path, data)
+
+        monkeypatch.setattr(type(task_path), "write_bytes", fail_second)
+
+        result = runner.invoke(app, cli_args + ["--format", "hybrid", "obsidian", "resolve"])
+        assert isinstance(result.exception, OSError)
+        assert result.output.count("Resolved") == 1
+
 
 class TestConfigCommand:
     """Tests for config commands."""
@@ -348,6 +474,15 @@ class TestConfigCommand:
         assert "storage.format" in result.output
         assert "hybrid" in result.output
 
+    def test_config_show_scalar_only(self, config_setup):
+        """Test config show lists top-level scalars without a table."""
+        (config_setup / "config.toml").write_text('note = "hello"\n')
+
+        result = runner.invoke(app, ["config", "show"])
+        assert result.exit_code == 0
+        assert "note = hello" in result.output
+        assert "Configuration" not in result.output
+
     def test_config_set_dir(self, config_setup):
         """Test config set storage dir."""
         result = runner.invoke(app, ["config", "set", "storage.dir", "/custom/path"])
@@ -37,6 +37,20 @@ class TestConfig:
 
         assert config.get_format() == "hybrid"
 
+    def test_env_gpu_layers_override(self, config_dir, monkeypatch):
+        """Test TASK_BUTLER_N_GPU_LAYERS overrides the configured GPU layers."""
+        config_dir.mkdir(parents=True, exist_ok=True)
+        (config_dir / "config.toml").write_text("[ai.llama]\nn_gpu_layers = 20\n")
+        monkeypatch.setenv("TASK_BUTLER_HOME", str(config_dir))
+
+        monkeypatch.delenv("TASK_BUTLER_N_GPU_LAYERS", raising=False)
+        assert Config().get_ai_config()["llama"]["n_gpu_layers"] == 20
+
+        monkeypatch.setenv("TASK_BUTLER_N_GPU_LAYERS", "0")
+        llama_config = Config().get_ai_config()["llama"]
+        assert llama_config["n_gpu_layers"] == "0"
+        assert llama_config["n_ctx"] == 2048
+
     def test_file_config_format(self, config_dir, monkeypatch):
         """Test file config format."""
         # Create config file
@@ -245,3 +259,26 @@ class TestGetConfig:
         config1 = get_config()
         config2 = get_config()
         assert config1 is config2
+
+    def test_get_config_reloads_changed_file(self, tmp_path, monkeypatch):
+        """Test get_config parses the file again only after it changes."""
+        import os
+
+        import task_butler.config
+
+        monkeypatch.setenv("TASK_BUTLER_HOME", str(tmp_path))
+        monkeypatch.setattr(task_butler.config, "_config", None)
+        config_path = tmp_path / "config.toml"
+        config_path.write_text('[storage]\nformat = "hybrid"\n')
+
+        config = get_config()
+        assert get_config() is config
+        assert config.get_format() == "hybrid"
+
+        config_path.write_text('[storage]\nformat = "frontmatter"\n')
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reloaded = get_config()
+        assert reloaded is not config
+        assert reloaded.get_format() == "frontmatter"
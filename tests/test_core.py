@@ -252,6 +252,14 @@ class TestTaskManager:
         assert completed.status == Status.DONE
         assert completed.actual_hours == 2.5
 
+    def test_complete_task_with_completed_at(self, manager):
+        """Test completing a task with a recorded completion time."""
+        task = manager.add(title="Test")
+        completed = manager.complete(task.id, completed_at=datetime(2025, 1, 20, 9, 0))
+
+        assert completed.status == Status.DONE
+        assert manager.get(task.id).completed_at == datetime(2025, 1, 20, 9, 0)
+
     def test_cancel_task(self, manager):
         """Test cancelling a task."""
         task = manager.add(title="Test")
@@ -291,6 +299,27 @@ class TestTaskManager:
         assert len(updated.notes) == 1
         assert updated.notes[0].content == "Note content"
 
+    def test_add_notes(self, manager, monkeypatch):
+        """Test adding notes to several tasks, reusing already loaded tasks."""
+        first = manager.add(title="First")
+        second = manager.add(title="Second")
+        loads: list[str] = []
+        get = manager.repository.get
+
+        def counting_get(task_id):
+            loads.append(task_id)
+            return get(task_id)
+
+        monkeypatch.setattr(manager.repository, "get", counting_get)
+
+        updated = manager.add_notes({first.id: "One", second.id: "Two"}, tasks=[first])
+
+        assert [t.notes[0].content for t in updated] == ["One", "Two"]
+        assert loads == [second.id]
+        assert manager.get(first.id).notes[0].content == "One"
+        with pytest.raises(ValueError, match="Task not found"):
+            manager.add_notes({"missing": "Three"})
+
     def test_update_task(self, manager):
         """Test updating task fields."""
         task = manager.add(title="Original")
@@ -319,6 +319,26 @@ class TestConflictDetection:
         assert "priority" in fields
         assert "due_date" in fields
 
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            (
+                "---\ntitle: Test\n---\n\n- [ ] Test ⏫ 📅 2025-02-01\n",
+                "- [ ] Test ⏫ 📅 2025-02-01",
+            ),
+            (
+                "---\ntitle: Test\n---\r\n\r\n  - [x] Test ✅ 2025-02-01\r\n",
+                "- [x] Test ✅ 2025-02-01",
+            ),
+            ("---\ntitle: Test\n---\n\nNo task line here\n", None),
+        ],
+    )
+    def test_find_obsidian_line(self, content, expected):
+        """Test locating the Obsidian Tasks line in raw task file content."""
+        from task_butler.cli.commands.obsidian import _find_obsidian_line
+
+        assert _find_obsidian_line(content.encode("utf-8")) == expected
+
 
 class TestRecurrenceParsing:
     """Tests for recurrence text parsing."""
@@ -925,6 +945,74 @@ class TestLinkReplacement:
         assert task.source_file == "daily/2025-01-25.md"
         assert task.source_line == 1
 
+    def test_import_tracks_line_numbers_and_indent(self, vault, manager):
+        """Test that streamed import keeps line numbers and original indentation."""
+        from task_butler.cli.commands.obsidian import (
+            DuplicateAction,
+            _import_single_file,
+        )
+        from task_butler.storage.obsidian import ObsidianTasksFormat
+
+        file = vault / "note.md"
+        file.write_text("# Note\nSome text\n- [[Link]]\n    - [ ] Nested task\n- [x] Done task\n")
+
+        imported, updated, skipped, errors, task_infos = _import_single_file(
+            file,
+            manager,
+            ObsidianTasksFormat(),
+            DuplicateAction.SKIP,
+            dry_run=True,
+            global_action={},
+        )
+
+        assert [t.title for t in imported] == ["Nested task", "Done task"]
+        assert errors == []
+        assert task_infos == []
+
+        imported, _, _, _, task_infos = _import_single_file(
+            file,
+            manager,
+            ObsidianTasksFormat(),
+            DuplicateAction.SKIP,
+            dry_run=False,
+            global_action={},
+        )
+
+        assert [(t.line_number, t.original_line) for t in task_infos] == [
+            (4, "    - [ ] Nested task"),
+            (5, "- [x] Done task"),
+        ]
+
+    def test_replace_lines_keeps_crlf_endings(self, vault, manager):
+        """Test that link replacement keeps CRLF line endings and line positions."""
+        from task_butler.cli.commands.obsidian import (
+            DuplicateAction,
+            LinkFormat,
+            _import_single_file,
+            _replace_lines_with_links,
+        )
+        from task_butler.storage.obsidian import ObsidianTasksFormat
+
+        file = vault / "windows.md"
+        file.write_bytes(b"# Tasks\r\n- [ ] First task\r\nSome text\r\n  - [ ] Second task\r\n")
+
+        _, _, _, _, task_infos = _import_single_file(
+            file,
+            manager,
+            ObsidianTasksFormat(),
+            DuplicateAction.SKIP,
+            dry_run=False,
+            global_action={},
+        )
+        _replace_lines_with_links(file, task_infos, vault / "Tasks", vault, LinkFormat.WIKI)
+
+        lines = file.read_bytes().split(b"\r\n")
+        assert lines[0] == b"# Tasks"
+        assert lines[1].startswith(b"- [[Tasks/") and lines[1].endswith(b"|First task]]")
+        assert lines[2] == b"Some text"
+        assert lines[3].startswith(b"  - [[Tasks/") and lines[3].endswith(b"|Second task]]")
+        assert lines[4] == b""
+
     def test_replace_lines_with_links(self, vault, manager):
         """Test replacing task lines with wiki links."""
         from task_butler.cli.commands.obsidian import (
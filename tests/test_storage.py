@@ -129,6 +129,33 @@ class TestMarkdownStorage:
         assert "Task 2" in titles
         assert "Task 3" in titles
 
+    def test_iter_raw(self, storage):
+        """Test iterating tasks with their file path and raw content."""
+        task1 = Task(title="Task 1", priority=Priority.HIGH)
+        task2 = Task(title="Task 2")
+        path1 = storage.save(task1)
+        path2 = storage.save(task2)
+
+        entries = {task.id: (task, path, data) for task, path, data in storage.iter_raw()}
+
+        assert set(entries) == {task1.id, task2.id}
+        task, path, data = entries[task1.id]
+        assert task.priority == Priority.HIGH
+        assert path == path1
+        assert data == path1.read_bytes()
+        assert entries[task2.id][1] == path2
+
+    def test_iter_raw_threaded_keeps_order(self, storage):
+        """Test that reading files in threads yields the same entries in order."""
+        for i in range(5):
+            storage.save(Task(title=f"Task {i}"))
+
+        serial = [(task.id, path, data) for task, path, data in storage.iter_raw()]
+        threaded = [(task.id, path, data) for task, path, data in storage.iter_raw(max_workers=4)]
+
+        assert threaded == serial
+        assert len(threaded) == 5
+
 
 class TestTaskRepository:
     """Tests for TaskRepository."""